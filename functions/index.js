@@ -10,6 +10,7 @@ const path = require("path");
 const { initManifestLoader, getAllManifests } = require("./manifest-loader");
 const { manifestToContext, extractProgramsForLookup } = require("./manifest-to-context");
 const { detectProgramMentions } = require("./mention-utils");
+const { loadProgramData } = require("./program-data-loader");
 
 // Load programs from CSV file
 const programsCsvPath = path.join(__dirname, "programs.csv");
@@ -35,47 +36,24 @@ const coreCurriculumData = JSON.parse(fs.readFileSync(coreCurriculumPath, "utf8"
 const laResearchPath = path.join(__dirname, "la-value-research.json");
 const laResearchData = JSON.parse(fs.readFileSync(laResearchPath, "utf8"));
 
-// Load all program detail JSON files from program-data directory
-const programDataDir = path.join(__dirname, "program-data");
-const programDetails = [];
-if (fs.existsSync(programDataDir)) {
-  const programFiles = fs.readdirSync(programDataDir).filter(f => f.endsWith(".json"));
-  for (const file of programFiles) {
-    try {
-      const data = JSON.parse(fs.readFileSync(path.join(programDataDir, file), "utf8"));
-      programDetails.push(data);
-    } catch (e) {
-      console.warn(`Failed to load program data file ${file}:`, e.message);
-    }
-  }
-  console.log(`Loaded ${programDetails.length} program detail files.`);
-}
-
-// Build program lookup map for detecting mentions in responses
-const programLookup = new Map();
-for (const p of programDetails) {
-  const key = p.name.toLowerCase();
-  const slim = {
-    name: p.name,
-    degree: p.degree || "",
-    totalHours: p.totalHours || 0,
-    url: p.url || "",
-    description: (p.descriptions && p.descriptions[0]) || "",
-    careerOptions: p.careerOptions || [],
-    contacts: (p.contacts || []).map(c => ({
-      role: c.role || "",
-      name: c.name || "",
-      email: c.email || "",
-    })),
-  };
-  // Group BA/BS variants under same base name
-  if (programLookup.has(key)) {
-    const existing = programLookup.get(key);
-    existing.degree = existing.degree + ", " + slim.degree;
-  } else {
-    programLookup.set(key, slim);
-  }
-}
+// Load program details — one read of the prebuilt bundle, falling back to the
+// individual program-data/*.json files when the bundle is missing, outdated,
+// hand-edited (hash mismatch) or out of step with program-data/ (slug list).
+const {
+  programDetails,
+  programLookup,
+  hash: programDataHash,
+  source: programDataSource,
+} = loadProgramData();
+console.log(`Loaded ${programDetails.length} program detail records from ${programDataSource}` +
+  (programDataHash ? ` (hash ${programDataHash.slice(0, 12)}).` : "."));
+
+// Generated program aliases (&/and variants, abbreviations, degree forms) for
+// single-pass mention detection — see scripts/build_mention_matcher.py.
+const programAliasesPath = path.join(__dirname, "program-aliases.json");
+const programAliases = fs.existsSync(programAliasesPath)
+  ? JSON.parse(fs.readFileSync(programAliasesPath, "utf8")).aliases
+  : {};
 
 // Helper function to format Core Curriculum context
 function buildCoreCurriculumContext(data) {
@@ -511,26 +489,48 @@ exports.api = onRequest(
         ? `\n\nSTUDENT CONTEXT (from advising wizard — the student is using the wizard right now):\n${wizardContext}\nUse this context to give personalized answers. Reference their specific courses and progress when relevant. If they ask what to take, check what they still need and what prerequisites they've met. Prioritize required/core courses over electives, and only suggest courses marked as offered next semester.\n`
         : "";
 
-      // Stable prefix: persona + static and slowly-changing content. Ordered
-      // so volatile per-turn content (wizardContextBlock, user message) comes
-      // AFTER the cache breakpoint. Prompt caching is a prefix match — any
-      // byte change before the breakpoint invalidates the cache.
-      const stableSystemPrompt = buildSystemPrompt(canonicalPersonaName) + programContext + abbreviationsContext + manifestContext + programDetailsContext + coreCurriculumContext + laResearchContext + articlesContext;
+      // Prompt caching is a prefix match — any byte change before a
+      // breakpoint invalidates everything after it. Content is ordered from
+      // most to least stable:
+      //   1. stableSystemPrompt: persona + content shipped with the deploy
+      //      (programs.csv, canonical program-data bundle, core curriculum,
+      //      research). Changes on deploy, and also when a manifest refresh
+      //      changes the set of wizard-covered programs, since
+      //      programDetailsContext leaves those out (manifestProgramNames).
+      //      A refresh that only changes manifest content doesn't move it.
+      //      See scripts/build_prompt_context.py --check, which reports
+      //      both causes separately.
+      //   2. runtimeContext: Firestore and live manifest content, which can
+      //      change between deploys. Its own breakpoint, so an article
+      //      approval or manifest content change doesn't re-cache block 1.
+      //   3. wizardContextBlock and the user message: per-turn, uncached.
+      const stableSystemPrompt = buildSystemPrompt(canonicalPersonaName) + programContext + programDetailsContext + coreCurriculumContext + laResearchContext;
+      const runtimeContext = abbreviationsContext + manifestContext + articlesContext;
 
       const systemBlocks = [
         { type: "text", text: stableSystemPrompt, cache_control: { type: "ephemeral" } },
       ];
+      if (runtimeContext) {
+        systemBlocks.push({ type: "text", text: runtimeContext, cache_control: { type: "ephemeral" } });
+      }
       if (wizardContextBlock) {
         systemBlocks.push({ type: "text", text: wizardContextBlock });
       }
 
-      // Hash the stable prefix to detect silent invalidators across requests.
+      // Hash each cached block to detect silent invalidators across requests.
       const stableHash = crypto.createHash("sha256").update(stableSystemPrompt).digest("hex").slice(0, 12);
+      const runtimeHash = crypto.createHash("sha256").update(runtimeContext).digest("hex").slice(0, 12);
+      // Tells a manifest-driven stableHash change apart from a deploy
+      const wizardProgramsHash = crypto.createHash("sha256").update([...manifestProgramNames].sort().join("\n")).digest("hex").slice(0, 12);
       console.log(JSON.stringify({
         message: "stable_prefix_hash",
         personaName: canonicalPersonaName,
         stableHash,
         stableLength: stableSystemPrompt.length,
+        runtimeHash,
+        runtimeLength: runtimeContext.length,
+        wizardProgramsHash,
+        programDataHash: programDataHash ? programDataHash.slice(0, 12) : programDataSource,
         toolCount: wizardContext ? CLAUDE_TOOLS.length : 0,
       }));
 
@@ -592,7 +592,7 @@ exports.api = onRequest(
             }
           }
 
-          const programMentions = detectProgramMentions(fullText, combinedLookup);
+          const programMentions = detectProgramMentions(fullText, combinedLookup, programAliases);
 
           res.write(`event: done\ndata: ${JSON.stringify({
             programMentions,
@@ -707,7 +707,7 @@ exports.api = onRequest(
           }
         }
 
-        const programMentions = detectProgramMentions(assistantMessage, combinedLookup);
+        const programMentions = detectProgramMentions(assistantMessage, combinedLookup, programAliases);
 
         res.json({
           message: assistantMessage,
@@ -1,26 +1,127 @@
 const PROGRAM_KEYWORDS_PATTERN = /\b(major|minor|program|degree|BA\b|BS\b|B\.A\.|B\.S\.)/i;
 
+// Characters of context on each side checked for PROGRAM_KEYWORDS_PATTERN
+const CONTEXT_WINDOW = 80;
+
+// Abbreviation immediately followed by a course number ("ECON 30223") is a
+// course reference, not a program mention.
+const COURSE_NUMBER_AFTER = /^\s+\d{4,5}\b/;
+
+const MATCHER_CACHE_LIMIT = 8;
+const matcherCache = new Map();
+// Shared default so calls without an alias table hit the matcher cache,
+// which compares tables by identity.
+const EMPTY_ALIAS_TABLE = Object.freeze({});
+
 function escapeRegex(str) {
   return str.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
 }
 
-function detectProgramMentions(text, lookup) {
-  const mentions = [];
-  for (const [, program] of lookup) {
+function isWordChar(ch) {
+  return ch !== undefined && /\w/.test(ch);
+}
+
+// Same positions where a regex \b would match
+function isBoundary(text, index) {
+  return isWordChar(text[index - 1]) !== isWordChar(text[index]);
+}
+
+/**
+ * Compile every alias of every program in `lookup` into one trie so mention
+ * detection is a single pass over the text, however many programs exist.
+ * Aliases come from the program names themselves plus the generated
+ * program-aliases.json table (&/and variants, abbreviations, degree forms).
+ * @param {Map<string, object>} lookup - lowercased name -> program
+ * @param {object} [aliasTable] - lowercased name -> [{ alias, gated, abbreviation }]
+ */
+function buildMentionMatcher(lookup, aliasTable = EMPTY_ALIAS_TABLE) {
+  const root = new Map();
+  for (const [key, program] of lookup) {
+    const aliases = [{ alias: program.name, gated: program.name.split(/\s+/).length === 1 }];
+    for (const extra of aliasTable[key] || []) aliases.push(extra);
+
+    for (const { alias, gated, abbreviation } of aliases) {
+      let node = root;
+      for (const ch of alias.toLowerCase()) {
+        if (!node.has(ch)) node.set(ch, new Map());
+        node = node.get(ch);
+      }
+      if (!node.terminals) node.terminals = [];
+      node.terminals.push({ key, gated: Boolean(gated), abbreviation: Boolean(abbreviation) });
+    }
+  }
+  return { root };
+}
+
+function getMatcher(lookup, aliasTable = EMPTY_ALIAS_TABLE) {
+  aliasTable = aliasTable || EMPTY_ALIAS_TABLE;
+  const signature = [...lookup.keys()].join("\n");
+  const cached = matcherCache.get(signature);
+  if (cached && cached.aliasTable === aliasTable) return cached.matcher;
+
+  const matcher = buildMentionMatcher(lookup, aliasTable);
+  if (matcherCache.size >= MATCHER_CACHE_LIMIT) {
+    matcherCache.delete(matcherCache.keys().next().value);
+  }
+  matcherCache.set(signature, { aliasTable, matcher });
+  return matcher;
+}
+
+function hasKeywordContext(text, start, end) {
+  const context = text.substring(Math.max(0, start - CONTEXT_WINDOW), Math.min(text.length, end + CONTEXT_WINDOW));
+  return PROGRAM_KEYWORDS_PATTERN.test(context);
+}
+
+// Original per-program regex scan; used when lowercasing changes the text
+// length (rare non-ASCII input), since the trie walks a lowercased copy.
+function detectWithRegexes(text, lookup) {
+  const found = new Set();
+  for (const [key, program] of lookup) {
     const isSingleWord = program.name.split(/\s+/).length === 1;
     const pattern = new RegExp(`\\b${escapeRegex(program.name)}\\b`, "i");
     const match = pattern.exec(text);
-
     if (!match) continue;
+    if (isSingleWord && !hasKeywordContext(text, match.index, match.index + match[0].length)) continue;
+    found.add(key);
+  }
+  return found;
+}
 
-    if (isSingleWord) {
-      const start = Math.max(0, match.index - 80);
-      const end = Math.min(text.length, match.index + match[0].length + 80);
-      const context = text.substring(start, end);
-      if (!PROGRAM_KEYWORDS_PATTERN.test(context)) continue;
+/**
+ * Find which programs in `lookup` are mentioned in `text`.
+ * Single-word aliases ("English", "DCDA") only count when a program keyword
+ * (major, minor, BA, ...) appears within 80 characters.
+ * @returns {object[]} matched programs, in lookup order
+ */
+function detectProgramMentions(text, lookup, aliasTable = EMPTY_ALIAS_TABLE) {
+  const lower = text.toLowerCase();
+  let found;
+
+  if (lower.length !== text.length) {
+    found = detectWithRegexes(text, lookup);
+  } else {
+    const { root } = getMatcher(lookup, aliasTable);
+    found = new Set();
+    for (let start = 0; start < lower.length; start++) {
+      if (!root.has(lower[start]) || !isBoundary(text, start)) continue;
+      let node = root;
+      for (let i = start; i < lower.length; i++) {
+        node = node.get(lower[i]);
+        if (!node) break;
+        if (!node.terminals || !isBoundary(text, i + 1)) continue;
+        for (const t of node.terminals) {
+          if (found.has(t.key)) continue;
+          if (t.abbreviation && COURSE_NUMBER_AFTER.test(text.substring(i + 1, i + 8))) continue;
+          if (t.gated && !hasKeywordContext(text, start, i + 1)) continue;
+          found.add(t.key);
+        }
+      }
     }
+  }
 
-    mentions.push(program);
+  const mentions = [];
+  for (const [key, program] of lookup) {
+    if (found.has(key)) mentions.push(program);
   }
   return mentions;
 }
@@ -28,5 +129,7 @@ function detectProgramMentions(text, lookup) {
 module.exports = {
   PROGRAM_KEYWORDS_PATTERN,
   escapeRegex,
+  buildMentionMatcher,
   detectProgramMentions,
+  __test: { getMatcher },
 };
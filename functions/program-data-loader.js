@@ -0,0 +1,164 @@
+const crypto = require("crypto");
+const fs = require("fs");
+const path = require("path");
+
+// Must match BUNDLE_VERSION in scripts/build_bundle.py
+const SUPPORTED_BUNDLE_VERSION = 1;
+
+const DEFAULT_BUNDLE_PATH = path.join(__dirname, "program-data.bundle.json");
+const DEFAULT_DATA_DIR = path.join(__dirname, "program-data");
+
+// Must match HSPACE_RE / canonical_record in scripts/build_bundle.py, so the
+// per-file fallback renders the same prompt bytes as the bundle.
+const HSPACE_RE = /[\t\v\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff]+/g;
+
+function canonicalText(text) {
+  return text.normalize("NFC").split("\n").map(line => line.replace(HSPACE_RE, " ").trim()).join("\n").trim();
+}
+
+/**
+ * Sorted keys, NFC strings, collapsed whitespace: the form records are bundled in.
+ * @param {*} value
+ * @returns {*}
+ */
+function canonicalRecord(value) {
+  if (typeof value === "string") return canonicalText(value);
+  if (Array.isArray(value)) return value.map(canonicalRecord);
+  if (value && typeof value === "object") {
+    const out = {};
+    for (const key of Object.keys(value).sort()) out[key] = canonicalRecord(value[key]);
+    return out;
+  }
+  return value;
+}
+
+function slimProgram(p) {
+  return {
+    name: p.name,
+    degree: p.degree || "",
+    totalHours: p.totalHours || 0,
+    url: p.url || "",
+    description: (p.descriptions && p.descriptions[0]) || "",
+    careerOptions: p.careerOptions || [],
+    contacts: (p.contacts || []).map(c => ({
+      role: c.role || "",
+      name: c.name || "",
+      email: c.email || "",
+    })),
+  };
+}
+
+/**
+ * Build the program lookup map for detecting mentions in responses.
+ * BA/BS variants are grouped under the same lowercased name.
+ * @param {object[]} programs
+ * @returns {Map<string, object>}
+ */
+function buildProgramLookup(programs) {
+  const lookup = new Map();
+  for (const p of programs) {
+    const key = p.name.toLowerCase();
+    const slim = slimProgram(p);
+    if (lookup.has(key)) {
+      const existing = lookup.get(key);
+      existing.degree = existing.degree + ", " + slim.degree;
+    } else {
+      lookup.set(key, slim);
+    }
+  }
+  return lookup;
+}
+
+/**
+ * Must match content_hash in scripts/build_bundle.py: bundled records are
+ * already canonical, and JSON.stringify is as compact as its json.dumps.
+ * @param {object[]} programs
+ * @returns {string}
+ */
+function contentHash(programs) {
+  return crypto.createHash("sha256").update(JSON.stringify(programs)).digest("hex");
+}
+
+/**
+ * Bundle slugs must match the program-data/*.json file names (when the
+ * directory is deployed), so an added or removed file is not hidden.
+ * Edits inside a file are caught by verify_extraction.py, not here.
+ */
+function sameSlugs(bundle, dataDir) {
+  if (!fs.existsSync(dataDir)) return true;
+  const slugs = fs.readdirSync(dataDir).filter(f => f.endsWith(".json")).sort().map(f => f.slice(0, -5));
+  return JSON.stringify(slugs) === JSON.stringify(bundle.slugs);
+}
+
+/**
+ * Load the prebuilt bundle (one read + one parse). Returns null when the
+ * bundle is missing, unreadable, a layout version we don't understand,
+ * hand-edited (its records no longer match its hash), or stale (its slugs no
+ * longer match the program-data directory).
+ */
+function loadBundle(bundlePath, dataDir) {
+  if (!fs.existsSync(bundlePath)) return null;
+  try {
+    const bundle = JSON.parse(fs.readFileSync(bundlePath, "utf8"));
+    if (bundle.version !== SUPPORTED_BUNDLE_VERSION) {
+      console.warn(`Ignoring program-data bundle version ${bundle.version} (expected ${SUPPORTED_BUNDLE_VERSION}).`);
+      return null;
+    }
+    if (contentHash(bundle.programs) !== bundle.hash) {
+      console.warn("Ignoring program-data bundle: its records don't match its hash (rebuild with scripts/build_bundle.py).");
+      return null;
+    }
+    if (!sameSlugs(bundle, dataDir)) {
+      console.warn("Ignoring program-data bundle: its programs don't match program-data/ (rebuild with scripts/build_bundle.py).");
+      return null;
+    }
+    return {
+      programDetails: bundle.programs,
+      programLookup: new Map(Object.entries(bundle.lookup)),
+      hash: bundle.hash,
+      source: "bundle",
+    };
+  } catch (e) {
+    console.warn("Failed to load program-data bundle:", e.message);
+    return null;
+  }
+}
+
+/**
+ * Fallback: read every program-data/*.json file individually.
+ */
+function loadProgramFiles(dataDir) {
+  const programDetails = [];
+  if (fs.existsSync(dataDir)) {
+    const programFiles = fs.readdirSync(dataDir).filter(f => f.endsWith(".json")).sort();
+    for (const file of programFiles) {
+      try {
+        programDetails.push(canonicalRecord(JSON.parse(fs.readFileSync(path.join(dataDir, file), "utf8"))));
+      } catch (e) {
+        console.warn(`Failed to load program data file ${file}:`, e.message);
+      }
+    }
+  }
+  return {
+    programDetails,
+    programLookup: buildProgramLookup(programDetails),
+    hash: null,
+    source: "files",
+  };
+}
+
+/**
+ * Load static program data, preferring the bundle built by
+ * scripts/build_bundle.py and falling back to the per-file directory.
+ * @returns {{programDetails: object[], programLookup: Map, hash: string|null, source: string}}
+ */
+function loadProgramData({ bundlePath = DEFAULT_BUNDLE_PATH, dataDir = DEFAULT_DATA_DIR } = {}) {
+  return loadBundle(bundlePath, dataDir) || loadProgramFiles(dataDir);
+}
+
+module.exports = {
+  SUPPORTED_BUNDLE_VERSION,
+  buildProgramLookup,
+  canonicalRecord,
+  loadProgramData,
+};
@@ -1,6 +1,6 @@
 const test = require("node:test");
 const assert = require("node:assert/strict");
-const { detectProgramMentions } = require("../mention-utils");
+const { detectProgramMentions, __test } = require("../mention-utils");
 
 test("single-word program is ignored without program keywords", () => {
   const lookup = new Map([
@@ -42,3 +42,67 @@ test("multi-word programs are detected without keyword gate", () => {
   assert.equal(mentions.length, 1);
   assert.equal(mentions[0].name, "Creative Writing");
 });
+
+test("&/and alias variants match the same program", () => {
+  const lookup = new Map([
+    ["women & gender studies", { name: "Women & Gender Studies" }],
+  ]);
+  const aliases = {
+    "women & gender studies": [{ alias: "Women and Gender Studies", gated: false }],
+  };
+
+  const mentions = detectProgramMentions(
+    "Women and Gender Studies pairs well with sociology.",
+    lookup,
+    aliases
+  );
+
+  assert.equal(mentions.length, 1);
+  assert.equal(mentions[0].name, "Women & Gender Studies");
+});
+
+test("abbreviations need keyword context and ignore course numbers", () => {
+  const lookup = new Map([
+    ["digital culture and data analytics", { name: "Digital Culture and Data Analytics" }],
+  ]);
+  const aliases = {
+    "digital culture and data analytics": [{ alias: "DCDA", gated: true, abbreviation: true }],
+  };
+
+  assert.equal(detectProgramMentions("Take DCDA 40833 next spring.", lookup, aliases).length, 0);
+  assert.equal(detectProgramMentions("Have you looked at DCDA?", lookup, aliases).length, 0);
+  assert.equal(detectProgramMentions("The DCDA major is a good fit.", lookup, aliases).length, 1);
+});
+
+test("overlapping names are each detected, in lookup order", () => {
+  const lookup = new Map([
+    ["economics", { name: "Economics" }],
+    ["international economics", { name: "International Economics" }],
+    ["history", { name: "History" }],
+  ]);
+
+  const mentions = detectProgramMentions(
+    "The International Economics major shares courses with History and Economics.",
+    lookup
+  );
+
+  assert.deepEqual(mentions.map(m => m.name), ["Economics", "International Economics", "History"]);
+});
+
+test("names must match on word boundaries", () => {
+  const lookup = new Map([
+    ["religion", { name: "Religion" }],
+  ]);
+
+  assert.equal(detectProgramMentions("Irreligion is not a major here.", lookup).length, 0);
+  assert.equal(detectProgramMentions("Religions major programs vary.", lookup).length, 0);
+});
+
+test("matcher is reused when no alias table is passed", () => {
+  const lookup = new Map([["history", { name: "History" }]]);
+  const first = __test.getMatcher(lookup);
+  assert.equal(__test.getMatcher(lookup), first);
+  assert.equal(__test.getMatcher(lookup, undefined), first);
+  assert.equal(__test.getMatcher(lookup, null), first);
+  assert.notEqual(__test.getMatcher(lookup, { history: [{ alias: "HIST", gated: true }] }), first);
+});
@@ -0,0 +1,99 @@
+const test = require("node:test");
+const assert = require("node:assert/strict");
+const crypto = require("node:crypto");
+const fs = require("node:fs");
+const os = require("node:os");
+const path = require("node:path");
+const { loadProgramData, buildProgramLookup, canonicalRecord } = require("../program-data-loader");
+
+function makeTempDir() {
+  return fs.mkdtempSync(path.join(os.tmpdir(), "program-data-"));
+}
+
+test("shipped bundle matches the per-file program data", () => {
+  const fromBundle = loadProgramData();
+  const fromFiles = loadProgramData({ bundlePath: "/nonexistent/bundle.json" });
+
+  assert.equal(fromBundle.source, "bundle");
+  assert.equal(fromFiles.source, "files");
+  assert.match(fromBundle.hash, /^[0-9a-f]{64}$/);
+  assert.deepEqual(fromBundle.programDetails, fromFiles.programDetails);
+  assert.deepEqual([...fromBundle.programLookup], [...fromFiles.programLookup]);
+});
+
+test("falls back to program-data files when bundle version is unsupported", () => {
+  const dir = makeTempDir();
+  const dataDir = path.join(dir, "program-data");
+  fs.mkdirSync(dataDir);
+  fs.writeFileSync(path.join(dataDir, "history.json"), JSON.stringify({ name: "History", degree: "BA" }));
+  const bundlePath = path.join(dir, "bundle.json");
+  fs.writeFileSync(bundlePath, JSON.stringify({ version: 999, programs: [], lookup: {} }));
+
+  const result = loadProgramData({ bundlePath, dataDir });
+  assert.equal(result.source, "files");
+  assert.equal(result.programDetails.length, 1);
+  assert.equal(result.programLookup.get("history").degree, "BA");
+});
+
+test("buildProgramLookup groups degree variants under one name", () => {
+  const lookup = buildProgramLookup([
+    { name: "Economics", degree: "BA" },
+    { name: "Economics", degree: "BS" },
+  ]);
+
+  assert.equal(lookup.size, 1);
+  assert.equal(lookup.get("economics").degree, "BA, BS");
+});
+
+test("canonicalRecord ignores key order, whitespace and Unicode composition", () => {
+  const edited = {
+    degree: "BA",
+    name: "Spanish  and\u00a0Hispanic Studies ",
+    descriptions: ["Cafe\u0301 culture\t \r\nsecond line  "],
+  };
+  const canonical = canonicalRecord(edited);
+
+  assert.deepEqual(Object.keys(canonical), ["degree", "descriptions", "name"]);
+  assert.equal(canonical.name, "Spanish and Hispanic Studies");
+  assert.equal(canonical.descriptions[0], "Caf\u00e9 culture\nsecond line");
+  assert.equal(JSON.stringify(canonicalRecord(canonical)), JSON.stringify(canonical));
+});
+
+function writeBundleFixture() {
+  const dir = makeTempDir();
+  const dataDir = path.join(dir, "program-data");
+  fs.mkdirSync(dataDir);
+  const history = { degree: "BA", name: "History" };
+  fs.writeFileSync(path.join(dataDir, "history.json"), JSON.stringify(history));
+  const bundle = {
+    version: 1,
+    hash: crypto.createHash("sha256").update(JSON.stringify([history])).digest("hex"),
+    count: 1,
+    slugs: ["history"],
+    programs: [history],
+    lookup: { history: { ...history } },
+  };
+  return { dir, dataDir, bundle, bundlePath: path.join(dir, "bundle.json") };
+}
+
+test("falls back to program-data files when the bundle was hand-edited", () => {
+  const { dataDir, bundle, bundlePath } = writeBundleFixture();
+  fs.writeFileSync(bundlePath, JSON.stringify(bundle));
+  assert.equal(loadProgramData({ bundlePath, dataDir }).source, "bundle");
+
+  bundle.programs[0].degree = "BS";
+  fs.writeFileSync(bundlePath, JSON.stringify(bundle));
+  const result = loadProgramData({ bundlePath, dataDir });
+  assert.equal(result.source, "files");
+  assert.equal(result.programLookup.get("history").degree, "BA");
+});
+
+test("falls back to program-data files when a file was added since the bundle", () => {
+  const { dataDir, bundle, bundlePath } = writeBundleFixture();
+  fs.writeFileSync(bundlePath, JSON.stringify(bundle));
+  fs.writeFileSync(path.join(dataDir, "economics.json"), JSON.stringify({ name: "Economics", degree: "BS" }));
+
+  const result = loadProgramData({ bundlePath, dataDir });
+  assert.equal(result.source, "files");
+  assert.equal(result.programDetails.length, 2);
+});
@@ -0,0 +1,46 @@
+const test = require("node:test");
+const assert = require("node:assert/strict");
+const fs = require("node:fs");
+const path = require("node:path");
+const Ajv = require("ajv");
+
+const SCHEMA_PATH = path.resolve(__dirname, "../schemas/program-data.schema.json");
+const DATA_DIR = path.resolve(__dirname, "../program-data");
+
+function compileSchema() {
+  const ajv = new Ajv({ allErrors: true });
+  return ajv.compile(JSON.parse(fs.readFileSync(SCHEMA_PATH, "utf8")));
+}
+
+test("every program-data file matches program-data.schema.json", () => {
+  const validate = compileSchema();
+  const files = fs.readdirSync(DATA_DIR).filter((f) => f.endsWith(".json"));
+  assert.ok(files.length > 0);
+
+  for (const file of files) {
+    const data = JSON.parse(fs.readFileSync(path.join(DATA_DIR, file), "utf8"));
+    assert.ok(validate(data), `${file}: ${JSON.stringify(validate.errors)}`);
+  }
+});
+
+test("schema rejects unknown keys and malformed contacts", () => {
+  const validate = compileSchema();
+  const record = {
+    name: "History",
+    abbreviation: "HIST",
+    degree: "BA",
+    totalHours: 33,
+    url: "https://www.tcu.edu/academics/programs/history.php",
+    descriptions: [],
+    requirements: {
+      requiredCourses: { hours: 9, courses: [] },
+      electiveCourses: { hours: 24, description: "" },
+    },
+    careerOptions: [],
+    contacts: [{ role: "Chair", name: "A. Person", email: "a.person@tcu.edu" }],
+  };
+  assert.equal(validate(record), true);
+  assert.equal(validate({ ...record, extra: 1 }), false);
+  assert.equal(validate({ ...record, contacts: [{ role: "Chair", name: "A. Person", email: "nobody" }] }), false);
+  assert.equal(validate({ ...record, degree: "PhD" }), false);
+});
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Audit functions/program-data/ against the source Excel posters.
+
+verify_extraction.py only checks that fields are filled in. This re-extracts
+every workbook in files/other_programs/ and diffs the fields students rely
+on against the committed JSON it maps to (the slug plan extract_programs.py
+would use: same manifest names, hand-curated slugs and kept hand-edited
+outputs):
+
+    totalHours        value
+    url               value
+    requiredCourses   courses added / removed in the source
+    contacts          contacts added / removed, and changed fields, matched by email or name
+
+Workbooks are read through the same parsed-grid cache as the extractor
+(build/grid-cache/, see grid_cache.py), so an unchanged workbook is never
+parsed twice and a typical run is hashing, the extraction rules and diffing.
+
+Committed files that no workbook maps to (DCDA, English, the interdisciplinary
+minors, ...) are hand-curated and listed separately rather than diffed.
+Extracted files whose hash no longer matches the build manifest are marked
+handEdited, since the difference was probably made on purpose.
+
+The full report is written to build/audit.json (or printed with --json).
+The script exits non-zero when any file differs or fails to extract, so it
+can run as a commit check.
+
+Usage:
+    python3 scripts/audit_extraction.py
+    python3 scripts/audit_extraction.py --json          # report on stdout
+    python3 scripts/audit_extraction.py --no-cache      # re-parse every workbook
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from extract_programs import (
+    EXTRACTOR_VERSION, INPUT_DIR, OUTPUT_DIR, SlugCollisionError,
+    extract_all, hand_curated_slugs, has_dedicated_file, is_workbook, load_manifest, output_edited,
+    plan_slugs,
+)
+from grid_cache import GRID_CACHE_DIR
+from layout_plan import DEFAULT_LAYOUT, load_layout
+
+ROOT = Path(__file__).parent.parent
+REPORT_PATH = ROOT / "build" / "audit.json"
+
+# 2: no extraction cache of its own (cacheHits dropped), run()'s slug plan
+AUDIT_VERSION = 2
+CONTACT_FIELDS = ("role", "name", "email", "phone", "office")
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def extract_sources(xlsx_files, jobs, layout, grid_cache):
+    """Return ({xlsx name: program}, {xlsx name: error}) for every workbook."""
+    programs = {}
+    errors = {}
+    for xlsx_path, (program, error, _) in zip(xlsx_files, extract_all(xlsx_files, jobs, layout=layout, grid_cache=grid_cache)):
+        if error is not None:
+            errors[xlsx_path.name] = error
+        else:
+            programs[xlsx_path.name] = program
+    return programs, errors
+
+
+def plan_outputs(xlsx_names, programs, sources):
+    """{xlsx name: output file name}, as extract_programs.run() would plan them.
+
+    Workbooks that failed to extract keep the name recorded in the manifest,
+    hand-curated files are reserved, and a hand-edited output whose slug
+    changed stays where it is. Raises SlugCollisionError.
+    """
+    named = {name: (p["name"], p["degree"]) for name, p in programs.items() if not has_dedicated_file(p)}
+    for name in xlsx_names:
+        entry = sources.get(name, {})
+        if name not in programs and entry.get("output"):
+            named[name] = (entry["name"], entry["degree"])
+    outputs = {}
+    for name, slug in plan_slugs(named, hand_curated_slugs(sources)).items():
+        previous = sources.get(name, {})
+        output_name = f"{slug}.json"
+        if previous.get("output") not in (None, output_name) and output_edited(previous):
+            output_name = previous["output"]
+        outputs[name] = output_name
+    return outputs
+
+
+def normalize(value):
+    return WHITESPACE_RE.sub(" ", value).strip() if isinstance(value, str) else value
+
+
+def diff_value(source, committed):
+    if normalize(source) == normalize(committed):
+        return None
+    return {"source": source, "committed": committed}
+
+
+def required_courses(program):
+    return (program.get("requirements") or {}).get("requiredCourses", {}).get("courses") or []
+
+
+def diff_courses(source, committed):
+    source_set = {normalize(c) for c in source}
+    committed_set = {normalize(c) for c in committed}
+    if source_set == committed_set:
+        return None
+    return {"added": sorted(source_set - committed_set), "removed": sorted(committed_set - source_set)}
+
+
+def contact_key(contact):
+    return normalize(contact.get("email") or contact.get("name") or "").lower()
+
+
+def diff_contacts(source, committed):
+    source_by_key = {contact_key(c): c for c in source}
+    committed_by_key = {contact_key(c): c for c in committed}
+    changed = []
+    for key in sorted(source_by_key.keys() & committed_by_key.keys()):
+        for field in CONTACT_FIELDS:
+            d = diff_value(source_by_key[key].get(field), committed_by_key[key].get(field))
+            if d:
+                changed.append({"contact": key, "field": field, **d})
+    added = sorted(source_by_key.keys() - committed_by_key.keys())
+    removed = sorted(committed_by_key.keys() - source_by_key.keys())
+    if not (added or removed or changed):
+        return None
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def diff_program(source, committed):
+    """Field-level differences between an extracted and a committed record."""
+    diffs = {
+        "totalHours": diff_value(source.get("totalHours"), committed.get("totalHours")),
+        "url": diff_value(source.get("url"), committed.get("url")),
+        "requiredCourses": diff_courses(required_courses(source), required_courses(committed)),
+        "contacts": diff_contacts(source.get("contacts") or [], committed.get("contacts") or []),
+    }
+    return {field: d for field, d in diffs.items() if d is not None}
+
+
+def audit(xlsx_files, jobs=1, layout=DEFAULT_LAYOUT, grid_cache=GRID_CACHE_DIR):
+    """Build the audit report dict."""
+    programs, errors = extract_sources(xlsx_files, jobs, layout, grid_cache)
+    manifest_sources = load_manifest()["sources"]
+    plan = plan_outputs([f.name for f in xlsx_files], programs, manifest_sources)
+
+    workbooks = []
+    for xlsx_path in xlsx_files:
+        entry = {"file": xlsx_path.name}
+        if xlsx_path.name in errors:
+            entry.update(status="error", error=errors[xlsx_path.name])
+        elif xlsx_path.name not in plan:
+            entry["status"] = "skipped"
+        else:
+            output_path = OUTPUT_DIR / plan[xlsx_path.name]
+            entry["output"] = output_path.name
+            if not output_path.exists():
+                entry["status"] = "missing"
+            else:
+                with open(output_path, encoding="utf-8") as f:
+                    committed = json.load(f)
+                fields = diff_program(programs[xlsx_path.name], committed)
+                entry["status"] = "differs" if fields else "ok"
+                if fields:
+                    entry["fields"] = fields
+                recorded = manifest_sources.get(xlsx_path.name, {})
+                if recorded.get("output") == output_path.name and output_edited(recorded):
+                    entry["handEdited"] = True
+        workbooks.append(entry)
+
+    mapped = set(plan.values())
+    hand_curated = sorted(p.name for p in OUTPUT_DIR.glob("*.json") if p.name not in mapped)
+    counts = {}
+    for entry in workbooks:
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+    return {
+        "version": AUDIT_VERSION,
+        "extractorVersion": EXTRACTOR_VERSION,
+        "layoutHash": load_layout(layout).hash,
+        "counts": counts,
+        "workbooks": workbooks,
+        "handCurated": hand_curated,
+    }
+
+
+def print_report(report):
+    for entry in report["workbooks"]:
+        if entry["status"] in ("ok", "skipped"):
+            continue
+        target = entry.get("output", "")
+        note = " (hand-edited)" if entry.get("handEdited") else ""
+        print(f"  [{entry['status']}] {entry['file']} -> {target}{note}")
+        if "error" in entry:
+            print(f"        {entry['error']}")
+        for field, d in entry.get("fields", {}).items():
+            if "source" in d:
+                print(f"        {field}: source {d['source']!r}, committed {d['committed']!r}")
+                continue
+            for key in ("added", "removed"):
+                for item in d.get(key, []):
+                    print(f"        {field} {key}: {item}")
+            for change in d.get("changed", []):
+                print(f"        {field} {change['contact']} {change['field']}: "
+                      f"source {change['source']!r}, committed {change['committed']!r}")
+    counts = ", ".join(f"{n} {status}" for status, n in sorted(report["counts"].items()))
+    print(f"\nWorkbooks: {counts}")
+    print(f"Hand-curated files (not audited): {len(report['handCurated'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff committed program-data against the source posters.")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="worker processes for cache misses (default: CPU count)")
+    parser.add_argument("--layout", default=DEFAULT_LAYOUT,
+                        help=f"poster layout spec in scripts/layouts/ (default: {DEFAULT_LAYOUT})")
+    parser.add_argument("--no-cache", action="store_true", help="parse every workbook instead of using build/grid-cache/")
+    parser.add_argument("--json", action="store_true", help="print the JSON report instead of a summary")
+    parser.add_argument("--out", type=Path, default=REPORT_PATH, help="report path (default: build/audit.json)")
+    args = parser.parse_args()
+
+    if not INPUT_DIR.exists():
+        print(f"ERROR: Input directory not found: {INPUT_DIR}", file=sys.stderr)
+        return 1
+    xlsx_files = sorted(f for f in INPUT_DIR.glob("*.xlsx") if is_workbook(f.name))
+
+    start = time.perf_counter()
+    try:
+        report = audit(xlsx_files, args.jobs, args.layout, None if args.no_cache else GRID_CACHE_DIR)
+    except SlugCollisionError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    elapsed = (time.perf_counter() - start) * 1000
+
+    text = json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(text, encoding="utf-8")
+    if args.json:
+        sys.stdout.write(text)
+    else:
+        print(f"Audited {len(xlsx_files)} workbooks in {elapsed:.0f} ms -> {args.out}\n")
+        print_report(report)
+    failing = report["counts"].get("differs", 0) + report["counts"].get("error", 0) + report["counts"].get("missing", 0)
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
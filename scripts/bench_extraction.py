@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Benchmark extract_programs.py on synthetic AddRan poster workbooks.
+
+The real spreadsheets in files/other_programs/ are not all checked in, so this
+generates workbooks with the layout the extractors expect (name in H2, degree
+in H4, hours in M8, descriptions in A8/A32, courses in column L rows 10-40,
+internship/career/contact blocks under column U headers) and scales the
+number of merged ranges, filler rows and workbooks.
+
+Each run times workbook loading (parsed and from the grid cache), every
+extract_* phase and end-to-end extract_single_program per workbook, plus
+serial, parallel and grid-cached extract_all passes, and
+appends one JSON record to build/bench/extraction.jsonl. Records carry the
+parameters, git commit and environment, so runs on any Linux box can be
+compared; --compare prints the change against the last run with the same
+parameters.
+
+Usage:
+    python3 scripts/bench_extraction.py
+    python3 scripts/bench_extraction.py --workbooks 40 --merges 800 --rows 400 --compare
+    python3 scripts/bench_extraction.py --generate-only --out /tmp/posters
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import openpyxl
+
+import extract_programs as ep
+
+ROOT = Path(__file__).parent.parent
+RESULTS_PATH = ROOT / "build" / "bench" / "extraction.jsonl"
+
+SAMPLE_PROGRAMS = [
+    ("Economics", "Bachelor of Arts", "ECON"),
+    ("Economics", "Bachelor of Science", "ECON"),
+    ("History", "Bachelor of Arts", "HIST"),
+    ("Criminology & Criminal Justice", "Bachelor of Science", "CRJU"),
+    ("Geography", "Bachelor of Science", "GEOG"),
+    ("Sociology", "Bachelor of Arts", "SOCI"),
+    ("Philosophy", "Bachelor of Arts", "PHIL"),
+    ("General Studies", "Bachelor of General Studies", "GENS"),
+]
+FACULTY = ["Dr. Dawn Elliott", "Dr. Jane Doe", "Dr. Emmanuel Garcia", "Dr. Rosemarie Fike", "Dr. Sam Lee"]
+CAREERS = ["Policy Analyst", "Lawyer", "Museum Curator", "Data Analyst", "Teacher",
+           "Journalist", "Urban Planner", "Grant Writer", "Archivist", "Consultant"]
+
+# Output fields timed individually, in the order extract_single_program runs them
+PHASES = [
+    (ep.FIELD_EXTRACTORS[field].__name__, field)
+    for field in ("name", "degree", "totalHours", "descriptions", "requirements",
+                  "careerOptions", "contacts", "internship")
+]
+
+
+def merge(ws, min_row, min_col, max_row, max_col):
+    ws.merge_cells(start_row=min_row, start_column=min_col, end_row=max_row, end_column=max_col)
+
+
+def generate_poster(path, index, merges=200, rows=100, seed=0):
+    """Write one synthetic poster workbook. Returns the program name used."""
+    rng = random.Random(seed * 10007 + index)
+    name, degree, subject = SAMPLE_PROGRAMS[index % len(SAMPLE_PROGRAMS)]
+    if index >= len(SAMPLE_PROGRAMS):
+        name = f"{name} {index // len(SAMPLE_PROGRAMS) + 1}"
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Program"
+
+    ws["H2"] = name
+    merge(ws, 2, 8, 3, 16)
+    ws["H4"] = degree
+    merge(ws, 4, 8, 5, 16)
+    hours = rng.choice([30, 33, 36, 39])
+    ws["M8"] = f"{hours} hours"
+    merge(ws, 8, 13, 8, 14)
+    ws["A8"] = f"The {name} major asks students to complete {hours} hours of coursework."
+    merge(ws, 8, 1, 20, 10)
+    ws["A32"] = f"Students in {name} build research, writing and analysis skills."
+    merge(ws, 32, 1, 40, 10)
+
+    # Courses: column L, rows 10-40
+    row = 10
+    ws.cell(row, 12, "Required Courses - 12 hrs.")
+    merge(ws, row, 12, row, 15)
+    row += 1
+    for k in range(rng.randint(3, 8)):
+        ws.cell(row, 12, f"{subject} {30003 + k * 10}")
+        row += 1
+    ws.cell(row, 12, "A. One course from the methods list")
+    row += 1
+    ws.cell(row, 12, f"Elective Major Courses - {hours - 12} hrs.")
+    merge(ws, row, 12, row + 1, 14)
+    row += 2
+    for k in range(rng.randint(2, 6)):
+        if row >= 40:
+            break
+        ws.cell(row, 12, f"{subject} {40003 + k * 10}")
+        row += 1
+
+    # Column U blocks: internship, careers, contacts
+    ws["U7"] = "INTERNSHIP OPPORTUNITIES"
+    merge(ws, 7, 21, 7, 28)
+    ws["U8"] = f"{subject} 40990 - Internship. Prerequisites: 12 hrs. in the major."
+    merge(ws, 8, 21, 9, 28)
+
+    ws["U30"] = "WHAT CAN I DO WITH THIS MAJOR?"
+    merge(ws, 30, 21, 30, 28)
+    for k, career in enumerate(rng.sample(CAREERS, 6)):
+        col = 21 if k % 2 == 0 else 24
+        ws.cell(31 + k // 2, col, f"{chr(65 + k)}. {career}")
+        merge(ws, 31 + k // 2, col, 31 + k // 2, col + 2)
+
+    ws["U40"] = "CONTACT INFORMATION"
+    merge(ws, 40, 21, 40, 28)
+    contact_rows = [
+        "Department Chair", rng.choice(FACULTY), "817-257-1234", f"dept{index}@tcu.edu", "Reed Hall 100",
+        "AddRan Career Consultant", rng.choice(FACULTY), "addran.careers@tcu.edu",
+    ]
+    for k, text in enumerate(contact_rows):
+        ws.cell(41 + k, 21, text)
+        merge(ws, 41 + k, 21, 41 + k, 28)
+
+    # Filler rows below the poster and decorative merged ranges
+    for r in range(71, 71 + rows):
+        for c in range(1, 29, 3):
+            ws.cell(r, c, f"filler {r}-{c}")
+    for m in range(merges):
+        r = 71 + rows + m * 2
+        merge(ws, r, 1 + m % 20, r + 1, 3 + m % 20)
+
+    # Second sheet, like the grade lookup on the real posters
+    grades = wb.create_sheet("Grade Lookup")
+    for r in range(1, 50):
+        grades.cell(r, 1, r)
+        grades.cell(r, 2, f"=A{r}*2")
+
+    wb.save(path)
+    return name
+
+
+def generate_posters(out_dir, workbooks, merges, rows, seed=0):
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(workbooks):
+        path = out_dir / f"synthetic-{i:03d}.xlsx"
+        generate_poster(path, i, merges=merges, rows=rows, seed=seed)
+        paths.append(path)
+    return paths
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def time_call(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run_benchmark(paths, repeat, jobs, grid_cache):
+    """Return {'phases': {phase: [ms...]}, 'endToEnd': [ms...], 'batch': {...}}.
+
+    Parsing and end-to-end timings bypass the grid cache; load_cached_grid
+    and the cachedSerialMs batch read from a warm cache in grid_cache.
+    """
+    plan = ep.load_layout(ep.DEFAULT_LAYOUT)
+    phases = {"load_sheet_grid": [], "load_cached_grid": [], "read_cells": []}
+    phases.update({name: [] for name, _ in PHASES})
+    end_to_end = []
+    ep.extract_all(paths, 1, grid_cache=grid_cache)
+
+    for _ in range(repeat):
+        for path in paths:
+            grid, ms = time_call(ep.load_sheet_grid, path, None, plan.rows, plan.cols)
+            phases["load_sheet_grid"].append(ms)
+            _, ms = time_call(ep.load_cached_grid, path, None, plan.rows, plan.cols, grid_cache)
+            phases["load_cached_grid"].append(ms)
+            cells, ms = time_call(plan.read, grid)
+            phases["read_cells"].append(ms)
+            for name, field in PHASES:
+                _, ms = time_call(ep.extract_field, cells, field)
+                phases[name].append(ms)
+            _, ms = time_call(ep.extract_single_program, path, None, ep.DEFAULT_LAYOUT, None)
+            end_to_end.append(ms)
+
+    _, serial_ms = time_call(ep.extract_all, paths, 1, False, ep.DEFAULT_LAYOUT, None)
+    _, parallel_ms = time_call(ep.extract_all, paths, jobs, False, ep.DEFAULT_LAYOUT, None)
+    _, cached_ms = time_call(ep.extract_all, paths, 1, False, ep.DEFAULT_LAYOUT, grid_cache)
+    return {
+        "phases": phases,
+        "endToEnd": end_to_end,
+        "batch": {"serialMs": serial_ms, "parallelMs": parallel_ms, "jobs": jobs, "cachedSerialMs": cached_ms},
+    }
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "meanMs": round(statistics.fmean(samples), 4),
+        "medianMs": round(statistics.median(samples), 4),
+        "p95Ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "totalMs": round(sum(samples), 4),
+    }
+
+
+def previous_result(params):
+    """Most recent stored result with the same parameters, or None."""
+    if not RESULTS_PATH.exists():
+        return None
+    match = None
+    with open(RESULTS_PATH) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("params") == params:
+                match = record
+    return match
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction on synthetic poster workbooks.")
+    parser.add_argument("--workbooks", type=int, default=16, help="number of workbooks (default: 16)")
+    parser.add_argument("--merges", type=int, default=300, help="decorative merged ranges per workbook")
+    parser.add_argument("--rows", type=int, default=150, help="filler rows below the poster region")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes over every workbook")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="workers for the parallel pass")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="keep generated workbooks here (default: temp dir)")
+    parser.add_argument("--generate-only", action="store_true", help="write the workbooks and exit")
+    parser.add_argument("--compare", action="store_true", help="compare with the last run with the same parameters")
+    parser.add_argument("--no-save", action="store_true", help="don't append the result to the results file")
+    args = parser.parse_args()
+
+    params = {"workbooks": args.workbooks, "merges": args.merges, "rows": args.rows,
+              "repeat": args.repeat, "seed": args.seed}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = args.out or Path(tmp)
+        _, gen_ms = time_call(generate_posters, out_dir, args.workbooks, args.merges, args.rows, args.seed)
+        paths = sorted(out_dir.glob("synthetic-*.xlsx"))
+        print(f"Generated {len(paths)} workbooks in {gen_ms / 1000:.1f}s -> {out_dir}")
+        if args.generate_only:
+            return 0
+        timings = run_benchmark(paths, args.repeat, args.jobs, Path(tmp) / "grid-cache")
+
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "extractorVersion": ep.EXTRACTOR_VERSION,
+        "params": params,
+        "env": {
+            "python": platform.python_version(),
+            "openpyxl": openpyxl.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "phases": {name: summarize(samples) for name, samples in timings["phases"].items()},
+        "endToEnd": summarize(timings["endToEnd"]),
+        "batch": {k: round(v, 2) if isinstance(v, float) else v for k, v in timings["batch"].items()},
+    }
+
+    baseline = previous_result(params) if args.compare else None
+
+    print(f"\n{'Phase':<26s} {'Mean ms':>9s} {'p95 ms':>9s} {'Total ms':>10s}" + ("  vs last" if baseline else ""))
+    print("-" * (58 + (10 if baseline else 0)))
+    rows = list(record["phases"].items()) + [("end-to-end (per workbook)", record["endToEnd"])]
+    for name, stats in rows:
+        line = f"{name:<26s} {stats['meanMs']:>9.3f} {stats['p95Ms']:>9.3f} {stats['totalMs']:>10.1f}"
+        if baseline:
+            old = baseline["endToEnd"] if name.startswith("end-to-end") else baseline["phases"].get(name)
+            if old and old["meanMs"]:
+                line += f"  {(stats['meanMs'] / old['meanMs'] - 1) * 100:+6.1f}%"
+        print(line)
+
+    batch = record["batch"]
+    print(f"\nBatch of {len(paths)}: serial {batch['serialMs']:.0f} ms, "
+          f"{batch['jobs']} jobs {batch['parallelMs']:.0f} ms, "
+          f"serial from grid cache {batch['cachedSerialMs']:.0f} ms")
+    if args.compare and not baseline:
+        print("No earlier run with these parameters to compare against.")
+
+    if not args.no_save:
+        RESULTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(RESULTS_PATH, "a") as f:
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+        print(f"Result appended to {RESULTS_PATH.relative_to(ROOT)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Bundle functions/program-data/*.json into one minified file for cold starts.
+
+functions/index.js used to read and parse every program-data file and then
+build its mention lookup by hand. The bundle holds all records (in slug
+order), the prebuilt name -> record lookup, and a content hash so the
+function does a single read + parse and can log which data it is serving.
+
+Records are bundled in canonical form (canonical_record): keys sorted,
+strings NFC-normalized, and horizontal whitespace collapsed and trimmed per
+line. The system prompt is rendered from these records, so a reordered key, a
+double space or a decomposed accent in a hand-edited file doesn't change
+the prompt prefix or the content hash. program-data-loader.js applies the
+same rules when it falls back to the per-file directory.
+
+extract_programs.py rebuilds the bundle after each run; verify_extraction.py
+flags a bundle whose hash no longer matches program-data/.
+
+Usage:
+    python3 scripts/build_bundle.py
+"""
+
+import hashlib
+import json
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+PROGRAM_DATA_DIR = ROOT / "functions" / "program-data"
+BUNDLE_PATH = ROOT / "functions" / "program-data.bundle.json"
+
+# Bump when the bundle layout changes; program-data-loader.js checks it
+BUNDLE_VERSION = 1
+
+# Whitespace collapsed inside a line. Spelled out rather than \s so it matches
+# canonicalText in program-data-loader.js character for character.
+HSPACE_RE = re.compile(r"[\t\v\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff]+")
+
+
+def load_program_records(data_dir=PROGRAM_DATA_DIR):
+    """Return [(slug, record)] for every program-data file, sorted by slug."""
+    records = []
+    for path in sorted(data_dir.glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            records.append((path.stem, json.load(f)))
+    return records
+
+
+def canonical_text(text):
+    """NFC, one space between words, no whitespace at line ends or around the text."""
+    lines = unicodedata.normalize("NFC", text).split("\n")
+    return "\n".join(HSPACE_RE.sub(" ", line).strip() for line in lines).strip()
+
+
+def canonical_record(value):
+    """A record (or any JSON value) with sorted keys and canonical strings."""
+    if isinstance(value, str):
+        return canonical_text(value)
+    if isinstance(value, list):
+        return [canonical_record(item) for item in value]
+    if isinstance(value, dict):
+        return {key: canonical_record(value[key]) for key in sorted(value)}
+    return value
+
+
+def slim_record(program):
+    """Mention-lookup entry; mirrors the fields index.js sends to the client."""
+    return {
+        "name": program["name"],
+        "degree": program.get("degree") or "",
+        "totalHours": program.get("totalHours") or 0,
+        "url": program.get("url") or "",
+        "description": (program.get("descriptions") or [""])[0] or "",
+        "careerOptions": program.get("careerOptions") or [],
+        "contacts": [
+            {"role": c.get("role") or "", "name": c.get("name") or "", "email": c.get("email") or ""}
+            for c in program.get("contacts") or []
+        ],
+    }
+
+
+def build_lookup(programs):
+    """Lowercased name -> slim record, with BA/BS/minor variants grouped."""
+    lookup = {}
+    for program in programs:
+        key = program["name"].lower()
+        slim = slim_record(program)
+        if key in lookup:
+            lookup[key]["degree"] += ", " + slim["degree"]
+        else:
+            lookup[key] = slim
+    return lookup
+
+
+def content_hash(programs):
+    """SHA-256 of the canonical records; cosmetic edits don't change it."""
+    payload = json.dumps([canonical_record(p) for p in programs], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_bundle(records):
+    programs = [canonical_record(record) for _, record in records]
+    return {
+        "version": BUNDLE_VERSION,
+        "hash": content_hash(programs),
+        "count": len(programs),
+        "slugs": [slug for slug, _ in records],
+        "programs": programs,
+        "lookup": build_lookup(programs),
+    }
+
+
+def read_bundle(path=BUNDLE_PATH):
+    """Load an existing bundle, or None if missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_bundle(data_dir=PROGRAM_DATA_DIR, path=BUNDLE_PATH):
+    """Rebuild the bundle. Returns (bundle, written); unchanged bundles aren't rewritten."""
+    bundle = build_bundle(load_program_records(data_dir))
+    text = json.dumps(bundle, ensure_ascii=False, separators=(",", ":")) + "\n"
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return bundle, False
+    path.write_text(text, encoding="utf-8")
+    return bundle, True
+
+
+def main():
+    bundle, written = write_bundle()
+    size = BUNDLE_PATH.stat().st_size
+    status = "wrote" if written else "unchanged"
+    print(f"{BUNDLE_PATH.relative_to(ROOT)} {status}: {bundle['count']} programs, "
+          f"{size:,} bytes, hash {bundle['hash'][:12]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
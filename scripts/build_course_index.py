@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Build a course-code inverted index over functions/program-data/.
+
+Questions like "which programs count ENGL 10803?" or "what overlaps between
+the DCDA major and the English minor?" used to mean scanning every record
+and regex-matching free-text course strings. This normalizes every course
+code in requirements.requiredCourses / electiveCourses (the SUBJ 12345
+pattern extract_courses uses) into build/course-index.json. Course lists
+carry their subject forward ("RELI 20543, 20523, or 20643" is three RELI
+courses) and cross-listed subjects apply to the number ("HARE/ANTH/SOCI
+30403"). A bare number only joins a list through ",", "or", "and", "&" or
+"/", so "at the 30000 level" is not read as a course:
+
+    courses    code -> [{program, section, sectionHours, creditHours, label, choice}]
+    programs   slug -> sorted codes
+    overlaps   "slugA|slugB" (sorted) -> codes both programs count, non-empty pairs only
+
+creditHours is the last digit of a five-digit TCU course number (None for
+four-digit ones). choice is true when the course string lists several codes
+("MATH 10043 or INSC 20153"), i.e. the course is one option of a slot.
+
+CourseIndex is the query API: programs_for(code), courses_for(slug) and
+overlap(a, b) are dictionary lookups on the loaded artifact. Queries use
+the existing build/course-index.json and only rebuild it when it is
+missing, from an older index version, or its dataHash no longer matches
+program-data/ (or with --rebuild).
+
+Usage:
+    python3 scripts/build_course_index.py
+    python3 scripts/build_course_index.py --course "ENGL 10803"
+    python3 scripts/build_course_index.py --overlap digital-culture-and-data-analytics english-minor
+    python3 scripts/build_course_index.py --rebuild
+"""
+
+import argparse
+import json
+import re
+import sys
+from itertools import combinations
+from pathlib import Path
+
+from build_bundle import PROGRAM_DATA_DIR, content_hash, load_program_records
+
+ROOT = Path(__file__).parent.parent
+COURSE_INDEX_PATH = ROOT / "build" / "course-index.json"
+
+# 2: course lists and cross-listed subjects are expanded
+COURSE_INDEX_VERSION = 2
+SECTIONS = ("requiredCourses", "electiveCourses")
+# Same pattern as extract_courses, but tolerant of a missing space ("ENGL10803")
+COURSE_CODE_RE = re.compile(r"\b([A-Z]{3,4})\s*(\d{4,5})\b")
+# Subjects (cross-listed with / or |), a number, then more numbers joined by list separators
+COURSE_LIST_RE = re.compile(
+    r"\b((?:[A-Z]{3,4}\s*[/|]\s*)*[A-Z]{3,4})\s*(\d{4,5})\b"
+    r"((?:\s*(?:,|/|&|\bor\b|\band\b)\s*(?:(?:or|and)\s+)?\d{4,5}\b)*)"
+)
+SUBJECT_SEPARATOR_RE = re.compile(r"\s*[/|]\s*")
+NUMBER_RE = re.compile(r"\d{4,5}")
+LABEL_RE = re.compile(r"^([^:]{1,60}):")
+
+
+def normalize_code(text):
+    """'engl  10803' -> 'ENGL 10803', or None if text holds no course code."""
+    match = COURSE_CODE_RE.search(text.upper())
+    return f"{match.group(1)} {match.group(2)}" if match else None
+
+
+def credit_hours(number):
+    return int(number[-1]) if len(number) == 5 else None
+
+
+def course_codes(line):
+    """Every course code in a free-text course line, in order, without duplicates.
+
+    'RELI 20543, 20523, or 20643' -> ['RELI 20543', 'RELI 20523', 'RELI 20643']
+    'HARE/ANTH/SOCI 30403'        -> ['HARE 30403', 'ANTH 30403', 'SOCI 30403']
+    """
+    codes = []
+    for match in COURSE_LIST_RE.finditer(line or ""):
+        subjects = SUBJECT_SEPARATOR_RE.split(match.group(1))
+        for number in [match.group(2)] + NUMBER_RE.findall(match.group(3)):
+            for subject in subjects:
+                code = f"{subject} {number}"
+                if code not in codes:
+                    codes.append(code)
+    return codes
+
+
+def course_entries(program):
+    """Yield (code, section, section hours, credit hours, label, choice) for one record."""
+    requirements = program.get("requirements") or {}
+    for section in SECTIONS:
+        block = requirements.get(section) or {}
+        for line in block.get("courses") or []:
+            codes = course_codes(line)
+            label = LABEL_RE.match(line or "")
+            for code in codes:
+                yield (code, section, block.get("hours"), credit_hours(code.split()[1]),
+                       label.group(1).strip() if label else None, len(codes) > 1)
+
+
+def build_course_index(records):
+    courses = {}
+    programs = {}
+    for slug, program in records:
+        seen = set()
+        for code, section, section_hours, credits, label, choice in course_entries(program):
+            if (code, section) in seen:
+                continue
+            seen.add((code, section))
+            courses.setdefault(code, []).append({
+                "program": slug,
+                "section": section,
+                "sectionHours": section_hours,
+                "creditHours": credits,
+                "label": label,
+                "choice": choice,
+            })
+        programs[slug] = sorted({code for code, _ in seen})
+
+    overlaps = {}
+    code_sets = {slug: set(codes) for slug, codes in programs.items() if codes}
+    for a, b in combinations(sorted(code_sets), 2):
+        shared = code_sets[a] & code_sets[b]
+        if shared:
+            overlaps[f"{a}|{b}"] = sorted(shared)
+    return {
+        "version": COURSE_INDEX_VERSION,
+        "dataHash": content_hash([program for _, program in records]),
+        "courses": dict(sorted(courses.items())),
+        "programs": programs,
+        "overlaps": overlaps,
+    }
+
+
+def write_course_index(records, path=COURSE_INDEX_PATH):
+    index = build_course_index(records)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(index, separators=(",", ":")) + "\n", encoding="utf-8")
+    return index
+
+
+def load_or_build(records, path=COURSE_INDEX_PATH, rebuild=False):
+    """Return (CourseIndex, rebuilt). The built artifact is reused unless it is stale."""
+    if not rebuild:
+        try:
+            index = CourseIndex.load(path)
+        except (OSError, ValueError):
+            index = None
+        if index is not None and index.data.get("dataHash") == content_hash([p for _, p in records]):
+            return index, False
+    return CourseIndex(write_course_index(records, path)), True
+
+
+class CourseIndex:
+    """Constant-time course and overlap lookups over a built index."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        if data.get("version") != COURSE_INDEX_VERSION:
+            raise ValueError(f"unsupported course index version {data.get('version')}")
+        self.data = data
+
+    @classmethod
+    def load(cls, path=COURSE_INDEX_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def programs_for(self, code):
+        """Every program that counts a course, with the section it counts toward."""
+        code = normalize_code(code)
+        return self.data["courses"].get(code, []) if code else []
+
+    def courses_for(self, slug):
+        return self.data["programs"].get(slug, [])
+
+    def overlap(self, a, b):
+        """Course codes both programs count (order of a and b doesn't matter)."""
+        if a == b:
+            return self.courses_for(a)
+        key = f"{a}|{b}" if a < b else f"{b}|{a}"
+        return self.data["overlaps"].get(key, [])
+
+    def overlapping_programs(self, slug):
+        """[(other slug, shared codes)] for every program sharing a course with slug."""
+        found = []
+        for key, codes in self.data["overlaps"].items():
+            a, b = key.split("|")
+            if slug in (a, b):
+                found.append((b if a == slug else a, codes))
+        return sorted(found, key=lambda item: (-len(item[1]), item[0]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the course-code inverted index.")
+    parser.add_argument("--course", "-c", help="list the programs that count this course code")
+    parser.add_argument("--overlap", nargs=2, metavar="SLUG", help="courses shared by two programs")
+    parser.add_argument("--related", metavar="SLUG", help="programs sharing any course with SLUG")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index even if it is up to date")
+    args = parser.parse_args()
+
+    records = load_program_records(PROGRAM_DATA_DIR)
+    index, rebuilt = load_or_build(records, rebuild=args.rebuild)
+    status = "Indexed" if rebuilt else "Up to date:"
+    print(f"{status} {len(index.data['courses']):,} course codes across {len(records)} programs, "
+          f"{len(index.data['overlaps']):,} overlapping pairs -> {COURSE_INDEX_PATH.relative_to(ROOT)}")
+
+    slugs = {slug for slug, _ in records}
+    for slug in (args.overlap or []) + ([args.related] if args.related else []):
+        if slug not in slugs:
+            print(f"ERROR: no program-data file {slug}.json", file=sys.stderr)
+            return 1
+
+    if args.course:
+        print()
+        hits = index.programs_for(args.course)
+        if not hits:
+            print(f"  No program counts {args.course}")
+        for hit in hits:
+            option = " (one of several options)" if hit["choice"] else ""
+            label = f" [{hit['label']}]" if hit["label"] else ""
+            print(f"  {hit['program']:<45s} {hit['section']}{label}{option}")
+    if args.overlap:
+        a, b = args.overlap
+        shared = index.overlap(a, b)
+        print(f"\n{a} / {b}: {len(shared)} shared course(s)")
+        for code in shared:
+            print(f"  {code}")
+    if args.related:
+        print()
+        for other, codes in index.overlapping_programs(args.related):
+            print(f"  {len(codes):>3d}  {other}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Generate the program alias table used for single-pass mention detection.
+
+detectProgramMentions in functions/mention-utils.js compiles every program
+name plus the aliases generated here into one trie and scans a response
+once, instead of building and running one RegExp per program. Aliases are
+derived from the extracted program-data:
+
+    "&"/"and" variants      Women & Gender Studies <-> Women and Gender Studies
+    abbreviations           DCDA, CRJU, ... (ABBREVIATIONS in extract_programs.py)
+    degree-qualified forms  Economics BA, BS in Economics, History minor, ...
+
+The table is written to functions/program-aliases.json. MentionMatcher is a
+Python reference implementation of the JS matcher, and --bench compares its
+throughput with the per-program regex scan as the catalog grows.
+
+Usage:
+    python3 scripts/build_mention_matcher.py
+    python3 scripts/build_mention_matcher.py --bench
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from build_bundle import PROGRAM_DATA_DIR, content_hash, load_program_records
+from extract_programs import ABBREVIATIONS
+from program_catalog import normalize_name
+
+ROOT = Path(__file__).parent.parent
+ALIASES_PATH = ROOT / "functions" / "program-aliases.json"
+
+ALIASES_VERSION = 1
+
+# Same values as mention-utils.js
+PROGRAM_KEYWORDS_RE = re.compile(r"\b(major|minor|program|degree|BA\b|BS\b|B\.A\.|B\.S\.)", re.IGNORECASE)
+CONTEXT_WINDOW = 80
+COURSE_NUMBER_AFTER_RE = re.compile(r"\s+\d{4,5}\b")
+
+# program-data degree -> word used in degree-qualified aliases
+DEGREE_WORDS = {
+    "BA": "BA",
+    "BS": "BS",
+    "BGS": "BGS",
+    "Minor": "minor",
+    "Interdisciplinary Minor": "minor",
+    "Major": "major",
+}
+
+
+def name_variants(name):
+    """The name plus its '&'/'and' spelling."""
+    variants = [name]
+    if "&" in name:
+        variants.append(re.sub(r"\s*&\s*", " and ", name))
+    elif " and " in name:
+        variants.append(name.replace(" and ", " & "))
+    return variants
+
+
+def build_alias_table(records):
+    """Return {lowercased program name: [alias entries]}, sorted for stable output."""
+    degrees = defaultdict(set)
+    names = {}
+    for _, program in records:
+        key = program["name"].lower()
+        names[key] = program["name"]
+        if program.get("degree") in DEGREE_WORDS:
+            degrees[key].add(DEGREE_WORDS[program["degree"]])
+
+    # Abbreviations shared by several programs would be ambiguous, so drop them
+    abbr_owners = defaultdict(set)
+    by_normalized = {normalize_name(name): key for key, name in names.items()}
+    for full_name, abbr in ABBREVIATIONS.items():
+        key = by_normalized.get(normalize_name(full_name))
+        if key:
+            abbr_owners[abbr].add(key)
+
+    table = {}
+    for key, name in sorted(names.items()):
+        entries = {}
+        for variant in name_variants(name):
+            if variant != name:
+                entries[variant] = {"alias": variant, "gated": len(variant.split()) == 1}
+            for degree in sorted(degrees[key]):
+                for form in (f"{variant} {degree}", f"{degree} in {variant}"):
+                    entries[form] = {"alias": form, "gated": False}
+        for abbr, owners in sorted(abbr_owners.items()):
+            if owners == {key}:
+                entries[abbr] = {"alias": abbr, "gated": True, "abbreviation": True}
+        if entries:
+            table[key] = sorted(entries.values(), key=lambda e: e["alias"])
+    return table
+
+
+def write_alias_table(records, path=ALIASES_PATH):
+    """Write the alias table if its content changed. Returns (document, written)."""
+    document = {
+        "version": ALIASES_VERSION,
+        "dataHash": content_hash([program for _, program in records]),
+        "aliases": build_alias_table(records),
+    }
+    text = json.dumps(document, ensure_ascii=False, separators=(",", ":"), sort_keys=True) + "\n"
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return document, False
+    path.write_text(text, encoding="utf-8")
+    return document, True
+
+
+def _is_word(ch):
+    # JS \w without the u flag
+    return ch.isascii() and (ch.isalnum() or ch == "_")
+
+
+def _boundary(text, index):
+    before = index > 0 and _is_word(text[index - 1])
+    after = index < len(text) and _is_word(text[index])
+    return before != after
+
+
+def _has_keyword_context(text, start, end):
+    context = text[max(0, start - CONTEXT_WINDOW):end + CONTEXT_WINDOW]
+    return PROGRAM_KEYWORDS_RE.search(context) is not None
+
+
+class MentionMatcher:
+    """Reference implementation of the trie matcher in mention-utils.js."""
+
+    def __init__(self, lookup, alias_table=None):
+        self.lookup = lookup
+        self.root = {}
+        alias_table = alias_table or {}
+        for key, program in lookup.items():
+            aliases = [{"alias": program["name"], "gated": len(program["name"].split()) == 1}]
+            aliases.extend(alias_table.get(key, []))
+            for entry in aliases:
+                node = self.root
+                for ch in entry["alias"].lower():
+                    node = node.setdefault(ch, {})
+                node.setdefault(None, []).append(
+                    (key, bool(entry.get("gated")), bool(entry.get("abbreviation"))))
+
+    def detect(self, text):
+        """Return matched programs in lookup order."""
+        lower = text.lower()
+        found = set()
+        for start in range(len(lower)):
+            if lower[start] not in self.root or not _boundary(text, start):
+                continue
+            node = self.root
+            for i in range(start, len(lower)):
+                node = node.get(lower[i])
+                if node is None:
+                    break
+                if None not in node or not _boundary(text, i + 1):
+                    continue
+                for key, gated, abbreviation in node[None]:
+                    if key in found:
+                        continue
+                    if abbreviation and COURSE_NUMBER_AFTER_RE.match(text, i + 1):
+                        continue
+                    if gated and not _has_keyword_context(text, start, i + 1):
+                        continue
+                    found.add(key)
+        return [program for key, program in self.lookup.items() if key in found]
+
+
+def detect_with_regexes(text, lookup):
+    """The original per-program scan, kept for benchmarking."""
+    mentions = []
+    for program in lookup.values():
+        match = re.search(rf"\b{re.escape(program['name'])}\b", text, re.IGNORECASE)
+        if not match:
+            continue
+        if len(program["name"].split()) == 1 and not _has_keyword_context(text, match.start(), match.end()):
+            continue
+        mentions.append(program)
+    return mentions
+
+
+def benchmark(records, alias_table, repeat=20):
+    """Compare per-program regexes with the trie as catalog size and text length grow."""
+    base = {}
+    for _, program in records:
+        base.setdefault(program["name"].lower(), {"name": program["name"]})
+    prose = " ".join(d for _, p in records for d in p.get("descriptions") or [])
+
+    print(f"{'Programs':>8s} {'Text':>7s} {'Regex ms':>9s} {'Trie ms':>8s} {'Trie MB/s':>9s} {'Speedup':>8s}")
+    print("-" * 56)
+    for n_programs in (len(base), 250, 1000):
+        lookup = dict(base)
+        for i in range(len(lookup), n_programs):
+            lookup[f"synthetic program {i} studies"] = {"name": f"Synthetic Program {i} Studies"}
+        matcher = MentionMatcher(lookup, alias_table)
+        for length in (1000, 5000):
+            text = (prose * (length // max(len(prose), 1) + 1))[:length]
+            start = time.perf_counter()
+            for _ in range(repeat):
+                expected = detect_with_regexes(text, lookup)
+            regex_ms = (time.perf_counter() - start) / repeat * 1000
+            start = time.perf_counter()
+            for _ in range(repeat):
+                matcher.detect(text)
+            trie_ms = (time.perf_counter() - start) / repeat * 1000
+            mb_per_s = length / (trie_ms / 1000) / 1e6
+            print(f"{n_programs:>8d} {length:>7,d} {regex_ms:>9.2f} {trie_ms:>8.2f} {mb_per_s:>9.2f} {regex_ms / trie_ms:>7.1f}x")
+            # Without aliases the trie must agree with the regex scan (plus any alias hits)
+            missing = {p["name"] for p in expected} - {p["name"] for p in matcher.detect(text)}
+            if missing:
+                print(f"  WARNING: trie missed {sorted(missing)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the program alias table for mention detection.")
+    parser.add_argument("--bench", action="store_true", help="benchmark trie vs per-program regex matching")
+    args = parser.parse_args()
+
+    records = load_program_records(PROGRAM_DATA_DIR)
+    document, written = write_alias_table(records)
+    n_aliases = sum(len(v) for v in document["aliases"].values())
+    print(f"{ALIASES_PATH.relative_to(ROOT)} {'wrote' if written else 'unchanged'}: "
+          f"{n_aliases} aliases for {len(document['aliases'])} programs")
+
+    if args.bench:
+        print()
+        benchmark(records, document["aliases"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Pre-render the "Detailed Program Information" prompt context and account for its size.
+
+Renders the same text as buildProgramDetailsContext in functions/index.js
+(truncation, joins, contact formatting) for each persona scope, following
+the persona logic in index.js:
+
+    sandra    college-wide: every program not covered by a wizard manifest
+    ada       none: departmental personas only see their own manifest
+    engelina  none, likewise
+
+index.js drops the programs named by the live wizard manifests. Those are
+fetched at request time, so Sandra's scope here uses each department's
+fallbackPrograms in functions/wizard-registry.json instead. That is exact
+when the static fallback is in use and an approximation otherwise; each
+report entry records the basis as "scope". Each artifact is
+written to build/prompt-context/<persona>.md. The report,
+functions/prompt-context.json, is committed next to the bundle and records
+the exact character count and approximate token count per program and per
+artifact. The script exits non-zero when an artifact exceeds its token
+budget.
+
+Records are rendered in canonical form (build_bundle.canonical_record), in
+slug order, as index.js renders them from the bundle. Prompt caching is a
+prefix match, so the report also records, per program, the SHA-256 of its
+own section (sectionHash) and of the artifact text through the end of that
+section (prefixHash), plus how many tokens would be re-cached if it changed
+(recacheTokens). --check compares a fresh render against the committed
+report without writing anything, shows which program edits change which
+persona's cached prefix and from where, and exits non-zero if any do.
+
+The program-details text sits in index.js's stable system block, but the
+wizard filter applied to it comes from the live manifests. So the block
+moves for two reasons, and --check reports them separately:
+    deploy    a program-data record changed (sectionHash differs)
+    manifest  the set of wizard-covered programs changed (report.wizardPrograms);
+              in production this happens on a manifest refresh, between deploys
+
+Usage:
+    python3 scripts/build_prompt_context.py
+    python3 scripts/build_prompt_context.py --budget sandra=8000 --program-budget 400
+    python3 scripts/build_prompt_context.py --check
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from build_bundle import PROGRAM_DATA_DIR, canonical_record, load_program_records
+
+ROOT = Path(__file__).parent.parent
+REGISTRY_PATH = ROOT / "functions" / "wizard-registry.json"
+ARTIFACT_DIR = ROOT / "build" / "prompt-context"
+# Committed, so --check has a baseline on a fresh checkout
+REPORT_PATH = ROOT / "functions" / "prompt-context.json"
+
+# Persona key -> wizard department (None = college-wide). Mirrors PERSONA_CONFIG in index.js;
+# departmental personas get no program-details block (includeOtherPrograms: false).
+PERSONA_DEPARTMENTS = {
+    "sandra": None,
+    "ada": "Digital Culture and Data Analytics",
+    "engelina": "English",
+}
+
+# Default token budgets per artifact; override with --budget NAME=TOKENS
+DEFAULT_BUDGETS = {
+    "sandra": 12000,
+    "ada": 0,
+    "engelina": 0,
+}
+
+# Same heuristic as verify_extraction.py
+CHARS_PER_TOKEN = 4
+
+CONTEXT_HEADER = "\n\n## Detailed Program Information\n\n"
+SECTION_SEPARATOR = "\n\n"
+# Hex digits kept for report hashes
+HASH_LENGTH = 16
+
+
+def approx_tokens(text):
+    return len(text) // CHARS_PER_TOKEN
+
+
+# Stands in for a missing key, which JS renders as "undefined" (None -> "null")
+UNDEFINED = object()
+
+
+def js_str(value):
+    """Stringify a value the way a JS template literal would."""
+    if value is UNDEFINED:
+        return "undefined"
+    if value is None:
+        return "null"
+    if value is True or value is False:
+        return "true" if value else "false"
+    return str(value)
+
+
+def js_join(items, sep):
+    """Array.prototype.join: null/undefined elements become empty strings."""
+    return sep.join("" if item is None or item is UNDEFINED else js_str(item) for item in items)
+
+
+def render_program(p):
+    """One program's section; mirrors the per-program map in buildProgramDetailsContext."""
+    lines = [f"### {js_str(p.get('name', UNDEFINED))} ({js_str(p.get('degree', UNDEFINED))}, "
+             f"{js_str(p.get('totalHours', UNDEFINED))} hours)"]
+    if p.get("url"):
+        lines.append(p["url"])
+
+    descriptions = p.get("descriptions")
+    if descriptions and descriptions[0]:
+        desc = descriptions[0]
+        lines.append(desc[:200] + "..." if len(desc) > 200 else desc)
+
+    req = p.get("requirements") or {}
+    required = req.get("requiredCourses")
+    if required and len(required["courses"]) > 0:
+        lines.append(f"Required ({js_str(required.get('hours', UNDEFINED))} hrs): {js_join(required['courses'], ', ')}")
+    electives = req.get("electiveCourses")
+    if electives and ((electives.get("hours") or 0) > 0 or electives.get("description")):
+        desc = electives.get("description") or "See advisor for options"
+        lines.append(f"Electives ({js_str(electives.get('hours', UNDEFINED))} hrs): {desc}")
+
+    if p.get("careerOptions"):
+        lines.append(f"Careers: {js_join(p['careerOptions'], ', ')}")
+
+    if p.get("contacts"):
+        contact_lines = []
+        for c in p["contacts"]:
+            parts = [c.get("role", UNDEFINED)]
+            for field in ("name", "email", "phone"):
+                if c.get(field):
+                    parts.append(c[field])
+            contact_lines.append(f"- {js_join(parts, ', ')}")
+        lines.append("Contacts:\n" + "\n".join(contact_lines))
+
+    internship = p.get("internship") or {}
+    if internship.get("description"):
+        i_desc = internship["description"]
+        lines.append(f"Internship: {i_desc[:150] + '...' if len(i_desc) > 150 else i_desc}")
+
+    return "\n".join(lines)
+
+
+def render_context(sections):
+    if not sections:
+        return ""
+    return CONTEXT_HEADER + SECTION_SEPARATOR.join(sections)
+
+
+def short_hash(digest):
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def normalize_name(name):
+    """Same normalization index.js uses to match manifest programs."""
+    return name.lower().replace("&", "and")
+
+
+def scope_basis(persona):
+    """How a persona's scope was derived, for the report."""
+    if PERSONA_DEPARTMENTS[persona] is not None:
+        return "none (departmental persona: index.js sends no program details)"
+    return "approximate (wizard programs taken from wizard-registry.json fallbackPrograms, not live manifests)"
+
+
+def wizard_programs(records, registry):
+    """Sorted slugs of the programs the wizard manifests cover, which college-wide scope leaves out.
+
+    index.js filters by name, so a record sharing a name with a fallback program is covered too.
+    """
+    by_slug = dict(records)
+    names = set()
+    for entry in registry.get("departments", {}).values():
+        for slug in entry.get("fallbackPrograms", []):
+            if slug in by_slug:
+                names.add(normalize_name(by_slug[slug]["name"]))
+    return sorted(slug for slug, record in records if normalize_name(record["name"]) in names)
+
+
+def persona_scopes(records, registry):
+    """Return {persona: [(slug, record)]} for every persona scope."""
+    covered = set(wizard_programs(records, registry))
+    scopes = {}
+    for persona, department in PERSONA_DEPARTMENTS.items():
+        if department is None:
+            scopes[persona] = [(s, r) for s, r in records if s not in covered]
+        else:
+            scopes[persona] = []
+    return scopes
+
+
+def build_artifacts(records, registry):
+    """Render every persona scope. Returns {persona: (text, [per-program stats])}.
+
+    Each program's stats include its offset in the text and the running
+    prefix hash through the end of its section.
+    """
+    records = [(slug, canonical_record(record)) for slug, record in records]
+    artifacts = {}
+    for persona, scope in persona_scopes(records, registry).items():
+        sections = []
+        stats = []
+        prefix = hashlib.sha256()
+        offset = 0
+        for slug, record in scope:
+            section = render_program(record)
+            chunk = (SECTION_SEPARATOR if sections else CONTEXT_HEADER) + section
+            prefix.update(chunk.encode("utf-8"))
+            offset += len(chunk)
+            sections.append(section)
+            stats.append({
+                "slug": slug,
+                "chars": len(section),
+                "tokens": approx_tokens(section),
+                "offset": offset - len(section),
+                "sectionHash": short_hash(hashlib.sha256(section.encode("utf-8"))),
+                "prefixHash": short_hash(prefix.copy()),
+            })
+        text = render_context(sections)
+        for s in stats:
+            s["recacheTokens"] = approx_tokens(text[s["offset"]:])
+        artifacts[persona] = (text, stats)
+    return artifacts
+
+
+def prefix_changes(previous, stats):
+    """Compare one persona's program stats with its previous report entry.
+
+    Returns (changed slugs, index of the first program whose prefix hash
+    differs, or None). Everything before that program is still cached.
+    """
+    old = {s["slug"]: s.get("sectionHash") for s in previous}
+    new = {s["slug"]: s["sectionHash"] for s in stats}
+    changed = sorted(slug for slug in old.keys() | new.keys() if old.get(slug) != new.get(slug))
+    old_prefixes = [s.get("prefixHash") for s in previous]
+    for i, s in enumerate(stats):
+        if i >= len(old_prefixes) or old_prefixes[i] != s["prefixHash"]:
+            return changed, i
+    return changed, len(stats) if len(old_prefixes) > len(stats) else None
+
+
+def print_check(artifacts, report, wizard):
+    """Print which persona prefixes a fresh render would invalidate, and why. Returns True if any would.
+
+    `wizard` is the current wizard_programs() list, compared with the report's.
+    """
+    previous = report.get("artifacts", {})
+    old_wizard = set(report.get("wizardPrograms", []))
+    added, dropped = sorted(set(wizard) - old_wizard), sorted(old_wizard - set(wizard))
+    stale = bool(added or dropped)
+    if stale:
+        print("manifest   wizard-covered programs changed (a manifest refresh does this between deploys):")
+        for slug in added:
+            print(f"{'':<10s} now covered: {slug}")
+        for slug in dropped:
+            print(f"{'':<10s} no longer covered: {slug}")
+    for persona, (text, stats) in artifacts.items():
+        entry = previous.get(persona)
+        if entry is None:
+            print(f"{persona:<10s} not in the previous report")
+            stale = True
+            continue
+        changed, first = prefix_changes(entry.get("programs", []), stats)
+        if first is None:
+            print(f"{persona:<10s} unchanged (hash {entry.get('hash', '?')})")
+            continue
+        stale = True
+        kept = stats[first]["offset"] if first < len(stats) else len(text)
+        where = f"from {stats[first]['slug']}" if first < len(stats) else "at the end (programs removed)"
+        print(f"{persona:<10s} prefix changes {where}: ~{approx_tokens(text[:kept]):,} tokens stay cached, "
+              f"~{approx_tokens(text[kept:]):,} re-cached")
+        # Sections that only appeared or vanished moved with the wizard set, not a deploy
+        moved = set(added) | set(dropped)
+        for slug in changed:
+            print(f"{'':<10s} {'manifest' if slug in moved else 'edited'}: {slug}")
+    return stale
+
+
+def parse_budgets(pairs):
+    budgets = dict(DEFAULT_BUDGETS)
+    for pair in pairs or []:
+        name, _, value = pair.partition("=")
+        if name not in PERSONA_DEPARTMENTS or not value.isdigit():
+            raise SystemExit(f"ERROR: --budget expects PERSONA=TOKENS with PERSONA in {sorted(PERSONA_DEPARTMENTS)}")
+        budgets[name] = int(value)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render program-details prompt context.")
+    parser.add_argument("--budget", action="append", metavar="PERSONA=TOKENS",
+                        help="token budget for one artifact (repeatable)")
+    parser.add_argument("--program-budget", type=int, default=0, metavar="TOKENS",
+                        help="also fail if any single program section exceeds this many tokens")
+    parser.add_argument("--out", type=Path, default=ARTIFACT_DIR, help="artifact directory")
+    parser.add_argument("--report", type=Path, default=REPORT_PATH,
+                        help=f"size and prefix-hash report (default: {REPORT_PATH.relative_to(ROOT)})")
+    parser.add_argument("--check", action="store_true",
+                        help="compare prefix hashes with the report instead of writing anything")
+    args = parser.parse_args()
+    budgets = parse_budgets(args.budget)
+
+    records = load_program_records(PROGRAM_DATA_DIR)
+    with open(REGISTRY_PATH) as f:
+        registry = json.load(f)
+    artifacts = build_artifacts(records, registry)
+    wizard = wizard_programs(records, registry)
+
+    if args.check:
+        try:
+            with open(args.report, encoding="utf-8") as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            print(f"ERROR: cannot read {args.report}; run without --check first", file=sys.stderr)
+            return 1
+        if print_check(artifacts, previous, wizard):
+            print(f"\n{args.report.name} is out of date: run scripts/build_prompt_context.py and commit it")
+            return 1
+        return 0
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    report = {"charsPerToken": CHARS_PER_TOKEN, "wizardPrograms": wizard, "artifacts": {}}
+    failures = []
+
+    print(f"{'Artifact':<12s} {'Programs':>8s} {'Chars':>8s} {'~Tokens':>8s} {'Budget':>8s}")
+    print("-" * 50)
+    for persona, (text, stats) in artifacts.items():
+        # Bytes, not text mode, so the artifact is identical on every platform
+        (args.out / f"{persona}.md").write_bytes(text.encode("utf-8"))
+        tokens = approx_tokens(text)
+        budget = budgets[persona]
+        report["artifacts"][persona] = {
+            "file": f"{persona}.md",
+            "scope": scope_basis(persona),
+            "hash": short_hash(hashlib.sha256(text.encode("utf-8"))),
+            "chars": len(text),
+            "tokens": tokens,
+            "budget": budget,
+            "programs": stats,
+        }
+        flag = "" if tokens <= budget else "  OVER BUDGET"
+        print(f"{persona:<12s} {len(stats):>8d} {len(text):>8,d} {tokens:>8,d} {budget:>8,d}{flag}")
+        if tokens > budget:
+            failures.append(f"{persona}: ~{tokens:,} tokens > budget {budget:,}")
+        if args.program_budget:
+            for s in stats:
+                if s["tokens"] > args.program_budget:
+                    failures.append(f"{persona}/{s['slug']}: ~{s['tokens']:,} tokens > program budget {args.program_budget:,}")
+
+    text = json.dumps(report, indent=2) + "\n"
+    if not args.report.exists() or args.report.read_text(encoding="utf-8") != text:
+        args.report.write_bytes(text.encode("utf-8"))
+
+    largest = sorted(artifacts["sandra"][1], key=lambda s: s["chars"], reverse=True)[:5]
+    if largest:
+        print("\nLargest college-wide sections:")
+        for s in largest:
+            print(f"  {s['slug']:<45s} {s['chars']:>6,d} chars (~{s['tokens']:,} tokens)")
+
+    print(f"\nArtifacts written to {args.out}, report to {args.report}")
+    if failures:
+        print("\nBudget exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Build an offline BM25 index over functions/program-data/ for top-k program retrieval.
+
+Sandra's college-wide prompt carries every program-data record on every turn.
+This index lets a caller pick only the programs relevant to the student's
+question. Each record is indexed over its name, abbreviation, degree,
+descriptions, career options and course codes (name and abbreviation are
+weighted up), and stored as a compact JSON inverted index at
+build/search-index.json.
+
+search() is the query function. --bench runs a fixed set of sample student
+questions against an index over Sandra's scope (build_prompt_context's
+persona_scopes, which leaves out the wizard-covered programs) and reports
+recall@k, query latency, and the prompt tokens the top-k sections would use
+compared with the college-wide context index.js actually sends her.
+
+Usage:
+    python3 scripts/build_search_index.py
+    python3 scripts/build_search_index.py --query "careers in law enforcement" -k 5
+    python3 scripts/build_search_index.py --bench
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from build_bundle import PROGRAM_DATA_DIR, content_hash, load_program_records
+from build_prompt_context import (REGISTRY_PATH, approx_tokens, build_artifacts, persona_scopes, render_context,
+                                  render_program)
+
+ROOT = Path(__file__).parent.parent
+INDEX_PATH = ROOT / "build" / "search-index.json"
+
+INDEX_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Term repetitions per field — a cheap way to boost matches on the program name
+FIELD_WEIGHTS = {
+    "name": 3,
+    "abbreviation": 3,
+    "degree": 1,
+    "descriptions": 1,
+    "careerOptions": 2,
+    "courses": 1,
+}
+
+COURSE_CODE_RE = re.compile(r"\b([A-Z]{3,4})\s+(\d{4,5})\b")
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a about an and are as at be by can do does for from have how i in is it me my
+of on or our program programs that the this to what which with you your
+""".split())
+
+# Fixed sample questions for --bench: (question, slugs that should be retrieved).
+# Only programs in Sandra's scope: wizard-covered ones (DCDA, English, ...) are not.
+BENCH_QUERIES = [
+    ("I want to become a police officer or work in law enforcement",
+     {"criminology-criminal-justice-bs", "criminology-criminal-justice-minor"}),
+    ("What are the requirements for the Economics BS?", {"economics-bs"}),
+    ("Tell me about Women and Gender Studies", {"women-gender-studies-ba", "women-gender-studies-bs"}),
+    ("I like maps and want to be a GIS specialist", {"geography-ba", "geography-bs"}),
+    ("Can I minor in Italian?", {"italian-minor"}),
+    ("I want to work in politics or government", {"political-science-ba", "political-science-bs"}),
+    ("How do I join Army ROTC?", {"military-science"}),
+    ("Air Force officer commission", {"aerospace-studies"}),
+    ("I want to study ancient Greece and Rome", {"classical-studies"}),
+    ("Could I become a museum curator or archivist?", {"history"}),
+    ("I'm interested in urban planning and cities", {"urban-studies"}),
+    ("I love animals and might go to veterinary school", {"human-animal-relationships"}),
+    ("Is there an ethics or philosophy major?", {"philosophy-ba", "philosophy-bs"}),
+    ("I want to work as a translator or interpreter", {"spanish-and-hispanic-studies", "chinese", "italian"}),
+    ("What can I do with a degree in religion?", {"religion"}),
+]
+
+
+def stem(word):
+    """Very light plural folding so 'analysts' matches 'analyst'."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Lowercased, stemmed terms plus course-code terms ('engl10803', 'engl')."""
+    terms = [f"{subj.lower()}{num}" for subj, num in COURSE_CODE_RE.findall(text)]
+    terms.extend(stem(w) for w in WORD_RE.findall(text.lower()) if w not in STOPWORDS)
+    return terms
+
+
+def course_strings(program):
+    req = program.get("requirements") or {}
+    courses = []
+    for section in ("requiredCourses", "electiveCourses"):
+        courses.extend(c for c in (req.get(section) or {}).get("courses", []) if c)
+    return courses
+
+
+def document_terms(program):
+    """Weighted term counts for one program record."""
+    fields = {
+        "name": program.get("name") or "",
+        "abbreviation": program.get("abbreviation") or "",
+        "degree": program.get("degree") or "",
+        "descriptions": " ".join(program.get("descriptions") or []),
+        "careerOptions": " ".join(program.get("careerOptions") or []),
+        "courses": " ".join(course_strings(program)),
+    }
+    counts = Counter()
+    for field, text in fields.items():
+        for term in tokenize(text):
+            counts[term] += FIELD_WEIGHTS[field]
+    return counts
+
+
+def build_index(records):
+    """Build the inverted index: postings[term] = [[doc, tf], ...]."""
+    docs = []
+    postings = {}
+    for doc_id, (slug, program) in enumerate(records):
+        counts = document_terms(program)
+        docs.append({
+            "slug": slug,
+            "name": program.get("name", ""),
+            "degree": program.get("degree", ""),
+            "length": sum(counts.values()),
+        })
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append([doc_id, tf])
+
+    total = sum(d["length"] for d in docs)
+    return {
+        "version": INDEX_VERSION,
+        "dataHash": content_hash([program for _, program in records]),
+        "k1": BM25_K1,
+        "b": BM25_B,
+        "avgLength": total / len(docs) if docs else 0,
+        "docs": docs,
+        "postings": dict(sorted(postings.items())),
+    }
+
+
+def search(index, query, k=5):
+    """Return the top-k [(slug, score)] for a free-text query."""
+    n_docs = len(index["docs"])
+    if not n_docs:
+        return []
+    k1, b, avg = index["k1"], index["b"], index["avgLength"] or 1
+    scores = Counter()
+    for term in set(tokenize(query)):
+        postings = index["postings"].get(term)
+        if not postings:
+            continue
+        idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+        for doc_id, tf in postings:
+            length = index["docs"][doc_id]["length"]
+            scores[doc_id] += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg))
+    return [(index["docs"][d]["slug"], round(s, 4)) for d, s in scores.most_common(k)]
+
+
+def load_index(path=INDEX_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_index(records, path=INDEX_PATH):
+    index = build_index(records)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(index, separators=(",", ":")) + "\n", encoding="utf-8")
+    return index
+
+
+def benchmark(records, k, repeat=200):
+    """Recall@k, per-query latency and top-k prompt size over BENCH_QUERIES.
+
+    Searches an index over Sandra's scope only, the programs she would
+    actually retrieve from, so wizard-covered programs can't win a query.
+    """
+    with open(REGISTRY_PATH) as f:
+        registry = json.load(f)
+    scope = persona_scopes(records, registry)["sandra"]
+    by_slug = dict(scope)
+    for question, relevant in BENCH_QUERIES:
+        if not relevant <= by_slug.keys():
+            raise ValueError(f"bench query {question!r} expects programs outside Sandra's scope: "
+                             f"{', '.join(sorted(relevant - by_slug.keys()))}")
+    index = build_index(scope)
+    sandra_text, sandra_stats = build_artifacts(records, registry)["sandra"]
+    full_tokens = approx_tokens(sandra_text)
+
+    rows = []
+    latencies = []
+    for question, relevant in BENCH_QUERIES:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            hits = search(index, question, k)
+        latencies.append((time.perf_counter() - start) / repeat * 1000)
+        slugs = [slug for slug, _ in hits]
+        recall = len(relevant & set(slugs)) / len(relevant)
+        tokens = approx_tokens(render_context([render_program(by_slug[s]) for s in slugs]))
+        rows.append((question, recall, tokens, slugs))
+
+    print(f"{'Recall':>6s} {'~Tok':>6s}  Question / top-{k}")
+    print("-" * 78)
+    for question, recall, tokens, slugs in rows:
+        print(f"{recall:>6.2f} {tokens:>6,d}  {question}")
+        print(f"{'':>15s}{', '.join(slugs)}")
+
+    latencies.sort()
+    mean_recall = sum(r[1] for r in rows) / len(rows)
+    mean_tokens = sum(r[2] for r in rows) / len(rows)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"\nQueries:          {len(rows)}")
+    print(f"Mean recall@{k}:    {mean_recall:.3f}")
+    print(f"Query latency:    mean {sum(latencies) / len(latencies):.3f} ms, p95 {p95:.3f} ms")
+    print(f"Prompt tokens:    ~{mean_tokens:,.0f} for top-{k} vs ~{full_tokens:,} for Sandra's "
+          f"{len(sandra_stats)}-program context")
+    return mean_recall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the program-data BM25 index.")
+    parser.add_argument("--query", "-q", help="run one query against the freshly built index")
+    parser.add_argument("-k", type=int, default=5, help="number of programs to retrieve (default: 5)")
+    parser.add_argument("--bench", action="store_true", help="run the sample-question benchmark")
+    args = parser.parse_args()
+
+    records = load_program_records(PROGRAM_DATA_DIR)
+    start = time.perf_counter()
+    index = write_index(records)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"Indexed {len(index['docs'])} programs, {len(index['postings']):,} terms "
+          f"({INDEX_PATH.stat().st_size:,} bytes) in {elapsed:.1f} ms -> {INDEX_PATH.relative_to(ROOT)}")
+
+    if args.query:
+        print()
+        for slug, score in search(index, args.query, args.k):
+            print(f"  {score:>8.3f}  {slug}")
+    if args.bench:
+        print()
+        benchmark(records, args.k)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
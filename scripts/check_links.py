@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Check every program page and card image URL in the programs.csv catalogs.
+
+verify_extraction.py only checks that a url is present. This checks that the
+~75 distinct links in functions/programs.csv and files/programs.csv are
+alive, concurrently, with nothing but the standard library:
+
+    ConnectionPool   asyncio HTTP/1.1 client that keeps connections alive
+                     per (scheme, host, port) and reuses them
+    HostLimiter      at most --per-host requests in flight to a host, and
+                     request starts spaced to --rate per second
+    LinkChecker      HEAD first, GET when a server rejects HEAD (403, 405,
+                     501) or answers it with something that isn't an HTTP
+                     response; follows up to 5 redirects (more is broken);
+                     bounded overall by --concurrency. DNS failures, refused
+                     connections and timeouts are reported as broken without
+                     a retry
+
+Results for live links are cached in build/link-cache.json for --ttl hours,
+so a re-run only re-requests links that were broken or have expired. The
+script exits non-zero when any link is broken.
+
+scripts/tests/test_check_links.py checks the checker against a local HTTP
+server, so it can be verified without network access.
+
+Usage:
+    python3 scripts/check_links.py
+    python3 scripts/check_links.py --ttl 0            # ignore cached results
+    python3 scripts/check_links.py --concurrency 32 --per-host 8 --rate 20
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import urljoin, urlsplit
+
+from program_catalog import FILES_CATALOG, FUNCTIONS_CATALOG, ROOT, load_catalog
+
+CACHE_PATH = ROOT / "build" / "link-cache.json"
+
+USER_AGENT = "addran-advisor-link-check/1"
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Servers that don't implement HEAD (or CDNs and image hosts that forbid it) answer
+# with these and usually serve GET fine
+RETRY_WITH_GET = {403, 405, 501}
+# Bodies up to this size are drained so the connection can be reused
+MAX_DRAIN_BYTES = 64 * 1024
+
+
+class ProtocolError(Exception):
+    """The server connected but did not send a well-formed HTTP response."""
+
+
+async def read_response(reader, method):
+    """Read a status line and headers. Returns (status, headers, reusable)."""
+    line = await reader.readline()
+    if not line:
+        raise ProtocolError("connection closed before response")
+    parts = line.decode("latin-1").split(None, 2)
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise ProtocolError(f"malformed status line {line[:80]!r}")
+    status = int(parts[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    reusable = headers.get("connection", "").lower() != "close"
+    if method == "HEAD" or status in (204, 304) or status < 200:
+        return status, headers, reusable
+    length = headers.get("content-length", "")
+    if length.isdigit() and "chunked" not in headers.get("transfer-encoding", "") and int(length) <= MAX_DRAIN_BYTES:
+        await reader.readexactly(int(length))
+        return status, headers, reusable
+    # Body left unread (large, chunked or unsized): this connection is done
+    return status, headers, False
+
+
+class ConnectionPool:
+    """Minimal keep-alive HTTP/1.1 client: one idle list per (scheme, host, port)."""
+
+    def __init__(self, timeout=10.0, ssl_context=None):
+        self.timeout = timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.idle = defaultdict(list)
+        self.opened = 0
+        self.requests = 0
+
+    async def connect(self, scheme, host, port):
+        streams = await asyncio.open_connection(host, port, ssl=self.ssl_context if scheme == "https" else None)
+        self.opened += 1
+        return streams
+
+    async def request(self, method, url):
+        """Send one request. Returns (status, headers)."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported URL {url!r}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        message = (f"{method} {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nUser-Agent: {USER_AGENT}\r\n"
+                   f"Accept: */*\r\nConnection: keep-alive\r\n\r\n").encode("latin-1")
+
+        for attempt in range(2):
+            reused = bool(self.idle[key])
+            if reused:
+                reader, writer = self.idle[key].pop()
+            else:
+                reader, writer = await asyncio.wait_for(self.connect(*key), self.timeout)
+            self.requests += 1
+            try:
+                writer.write(message)
+                await writer.drain()
+                status, headers, reusable = await asyncio.wait_for(read_response(reader, method), self.timeout)
+            except (ConnectionError, ProtocolError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused and attempt == 0:
+                    continue  # the server closed an idle keep-alive connection; retry on a fresh one
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            if reusable:
+                self.idle[key].append((reader, writer))
+            else:
+                writer.close()
+            return status, headers
+        raise ProtocolError("connection closed before response")
+
+    async def close(self):
+        for connections in self.idle.values():
+            for _, writer in connections:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except (OSError, ssl.SSLError):
+                    pass
+        self.idle.clear()
+
+
+class HostLimiter:
+    """Caps in-flight requests to one host and spaces their start times."""
+
+    __slots__ = ("semaphore", "interval", "lock", "next_start")
+
+    def __init__(self, per_host, rate):
+        self.semaphore = asyncio.Semaphore(per_host)
+        self.interval = 1.0 / rate if rate else 0.0
+        self.lock = asyncio.Lock()
+        self.next_start = 0.0
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        async with self.lock:
+            now = asyncio.get_running_loop().time()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+
+def load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path, cache):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+class LinkChecker:
+    """Checks URLs through one ConnectionPool under global and per-host limits."""
+
+    def __init__(self, concurrency=16, per_host=6, rate=20.0, timeout=10.0, max_redirects=5,
+                 cache_path=CACHE_PATH, ttl_hours=24.0, ssl_context=None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.rate = rate
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.cache_path = cache_path
+        self.ttl = ttl_hours * 3600
+        self.ssl_context = ssl_context
+        self.pool = None
+        self.semaphore = None
+        self.hosts = {}
+
+    async def fetch(self, method, url):
+        host = urlsplit(url).hostname
+        limiter = self.hosts.get(host)
+        if limiter is None:
+            limiter = self.hosts[host] = HostLimiter(self.per_host, self.rate)
+        async with limiter:
+            async with self.semaphore:
+                return await self.pool.request(method, url)
+
+    async def check(self, url):
+        """Return a result dict for one URL (never raises for network errors)."""
+        method = "HEAD"
+        current = url
+        redirects = 0
+        while True:
+            try:
+                status, headers = await self.fetch(method, current)
+            except (OSError, ValueError, ProtocolError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                # Only a garbled answer to HEAD is worth a GET; unreachable hosts stay unreachable
+                if method == "HEAD" and isinstance(e, (ProtocolError, asyncio.IncompleteReadError)):
+                    method = "GET"
+                    continue
+                error = "timed out" if isinstance(e, asyncio.TimeoutError) else f"{type(e).__name__}: {e}"
+                return {"ok": False, "status": None, "method": method, "finalUrl": current, "error": error}
+            if method == "HEAD" and status in RETRY_WITH_GET:
+                method = "GET"
+                continue
+            if status in REDIRECT_STATUSES and headers.get("location"):
+                if redirects >= self.max_redirects:
+                    return {"ok": False, "status": status, "method": method, "finalUrl": current,
+                            "error": f"too many redirects (more than {self.max_redirects})"}
+                current = urljoin(current, headers["location"])
+                redirects += 1
+                continue
+            return {"ok": status < 400, "status": status, "method": method, "finalUrl": current, "error": None}
+
+    async def check_all(self, urls):
+        """Check urls, reusing fresh cached results. Returns ({url: result}, cache hits)."""
+        cache = load_cache(self.cache_path) if self.cache_path else {}
+        now = time.time()
+        results = {}
+        pending = []
+        for url in urls:
+            cached = cache.get(url)
+            if cached and cached.get("ok") and now - cached.get("checkedAt", 0) < self.ttl:
+                results[url] = cached
+            else:
+                pending.append(url)
+        hits = len(results)
+
+        # Pool, semaphore and limiters belong to this event loop
+        self.pool = ConnectionPool(self.timeout, self.ssl_context)
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.hosts = {}
+        try:
+            checked = await asyncio.gather(*(self.check(url) for url in pending))
+        finally:
+            await self.pool.close()
+        for url, result in zip(pending, checked):
+            result["checkedAt"] = round(now)
+            results[url] = result
+            # Only live links are cached, so broken ones are re-checked every run
+            if result["ok"]:
+                cache[url] = result
+            else:
+                cache.pop(url, None)
+        if self.cache_path:
+            save_cache(self.cache_path, cache)
+        return results, hits
+
+
+def catalog_links(paths=(FUNCTIONS_CATALOG, FILES_CATALOG)):
+    """{url: [where it is used]} for every page and image URL in the catalogs."""
+    links = defaultdict(list)
+    for path in paths:
+        for entry in load_catalog(path).entries:
+            for field, kind in (("url", "page"), ("image", "image")):
+                if entry[field]:
+                    links[entry[field]].append(f"{path.relative_to(ROOT)}: {entry['name']} ({kind})")
+    return dict(links)
+
+
+def run_checks(links, args):
+    checker = LinkChecker(args.concurrency, args.per_host, args.rate, args.timeout,
+                          cache_path=CACHE_PATH, ttl_hours=args.ttl)
+    start = time.perf_counter()
+    results, hits = asyncio.run(checker.check_all(sorted(links)))
+    elapsed = time.perf_counter() - start
+
+    broken = sorted(url for url, result in results.items() if not result["ok"])
+    for url in broken:
+        result = results[url]
+        print(f"  [{result['status'] or 'ERR'}] {url}")
+        if result["error"]:
+            print(f"        {result['error']}")
+        for where in links[url]:
+            print(f"        used by {where}")
+    pool = checker.pool
+    print(f"\nLinks:       {len(results)} ({len(results) - len(broken)} ok, {len(broken)} broken)")
+    print(f"Cached:      {hits} (ttl {args.ttl:g} h, {CACHE_PATH.relative_to(ROOT)})")
+    print(f"Requests:    {pool.requests} over {pool.opened} connection(s)")
+    print(f"Elapsed:     {elapsed:.2f} s")
+    return 1 if broken else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check program and image links in the programs.csv catalogs.")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight overall (default: 16)")
+    parser.add_argument("--per-host", type=int, default=6, help="requests in flight per host (default: 6)")
+    parser.add_argument("--rate", type=float, default=20.0, help="request starts per second per host, 0 = unlimited (default: 20)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds per request (default: 10)")
+    parser.add_argument("--ttl", type=float, default=24.0, help="hours a live result stays cached, 0 = recheck all (default: 24)")
+    args = parser.parse_args()
+
+    links = catalog_links()
+    print(f"Checking {len(links)} links from {FUNCTIONS_CATALOG.relative_to(ROOT)} and {FILES_CATALOG.relative_to(ROOT)}\n")
+    return run_checks(links, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Compact functions/program-data/ by sharing repeated strings and sub-objects.
+
+BA/BS/minor variants of a program repeat the same descriptions, contacts and
+career lists, and department contacts recur across programs. compact_records()
+moves every string, list or object that appears more than once (and is longer
+than a reference to it) into a shared table and replaces each occurrence with
+{"$": <table index>}. Table entries are compacted the same way, so a shared
+contacts list can itself point at a shared email string.
+
+The artifact is written to build/program-data.compact.json:
+
+    version   COMPACT_VERSION
+    hash      content_hash() of the expanded records (same as the bundle's)
+    slugs     program-data file stems, in record order
+    table     shared values, each compacted
+    records   compacted records
+
+expand_records() rebuilds the original records exactly (key order included);
+every build is expanded again and checked against program-data/ before the
+artifact is written. The report compares minified JSON bytes and approximate
+tokens with and without compaction, and lists the largest shared values.
+
+Usage:
+    python3 scripts/compact_program_data.py
+    python3 scripts/compact_program_data.py --top 20
+    python3 scripts/compact_program_data.py --expand build/program-data-expanded
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+from build_bundle import PROGRAM_DATA_DIR, content_hash, load_program_records
+from build_prompt_context import approx_tokens
+
+ROOT = Path(__file__).parent.parent
+COMPACT_PATH = ROOT / "build" / "program-data.compact.json"
+
+COMPACT_VERSION = 1
+REF_KEY = "$"
+# Values whose JSON is no longer than this cost more as a reference than inline
+MIN_SHARED_BYTES = 12
+
+
+def canonical(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def count_values(value, counts):
+    """Count occurrences of every string and container, outermost first.
+
+    A container seen before is not descended into again: its children are
+    only stored once (inside the shared entry), so they only count once.
+    """
+    if isinstance(value, dict):
+        if REF_KEY in value:
+            raise ValueError(f"program data uses the reserved key {REF_KEY!r}")
+        key = canonical(value)
+        counts[key] += 1
+        if counts[key] == 1:
+            for child in value.values():
+                count_values(child, counts)
+    elif isinstance(value, list):
+        key = canonical(value)
+        counts[key] += 1
+        if counts[key] == 1:
+            for child in value:
+                count_values(child, counts)
+    elif isinstance(value, str):
+        counts[canonical(value)] += 1
+
+
+class Compactor:
+    """Builds the shared table while compacting records."""
+
+    __slots__ = ("counts", "table", "slots")
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.table = []
+        self.slots = {}
+
+    def compact(self, value, top=False):
+        if not isinstance(value, (dict, list, str)):
+            return value
+        key = canonical(value)
+        if not top and self.counts[key] > 1 and len(key) > MIN_SHARED_BYTES:
+            slot = self.slots.get(key)
+            if slot is None:
+                slot = self.slots[key] = len(self.table)
+                self.table.append(None)  # reserve the slot; children get later ones
+                self.table[slot] = self.compact_children(value)
+            return {REF_KEY: slot}
+        return self.compact_children(value)
+
+    def compact_children(self, value):
+        if isinstance(value, dict):
+            return {k: self.compact(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.compact(v) for v in value]
+        return value
+
+
+def compact_records(records):
+    """[(slug, record)] -> compact artifact dict."""
+    programs = [record for _, record in records]
+    counts = Counter()
+    for program in programs:
+        count_values(program, counts)
+    compactor = Compactor(counts)
+    compacted = [compactor.compact(program, top=True) for program in programs]
+    return {
+        "version": COMPACT_VERSION,
+        "hash": content_hash(programs),
+        "slugs": [slug for slug, _ in records],
+        "table": compactor.table,
+        "records": compacted,
+    }
+
+
+def expand_records(artifact):
+    """Compact artifact -> [(slug, record)], identical to the records it was built from."""
+    if artifact.get("version") != COMPACT_VERSION:
+        raise ValueError(f"unsupported compact artifact version {artifact.get('version')}")
+    table = artifact["table"]
+
+    def expand(value):
+        if isinstance(value, dict):
+            if len(value) == 1 and REF_KEY in value:
+                # Expanded per use, so records never share mutable objects
+                return expand(table[value[REF_KEY]])
+            return {k: expand(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [expand(v) for v in value]
+        return value
+
+    programs = [expand(record) for record in artifact["records"]]
+    if content_hash(programs) != artifact["hash"]:
+        raise ValueError("expanded records do not match the artifact hash")
+    return list(zip(artifact["slugs"], programs))
+
+
+def size_report(records, artifact, top=10):
+    """Print bytes and approximate tokens saved, plus the largest shared values."""
+    raw = canonical([record for _, record in records])
+    compact = canonical(artifact)
+    on_disk = sum(path.stat().st_size for path in PROGRAM_DATA_DIR.glob("*.json"))
+    raw_bytes = len(raw.encode("utf-8"))
+    compact_bytes = len(compact.encode("utf-8"))
+    print(f"{'':<24s} {'Bytes':>9s} {'~Tokens':>8s}")
+    print("-" * 43)
+    print(f"{'program-data/*.json':<24s} {on_disk:>9,d} {'':>8s}")
+    print(f"{'records (minified)':<24s} {raw_bytes:>9,d} {approx_tokens(raw):>8,d}")
+    print(f"{'compact artifact':<24s} {compact_bytes:>9,d} {approx_tokens(compact):>8,d}")
+    saved = raw_bytes - compact_bytes
+    print(f"{'saved':<24s} {saved:>9,d} {approx_tokens(raw) - approx_tokens(compact):>8,d}"
+          f"  ({saved / max(raw_bytes, 1):.0%})")
+
+    uses = Counter()
+
+    def count_refs(value):
+        if isinstance(value, dict):
+            if len(value) == 1 and REF_KEY in value:
+                uses[value[REF_KEY]] += 1
+            for child in value.values():
+                count_refs(child)
+        elif isinstance(value, list):
+            for child in value:
+                count_refs(child)
+
+    count_refs(artifact["records"])
+    count_refs(artifact["table"])
+    print(f"\nShared table: {len(artifact['table'])} values")
+    if top:
+        print(f"{'Uses':>5s} {'Bytes':>7s}  Value")
+        ranked = sorted(uses.items(), key=lambda item: -(item[1] - 1) * len(canonical(artifact["table"][item[0]])))
+        for slot, n in ranked[:top]:
+            text = canonical(artifact["table"][slot])
+            print(f"{n:>5d} {len(text):>7,d}  {text[:60]}{'...' if len(text) > 60 else ''}")
+
+
+def write_expanded(records, out_dir):
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for slug, program in records:
+        (out_dir / f"{slug}.json").write_text(json.dumps(program, indent=2) + "\n", encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Share repeated strings and sub-objects across program-data records.")
+    parser.add_argument("--top", type=int, default=10, help="largest shared values to list (default: 10)")
+    parser.add_argument("--expand", type=Path, metavar="DIR",
+                        help="expand the existing artifact into per-program JSON files in DIR")
+    args = parser.parse_args()
+
+    if args.expand:
+        try:
+            with open(COMPACT_PATH, encoding="utf-8") as f:
+                records = expand_records(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"ERROR: {COMPACT_PATH.relative_to(ROOT)}: {e}", file=sys.stderr)
+            return 1
+        write_expanded(records, args.expand)
+        print(f"Expanded {len(records)} programs -> {args.expand}")
+        return 0
+
+    records = load_program_records(PROGRAM_DATA_DIR)
+    artifact = compact_records(records)
+    if expand_records(artifact) != records:
+        print("ERROR: compacted records did not expand back to program-data/", file=sys.stderr)
+        return 1
+    COMPACT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    COMPACT_PATH.write_text(canonical(artifact) + "\n", encoding="utf-8")
+    print(f"Compacted {len(records)} programs -> {COMPACT_PATH.relative_to(ROOT)}\n")
+    size_report(records, artifact, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
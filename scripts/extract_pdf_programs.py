@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Extract program data from the PDF advising grids into program-data JSON.
+
+The current advising grids (files/DCDA/*.pdf, files/ENGL-WRIT-CRWT/*.pdf) are
+PDFs rather than Excel posters, so extract_programs.py cannot read them. This
+script streams each PDF one page at a time:
+
+    iter_pages()      yields one PageLayout per page: text cells with their
+                      line and column, from pypdf's layout-mode extraction
+    GridParser        consumes pages as they arrive and keeps only the
+                      running program state, so memory stays flat however
+                      long the grid is
+
+Page layouts are cached in build/pdf-cache/ under a hash of the page's content
+stream, fonts and form XObjects, so unchanged pages are never re-parsed and
+a page repeated across grids is parsed once.
+
+Output uses the same JSON shape as extract_single_program. The grids carry no
+descriptions, careers or contacts, so those stay empty; the hand-curated files
+in functions/program-data/ are not touched. Results are written to
+build/pdf-programs/ unless --out is given. A program whose required and
+elective hours don't add up to its stated total is listed as a warning. With
+--stdout, warnings and per-file errors go to stderr and errors make the exit
+status non-zero.
+
+Usage:
+    python3 scripts/extract_pdf_programs.py
+    python3 scripts/extract_pdf_programs.py files/DCDA/DCDA_MAJOR_Advising_SP26.pdf --stdout
+    python3 scripts/extract_pdf_programs.py --no-cache --out /tmp/pdf-programs
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+import sys
+from pathlib import Path
+
+from pypdf import PdfReader
+
+from extract_programs import (
+    ABBREVIATIONS, PROGRAMS_CSV, SlugCollisionError, lookup_program_url, plan_slugs,
+)
+from program_catalog import load_catalog
+
+ROOT = Path(__file__).parent.parent
+INPUT_GLOBS = ["files/DCDA/*.pdf", "files/ENGL-WRIT-CRWT/*.pdf"]
+OUTPUT_DIR = ROOT / "build" / "pdf-programs"
+CACHE_DIR = ROOT / "build" / "pdf-cache"
+
+# Bump whenever page layout extraction changes so cached pages are re-parsed
+LAYOUT_VERSION = 1
+
+# Three or more spaces in layout-mode text separate two cells on a line
+CELL_GAP_RE = re.compile(r" {3,}")
+OFFERED_MARKER_RE = re.compile(r"\s*<{2,}\s*")
+
+TITLE_RE = re.compile(r"^(.+?)\s+(major|minor)\b", re.IGNORECASE)
+CATEGORY_RE = re.compile(
+    r"^(?:[A-Z][.:]\s+)?(?P<label>.+?)\s*\((?P<hours>\d+)\s*(?:hours|hrs)\.?(?:\s+total)?\)\*?$",
+    re.IGNORECASE,
+)
+ITEM_RE = re.compile(r"^\d+\)\s+(?P<label>.+)$")
+TOTAL_HOURS_RE = re.compile(r"requires a total of (\d+)\s*(?:hours|hrs)", re.IGNORECASE)
+OVERLAY_RE = re.compile(r"^overlay requirements", re.IGNORECASE)
+INTERNSHIP_RE = re.compile(r"\b\d{5}\b.*\binternship\b", re.IGNORECASE)
+ELLIPSIS_RUN_RE = re.compile(r"\s*…(?:\s*…)+\s*")
+
+
+class PageLayout:
+    """Text cells of one page: lines[i] is a list of (column, text) pairs."""
+
+    __slots__ = ("number", "content_hash", "lines", "cached")
+
+    def __init__(self, number, content_hash, lines, cached=False):
+        self.number = number
+        self.content_hash = content_hash
+        self.lines = lines
+        self.cached = cached
+
+
+def page_hash(page):
+    """Hash of everything that determines a page's extracted text."""
+    digest = hashlib.sha256(f"layout-v{LAYOUT_VERSION}".encode())
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    resources = page.get("/Resources")
+    resources = resources.get_object() if resources is not None else {}
+    for kind in ("/Font", "/XObject"):
+        entries = resources.get(kind)
+        if entries is None:
+            continue
+        entries = entries.get_object()
+        for name in sorted(entries):
+            obj = entries[name].get_object()
+            digest.update(f"{kind}{name}{obj.get('/BaseFont', '')}{obj.get('/Subtype', '')}".encode())
+            if "/ToUnicode" in obj:
+                digest.update(obj["/ToUnicode"].get_object().get_data())
+            if kind == "/XObject" and obj.get("/Subtype") == "/Form":
+                digest.update(obj.get_data())
+    return digest.hexdigest()
+
+
+def split_cells(text):
+    """Split layout-mode text into [[(column, text), ...], ...], one list per non-blank line."""
+    lines = []
+    for raw in text.splitlines():
+        cells = []
+        pos = 0
+        for part in CELL_GAP_RE.split(raw):
+            column = raw.index(part, pos) if part else pos
+            pos = column + len(part)
+            cell = " ".join(OFFERED_MARKER_RE.sub(" ", part).split())
+            if cell:
+                cells.append((column, cell))
+        if cells:
+            lines.append(cells)
+    return lines
+
+
+def read_cached_layout(cache_dir, content_hash):
+    path = cache_dir / f"{content_hash}.json"
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            return [[tuple(cell) for cell in line] for line in json.load(f)["lines"]]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_cached_layout(cache_dir, content_hash, lines):
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"{content_hash}.json"
+    path.write_text(json.dumps({"version": LAYOUT_VERSION, "lines": lines}, ensure_ascii=False), encoding="utf-8")
+
+
+def iter_pages(pdf_path, cache_dir=CACHE_DIR):
+    """Yield a PageLayout for each page of a PDF, reusing cached layouts.
+
+    Pages are read lazily, one at a time. Pass cache_dir=None to always parse.
+    """
+    reader = PdfReader(pdf_path)
+    for number, page in enumerate(reader.pages, start=1):
+        content_hash = page_hash(page)
+        lines = read_cached_layout(cache_dir, content_hash) if cache_dir else None
+        if lines is not None:
+            yield PageLayout(number, content_hash, lines, cached=True)
+            continue
+        lines = split_cells(page.extract_text(extraction_mode="layout"))
+        if cache_dir:
+            write_cached_layout(cache_dir, content_hash, lines)
+        yield PageLayout(number, content_hash, lines)
+
+
+def resolve_program_name(candidate):
+    """Match a title fragment ('DCDA', 'Creative Writing') to a catalog program name."""
+    candidate = candidate.strip()
+    for name, abbr in ABBREVIATIONS.items():
+        if candidate.upper() == abbr:
+            return name
+    catalog = load_catalog(PROGRAMS_CSV)
+    if catalog.lookup(candidate):
+        return catalog.lookup(candidate)["name"]
+    return None
+
+
+class GridParser:
+    """Builds one program record from an advising grid, a page at a time.
+
+    Recognizes the layouts used by the current grids:
+
+        title            "DCDA MAJOR Advising Grid", "English Major Requirements"
+        categories       "A. American Lit (6 hrs)", "General Electives (12 hours total)"
+        numbered items   "1) Intro" with its course options in later cells
+        total hours      "The major requires a total of 33 hrs."
+
+    A category followed by numbered items is a group; its items become the
+    course entries. Categories after "Overlay Requirements" double-count
+    hours already listed and are ignored.
+    """
+
+    def __init__(self, fallback_name):
+        self.fallback_name = fallback_name
+        self.name = None
+        self.is_minor = False
+        self.total_hours = None
+        self.categories = []
+        self.internship = None
+        self.in_overlay = False
+        self.item = None
+
+    def feed(self, layout):
+        for cells in layout.lines:
+            starts_item = False
+            for column, text in cells:
+                if self.name is None:
+                    self._match_title(text)
+                if self.total_hours is None:
+                    match = TOTAL_HOURS_RE.search(text)
+                    if match:
+                        self.total_hours = int(match.group(1))
+                if self.internship is None and INTERNSHIP_RE.search(text):
+                    self.internship = text
+
+                if OVERLAY_RE.match(text):
+                    self.in_overlay = True
+                    self.item = None
+                    continue
+                category = CATEGORY_RE.match(text)
+                if category:
+                    self.item = None
+                    if not self.in_overlay:
+                        self.categories.append({
+                            "text": text,
+                            "label": category.group("label"),
+                            "hours": int(category.group("hours")),
+                            "items": [],
+                        })
+                    continue
+                item = ITEM_RE.match(text)
+                if item and self.categories and not self.in_overlay:
+                    self.item = {"label": item.group("label"), "column": column, "options": []}
+                    self.categories[-1]["items"].append(self.item)
+                    starts_item = True
+                    continue
+                if self.item is not None and column > self.item["column"]:
+                    self.item["options"].append((column, len(self.item["options"]), text))
+            if not starts_item and self.item is not None and cells[0][0] <= self.item["column"]:
+                # A line that starts back at the item column ends the item's options
+                self.item = None
+
+    def _match_title(self, text):
+        match = TITLE_RE.match(text)
+        if match and len(match.group(1).split()) <= 6:
+            name = resolve_program_name(match.group(1))
+            if name:
+                self.name = name
+                self.is_minor = match.group(2).lower() == "minor"
+
+    def result(self):
+        base_name = self.name or self.fallback_name
+        if self.is_minor:
+            name, degree = f"{base_name} Minor", "Minor"
+        else:
+            name = base_name
+            # Grids say "Major"; use the catalog's bachelor's degree when there is only one
+            bachelors = [d for d in load_catalog(PROGRAMS_CSV).degrees(base_name) if d in ("BA", "BS", "BGS")]
+            degree = bachelors[0] if len(bachelors) == 1 else "Major"
+
+        required = {"hours": 0, "courses": []}
+        electives = {"hours": 0, "description": "", "courses": []}
+        elective_labels = []
+        for category in self.categories:
+            if "elective" in category["label"].lower():
+                electives["hours"] += category["hours"]
+                elective_labels.append(category["text"])
+                continue
+            required["hours"] += category["hours"]
+            if category["items"]:
+                required["courses"].extend(format_item(item) for item in category["items"])
+            else:
+                required["courses"].append(category["text"])
+        electives["description"] = "; ".join(elective_labels)
+
+        total = self.total_hours
+        if total is None:
+            total = required["hours"] + electives["hours"]
+
+        return {
+            "name": name,
+            "abbreviation": ABBREVIATIONS.get(base_name, ""),
+            "degree": degree,
+            "totalHours": total,
+            "url": lookup_program_url(base_name, degree),
+            "descriptions": [],
+            "requirements": {"requiredCourses": required, "electiveCourses": electives},
+            "careerOptions": [],
+            "contacts": [],
+            "internship": {"description": self.internship} if self.internship else {},
+        }
+
+
+def format_item(item):
+    """'Intro: ENGL 20813, WRIT 20303, ...' from a numbered item and its option cells."""
+    # Read options column by column so wrapped option text stays in order
+    options = " ".join(text for _, _, text in sorted(item["options"]))
+    options = ELLIPSIS_RUN_RE.sub(" ", options).strip()
+    return f"{item['label']}: {options}" if options else item["label"]
+
+
+def extract_pdf_program(pdf_path, cache_dir=CACHE_DIR, stats=None):
+    """Extract one advising-grid PDF and return a program dict.
+
+    If `stats` is a dict, page and cache-hit counts are recorded in it.
+    """
+    parser = GridParser(fallback_name=pdf_path.stem)
+    for layout in iter_pages(pdf_path, cache_dir):
+        parser.feed(layout)
+        if stats is not None:
+            stats["pages"] = stats.get("pages", 0) + 1
+            stats["cached"] = stats.get("cached", 0) + layout.cached
+    return parser.result()
+
+
+def hours_warning(program):
+    """A warning when required + elective hours don't add up to totalHours, else None.
+
+    The grid's stated total and its category hours are parsed separately, so
+    a mismatch usually means a category was missed or misread.
+    """
+    requirements = program["requirements"]
+    listed = requirements["requiredCourses"]["hours"] + requirements["electiveCourses"]["hours"]
+    total = program["totalHours"]
+    if total is None or listed == total:
+        return None
+    return (f"required {requirements['requiredCourses']['hours']} + elective "
+            f"{requirements['electiveCourses']['hours']} hrs = {listed}, but totalHours is {total}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract program data from PDF advising grids.")
+    parser.add_argument("pdfs", nargs="*", type=Path, help="PDFs to extract (default: the advising grids in files/)")
+    parser.add_argument("--out", type=Path, default=OUTPUT_DIR, help="output directory")
+    parser.add_argument("--no-cache", action="store_true", help="parse every page, ignoring the page cache")
+    parser.add_argument("--stdout", action="store_true", help="print JSON Lines to stdout instead of writing files")
+    args = parser.parse_args()
+
+    # pypdf warns about harmless xref offsets in the DCDA exports
+    logging.getLogger("pypdf").setLevel(logging.ERROR)
+
+    pdf_paths = args.pdfs or sorted(p for pattern in INPUT_GLOBS for p in ROOT.glob(pattern))
+    if not pdf_paths:
+        print("ERROR: No PDF files found")
+        return 1
+
+    cache_dir = None if args.no_cache else CACHE_DIR
+    programs = {}
+    stats = {}
+    errors = []
+    for pdf_path in pdf_paths:
+        stats[pdf_path.name] = {}
+        try:
+            programs[pdf_path.name] = extract_pdf_program(pdf_path, cache_dir, stats[pdf_path.name])
+        except Exception as e:
+            errors.append((pdf_path.name, str(e)))
+
+    warnings = [(name, w) for name, w in ((name, hours_warning(p)) for name, p in programs.items()) if w]
+
+    if args.stdout:
+        for pdf_name, program in programs.items():
+            print(json.dumps({"file": pdf_name, **program}, ensure_ascii=False))
+        # Keep stdout pure JSON Lines; problems go to stderr
+        for pdf_name, warning in warnings:
+            print(f"WARNING: {pdf_name}: {warning}", file=sys.stderr)
+        for pdf_name, error in errors:
+            print(f"ERROR: {pdf_name}: {error}", file=sys.stderr)
+        return 1 if errors else 0
+
+    try:
+        plan = plan_slugs({name: (p["name"], p["degree"]) for name, p in programs.items()})
+    except SlugCollisionError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    print(f"{'PDF':<50s} {'Pages':>5s} {'Cached':>6s} {'Deg':>5s} {'Hrs':>3s} {'Req':>3s}  Output")
+    print("-" * 100)
+    for pdf_name, program in programs.items():
+        output_path = args.out / f"{plan[pdf_name]}.json"
+        output_path.write_text(json.dumps(program, indent=2), encoding="utf-8")
+        s = stats[pdf_name]
+        n_required = len(program["requirements"]["requiredCourses"]["courses"])
+        print(f"{pdf_name:<50s} {s['pages']:>5d} {s['cached']:>6d} {program['degree']:>5s} "
+              f"{program['totalHours']:>3d} {n_required:>3d}  {output_path.name}")
+
+    if warnings:
+        print("\nWarnings:")
+        for pdf_name, warning in warnings:
+            print(f"  - {pdf_name}: {warning}")
+    if errors:
+        print("\nFailed files:")
+        for pdf_name, error in errors:
+            print(f"  - {pdf_name}: {error}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
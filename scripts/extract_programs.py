@@ -3,26 +3,90 @@
 Extract program data from AddRan Excel spreadsheets into individual JSON files.
 
 Each .xlsx in files/other_programs/ is a visual poster layout with data at specific
-cell positions. This script reads those positions, extracts structured data, and
-writes one JSON file per program to functions/program-data/.
+cell positions. Those positions are described by a layout spec in
+scripts/layouts/ (see layout_plan.py). This script reads them, extracts
+structured data, and writes one JSON file per program to
+functions/program-data/, then refreshes the single-file bundle the Cloud
+Function loads (see build_bundle.py) and the program alias table
+(see build_mention_matcher.py).
+
+Runs are incremental: scripts/extract-manifest.json records each workbook's
+source hash, extractor version, layout spec hash, programs.csv hash (url and
+the degree fallback come from the catalog) and output hash, so unchanged
+workbooks are skipped and JSON files are only rewritten when their content
+changes. Parsed grids are cached in build/grid-cache/ by workbook
+hash (see grid_cache.py), so --force after an extractor change re-runs the
+extraction rules without re-parsing unchanged workbooks.
+
+An output edited by hand since extraction (its hash no longer matches the
+manifest) is never overwritten, renamed or deleted, even with --force: every
+run warns and keeps it until the edits are moved elsewhere and the file is
+deleted, which re-extracts it.
+
+--watch keeps running: it watches files/other_programs/, programs.csv and the
+layout spec (watchdog/inotify if installed, polling otherwise), waits for a
+burst of saves to settle, then re-checks only the workbooks that changed and
+re-verifies the JSON files it rewrote. A programs.csv or layout spec edit
+reloads both and re-checks every workbook.
 
 Usage:
     python3 scripts/extract_programs.py
+    python3 scripts/extract_programs.py --force   # ignore the manifest
+    python3 scripts/extract_programs.py --jobs 1  # no process pool
+    python3 scripts/extract_programs.py --dry-run # show the output plan only
+    python3 scripts/extract_programs.py --force --profile  # timings + cProfile in build/extract-profile/
+    python3 scripts/extract_programs.py --layout poster-v1  # pick the poster layout spec
+    python3 scripts/extract_programs.py --force --no-grid-cache  # re-parse every workbook
+    python3 scripts/extract_programs.py --watch   # re-extract as workbooks are saved
+    python3 scripts/extract_programs.py --jsonl   # stream records to stdout, write nothing
+
+Library use (openpyxl is only imported once a workbook actually has to be parsed):
+
+    from extract_programs import BundleSink, JsonDirSink, JsonlSink, iter_programs, stream_programs
+
+    for xlsx_path, program, error in iter_programs(["files/other_programs"]):
+        ...
+    stream_programs(["files/other_programs"], [JsonDirSink("out"), BundleSink("out.bundle.json")])
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
 import sys
+import threading
+import time
+import zipfile
+from collections import Counter, defaultdict
 from pathlib import Path
+from xml.etree import ElementTree
 
-import openpyxl
+from build_bundle import BUNDLE_PATH, build_bundle, load_program_records, write_bundle
+from grid_cache import GRID_CACHE_DIR, read_grid, write_grid
+from layout_plan import DEFAULT_LAYOUT, EMPTY, LAYOUTS_DIR, load_layout, range_boundaries
+from program_catalog import load_catalog, normalize_name
 
 # --- Paths ---
 ROOT = Path(__file__).parent.parent
 INPUT_DIR = ROOT / "files" / "other_programs"
 OUTPUT_DIR = ROOT / "functions" / "program-data"
 PROGRAMS_CSV = ROOT / "functions" / "programs.csv"
+MANIFEST_PATH = ROOT / "scripts" / "extract-manifest.json"
+# build_mention_matcher.ALIASES_PATH (not imported here: that module imports this one)
+ALIASES_PATH = ROOT / "functions" / "program-aliases.json"
+# Not next to the JSON outputs: everything in program-data/ is loaded as a program
+PROFILE_DIR = ROOT / "build" / "extract-profile"
+
+# Bump whenever extraction logic changes so every workbook is rebuilt
+EXTRACTOR_VERSION = 2
+
+# --watch: quiet period after the last save before re-extracting, and the
+# polling interval used when watchdog (inotify) isn't installed
+WATCH_DEBOUNCE = 0.3
+WATCH_POLL_INTERVAL = 0.5
+# watchdog event types that mean a workbook's bytes changed (not "opened")
+WATCH_EVENT_TYPES = {"created", "modified", "moved", "deleted", "closed"}
 
 # Programs that already have dedicated data files — skip extraction
 # Include the typo variant from the Excel filename
@@ -72,106 +136,190 @@ def slugify(name, degree=""):
     return slug
 
 
-def get_merged_cell_value(ws, row, col):
-    """Get cell value, resolving merged cell ranges."""
-    cell = ws.cell(row=row, column=col)
-    if cell.value is not None:
-        return cell.value
-    for merged_range in ws.merged_cells.ranges:
-        if cell.coordinate in merged_range:
-            return ws.cell(row=merged_range.min_row, column=merged_range.min_col).value
-    return None
+# Default snapshot size; extract_single_program sizes the grid to the cells
+# its layout plan reads (poster-v1 stops at row 70, column AB).
+GRID_MAX_ROW = 70
+GRID_MAX_COL = 28
 
+FIRST_NUMBER_RE = re.compile(r"(\d+)")
+HOURS_SPECIFICALLY_RE = re.compile(r"(\d{2,3})\s+hours?\s+(?:specifically|in\s+)")
+COMPLETE_HOURS_RE = re.compile(r"complete\s+(\d{2,3})\s+hours?")
+LETTER_PREFIX_RE = re.compile(r"^[A-H]\.\s*")
 
-def find_section_by_header(ws, header_text, col_range, row_range):
-    """Search for header text in a cell range (case-insensitive partial match).
-    Returns the row number where found, or None.
+MERGE_CELL_TAG = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}mergeCell"
+
+
+class SheetGrid:
+    """Dense snapshot of a worksheet's resolved cell values.
+
+    Values are stored row-major in one flat list, with merged ranges already
+    filled in with their anchor value, so every read is a single index.
     """
-    for row in range(row_range[0], row_range[1] + 1):
-        for col in range(col_range[0], col_range[1] + 1):
-            val = get_merged_cell_value(ws, row, col)
-            if val and header_text.lower() in str(val).lower():
-                return row
-    return None
+
+    __slots__ = ("rows", "cols", "cells")
+
+    def __init__(self, rows=GRID_MAX_ROW, cols=GRID_MAX_COL):
+        self.rows = rows
+        self.cols = cols
+        self.cells = [None] * (rows * cols)
+
+    def value(self, row, col):
+        if 1 <= row <= self.rows and 1 <= col <= self.cols:
+            return self.cells[(row - 1) * self.cols + (col - 1)]
+        return None
+
+    def values_at(self, coords):
+        """Values at a list of (row, col) pairs, in order; None outside the grid."""
+        rows, cols, cells = self.rows, self.cols, self.cells
+        return [cells[(row - 1) * cols + (col - 1)] if 1 <= row <= rows and 1 <= col <= cols else None
+                for row, col in coords]
+
+    def fill_merged(self, min_col, min_row, max_col, max_row):
+        """Copy a merged range's anchor value into its empty covered cells."""
+        anchor = self.value(min_row, min_col)
+        if anchor is None:
+            return
+        for row in range(min_row, min(max_row, self.rows) + 1):
+            base = (row - 1) * self.cols
+            for col in range(min_col, min(max_col, self.cols) + 1):
+                if self.cells[base + col - 1] is None:
+                    self.cells[base + col - 1] = anchor
+
+
+def read_merged_ranges(xlsx_path, worksheet_path):
+    """Yield (min_col, min_row, max_col, max_row) for each merged range.
+
+    Read-only worksheets don't expose merged_cells, so the <mergeCells> block
+    is streamed straight out of the sheet XML. It follows <sheetData>, so this
+    is a second full parse of the sheet after openpyxl's; --profile shows it
+    inside load_sheet_grid, and the grid cache skips both.
+    """
+    with zipfile.ZipFile(xlsx_path) as archive, archive.open(worksheet_path) as source:
+        for _, elem in ElementTree.iterparse(source):
+            if elem.tag == MERGE_CELL_TAG:
+                yield range_boundaries(elem.get("ref"))
+            elem.clear()
+
+
+def load_sheet_grid(xlsx_path, stats=None, rows=GRID_MAX_ROW, cols=GRID_MAX_COL):
+    """Stream the top-left rows x cols of a workbook's first worksheet into a SheetGrid.
+
+    The sheet XML is parsed twice: once by openpyxl for the values, once by
+    read_merged_ranges() for the merged ranges, which read-only mode hides.
+    When profiling, `stats["mergedRanges"]` counts the merged ranges read.
+    """
+    import openpyxl  # deferred: ~80 ms to import, and grid-cache hits never need it
+
+    wb = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        # Use the first sheet (main program sheet, not the grade lookup)
+        ws = wb.worksheets[0]
+        grid = SheetGrid(rows, cols)
+        rows = ws.iter_rows(min_row=1, max_row=grid.rows, max_col=grid.cols, values_only=True)
+        for row_idx, values in enumerate(rows, start=1):
+            base = (row_idx - 1) * grid.cols
+            for col_idx, value in enumerate(values[:grid.cols]):
+                grid.cells[base + col_idx] = value
+        # Private in openpyxl, and the only way to find the sheet's XML part in read-only mode
+        worksheet_path = getattr(ws, "_worksheet_path", None)
+        if not worksheet_path:
+            raise RuntimeError(f"openpyxl {openpyxl.__version__} no longer exposes ReadOnlyWorksheet._worksheet_path; "
+                               "update read_merged_ranges() for this version")
+    finally:
+        wb.close()
+
+    for min_col, min_row, max_col, max_row in read_merged_ranges(xlsx_path, worksheet_path):
+        if stats is not None:
+            stats["mergedRanges"] += 1
+        if min_row <= grid.rows and min_col <= grid.cols:
+            grid.fill_merged(min_col, min_row, max_col, max_row)
+    return grid
+
+
+def load_cached_grid(xlsx_path, stats=None, rows=GRID_MAX_ROW, cols=GRID_MAX_COL, cache_dir=GRID_CACHE_DIR):
+    """load_sheet_grid() through the content-addressed grid cache (see grid_cache.py).
+
+    A workbook whose bytes were parsed before is decoded from the cache
+    without opening it in openpyxl; otherwise it is parsed and stored.
+    cache_dir=None always parses.
+    """
+    if cache_dir is None:
+        return timed(stats, "load_sheet_grid", load_sheet_grid, xlsx_path, stats, rows, cols)
+    source_hash = timed(stats, "hash_source", file_hash, xlsx_path)
+    cached = timed(stats, "read_grid_cache", read_grid, source_hash, rows, cols, cache_dir)
+    if cached is not None:
+        grid = SheetGrid(cached[0], cached[1])
+        grid.cells = cached[2]
+        return grid
+    grid = timed(stats, "load_sheet_grid", load_sheet_grid, xlsx_path, stats, rows, cols)
+    timed(stats, "write_grid_cache", write_grid, source_hash, grid.rows, grid.cols, grid.cells, cache_dir)
+    return grid
 
 
 def lookup_program_url(program_name, degree):
     """Look up the TCU URL for a program from programs.csv."""
-    if not PROGRAMS_CSV.exists():
-        return ""
-    name_lower = program_name.lower().strip()
-    with open(PROGRAMS_CSV) as f:
-        for line in f.readlines()[1:]:
-            parts = line.strip().split(",")
-            if len(parts) < 3:
-                continue
-            csv_name = parts[2].strip('"').strip().lower()
-            if csv_name == name_lower:
-                return parts[0].strip('"').strip()
-            # Also try with "criminology" variants
-            if "criminal" in name_lower and "criminal" in csv_name:
-                return parts[0].strip('"').strip()
-    return ""
+    return load_catalog(PROGRAMS_CSV).url(program_name)
 
 
-def extract_program_name(ws):
-    """Extract program name from cell H2."""
-    return str(get_merged_cell_value(ws, 2, 8) or "").strip()
+# Each extractor reads classified cells from a CellView (see layout_plan.py)
+# at the coordinates its field spec gives, and never touches the sheet itself.
 
+def extract_program_name(cells, field):
+    """Extract program name from the title cell (H2)."""
+    cell = cells.get(*field["cell"])
+    return cell.text if cell.value else ""
 
-def extract_degree_type(ws):
-    """Extract degree type from cell H4. Returns 'BA', 'BS', or 'BGS'."""
-    raw = str(get_merged_cell_value(ws, 4, 8) or "").strip()
-    if "science" in raw.lower():
+
+def extract_degree_type(cells, field):
+    """Extract degree type from the degree cell (H4). Returns 'BA', 'BS', or 'BGS'."""
+    cell = cells.get(*field["cell"])
+    raw = cell.lower if cell.value else ""
+    if "science" in raw:
         return "BS"
-    elif "general" in raw.lower():
+    elif "general" in raw:
         return "BGS"
-    elif "arts" in raw.lower():
+    elif "arts" in raw:
         return "BA"
-    return raw
+    return cell.text if cell.value else ""
 
 
-def extract_total_hours(ws):
-    """Extract total major hours from cell M8. '30 hours' -> 30.
+def extract_total_hours(cells, field):
+    """Extract total major hours from the hours cells (M8, then N8). '30 hours' -> 30.
     Falls back to scanning the description text for 'X hours' patterns.
     """
-    raw = str(get_merged_cell_value(ws, 8, 13) or "").strip()
-    match = re.search(r"(\d+)", raw)
-    if match:
-        return int(match.group(1))
-
-    # Fallback: check N8
-    raw2 = str(get_merged_cell_value(ws, 8, 14) or "").strip()
-    match2 = re.search(r"(\d+)", raw2)
-    if match2:
-        return int(match2.group(1))
+    for row, col in field["cells"]:
+        cell = cells.get(row, col)
+        match = FIRST_NUMBER_RE.search(cell.text) if cell.value else None
+        if match:
+            return int(match.group(1))
 
     # Fallback: scan descriptions for "complete X hours" or "X hours specifically"
-    for row in [8, 32]:
-        desc = str(get_merged_cell_value(ws, row, 1) or "")
+    for row, col in field["descriptionCells"]:
+        cell = cells.get(row, col)
+        desc = str(cell.value) if cell.value else ""
         # Look for patterns like "43 hours specifically" or "complete 30 hours"
-        hours_match = re.search(r"(\d{2,3})\s+hours?\s+(?:specifically|in\s+)", desc)
+        hours_match = HOURS_SPECIFICALLY_RE.search(desc)
         if hours_match:
             return int(hours_match.group(1))
-        hours_match = re.search(r"complete\s+(\d{2,3})\s+hours?", desc)
+        hours_match = COMPLETE_HOURS_RE.search(desc)
         if hours_match:
             return int(hours_match.group(1))
 
     return 0
 
 
-def extract_descriptions(ws):
-    """Extract description paragraphs from A8 and A32."""
+def extract_descriptions(cells, field):
+    """Extract description paragraphs (A8 and A32)."""
     descs = []
-    for row in [8, 32]:
-        val = get_merged_cell_value(ws, row, 1)
-        if val and str(val).strip():
-            descs.append(str(val).strip())
+    for row, col in field["cells"]:
+        cell = cells.get(row, col)
+        if cell.value and cell.text:
+            descs.append(cell.text)
     return descs
 
 
-def extract_courses(ws):
-    """Extract course listings from Column L (12), rows 10-40.
+def extract_courses(cells, field):
+    """Extract course listings from the requirements column (L, falling back to M).
 
     Uses section headers ('Required', 'Elective') to separate categories.
     Identifies courses by the pattern: 3-4 uppercase letters + space + 4-5 digits.
@@ -183,64 +331,59 @@ def extract_courses(ws):
     categories = []  # For lettered requirement categories (A., B., etc.)
     current_section = "required"
 
-    for row in range(10, 40):
-        # Check columns L (12) and M (13)
-        val = get_merged_cell_value(ws, row, 12)
-        if not val:
-            val = get_merged_cell_value(ws, row, 13)
-        if not val:
-            continue
-        text = str(val).strip()
-        if not text:
+    first_row, last_row = field["rows"]
+    for row in range(first_row, last_row + 1):
+        cell = EMPTY
+        for col in field["columns"]:
+            cell = cells.get(row, col)
+            if cell.value:
+                break
+        if not cell.value or not cell.text:
             continue
-        text_lower = text.lower()
+        text = cell.text
+        text_lower = cell.lower
 
         # Stop at non-course content
-        if "foreign language" in text_lower and "req" in text_lower:
-            break
-        if "for class selections" in text_lower:
+        if any(all(word in text_lower for word in words) for words in field["stopAt"]):
             break
         # Skip URLs but don't stop — courses may follow
         if text_lower.startswith("https://") or text_lower.startswith("http://"):
             continue
 
         # Detect section transitions
-        if "elective" in text_lower and not re.search(r"[A-Z]{3,4}\s+\d{4,5}", text):
+        if "elective" in text_lower and not cell.course:
             current_section = "elective"
-            hours_match = re.search(r"(\d+)\s*(?:hours|hrs)", text_lower)
-            if hours_match:
-                electives["hours"] = int(hours_match.group(1))
+            if cell.hours is not None:
+                electives["hours"] = cell.hours
             if text and not electives["description"]:
                 electives["description"] = text
             continue
 
-        if "required" in text_lower and not re.search(r"[A-Z]{3,4}\s+\d{4,5}", text):
+        if "required" in text_lower and not cell.course:
             current_section = "required"
-            hours_match = re.search(r"(\d+)\s*(?:hours|hrs)", text_lower)
-            if hours_match:
-                required["hours"] = int(hours_match.group(1))
+            if cell.hours is not None:
+                required["hours"] = cell.hours
             # Also capture descriptive headers like "Survey Level - Three (3) courses - 9 hrs."
-            if re.match(r"^[A-Z]", text) and "hrs" in text_lower and not text_lower.startswith("required"):
+            if cell.starts_upper and "hrs" in text_lower and not text_lower.startswith("required"):
                 categories.append(text)
             continue
 
         # Check if this is a course entry (CODE + number pattern)
-        if re.search(r"[A-Z]{3,4}\s+\d{4,5}", text):
+        if cell.course:
             if current_section == "required":
                 required["courses"].append(text)
             else:
                 electives["courses"].append(text)
         # Check for lettered category (A. ..., B. ..., etc.) or labeled requirements
-        elif re.match(r"^[A-G][.:]", text):
+        elif cell.lettered:
             categories.append(text)
         # Capture descriptive requirement lines (e.g. "Survey Level - Three (3) courses - 9 hrs.")
-        elif ("hrs" in text_lower or "courses" in text_lower) and re.match(r"^[A-Z]", text) and current_section == "required":
+        elif ("hrs" in text_lower or "courses" in text_lower) and cell.starts_upper and current_section == "required":
             categories.append(text)
         # Check for hours info in non-course lines
         elif current_section == "required" and required["hours"] == 0:
-            hours_match = re.search(r"(\d+)\s*(?:hours|hrs)", text_lower)
-            if hours_match:
-                required["hours"] = int(hours_match.group(1))
+            if cell.hours is not None:
+                required["hours"] = cell.hours
 
     # If no specific courses were found but categories exist, use categories
     if not required["courses"] and categories:
@@ -249,132 +392,114 @@ def extract_courses(ws):
     return {"requiredCourses": required, "electiveCourses": electives}
 
 
-def extract_career_options(ws):
-    """Extract career options from Column U area.
+def extract_career_options(cells, field):
+    """Extract career options from the column U area.
 
-    Searches for 'WHAT CAN I DO' header, then reads lettered items below it.
+    Finds the 'WHAT CAN I DO' header, then reads lettered items below it.
     """
     careers = []
-    header_row = find_section_by_header(ws, "WHAT CAN I DO", (21, 28), (25, 50))
+    header_row = cells.find_header(field)
     if not header_row:
         return careers
 
-    for row in range(header_row + 1, header_row + 15):
-        # Check columns U (21) through AB (28)
-        for col in [21, 24, 27, 28]:
-            val = get_merged_cell_value(ws, row, col)
-            if not val:
+    for row in range(header_row + 1, header_row + field["rows"] + 1):
+        for col in field["columns"]:
+            cell = cells.get(row, col)
+            if not cell.value or not cell.text:
                 continue
-            text = str(val).strip()
-            if not text or "what can" in text.lower() or "top career" in text.lower():
+            text_lower = cell.lower
+            if any(word in text_lower for word in field["skip"]):
                 continue
-            # Stop if we've hit the contact section
-            if "contact information" in text.lower():
-                return careers
-            # Skip items that look like contact data (names, phones, emails)
-            if re.search(r"[\w.+-]+@[\w-]+\.[\w.-]+", text):
+            # Stop at the contact section or anything that looks like contact data
+            if any(word in text_lower for word in field["stopAt"]):
                 return careers
-            if re.search(r"\d{3}[-.\s]\d{3}[-.\s]\d{4}", text):
+            if cell.email or cell.strict_phone:
                 return careers
-            if text.lower().startswith("dr.") or "chair" in text.lower() or "director" in text.lower():
+            if text_lower.startswith(tuple(field["stopAtPrefixes"])):
                 return careers
             # Remove letter prefix (A., B., etc.)
-            cleaned = re.sub(r"^[A-H]\.\s*", "", text).strip()
+            cleaned = LETTER_PREFIX_RE.sub("", cell.text).strip()
             if cleaned and cleaned not in careers:
                 careers.append(cleaned)
 
     return careers
 
 
-def extract_contacts(ws):
-    """Extract contact information from Column U area.
+def extract_contacts(cells, field):
+    """Extract contact information from the column U area.
 
-    Searches for 'CONTACT INFORMATION' header, then parses role/name/phone/email/office blocks.
+    Finds the 'CONTACT INFORMATION' header, then parses role/name/phone/email/office blocks.
     """
     contacts = []
-    header_row = find_section_by_header(ws, "CONTACT INFORMATION", (21, 28), (35, 65))
+    header_row = cells.find_header(field)
     if not header_row:
         return contacts
 
-    role_keywords = [
-        "chair", "director", "consultant", "advisor", "coordinator",
-    ]
+    role_keywords = field["roleKeywords"]
+    col = field["column"]
+    last_row = field["lastRow"]
+    block_rows = field["blockRows"]
 
     i = header_row + 1
-    while i <= min(header_row + 25, 70):
-        val = get_merged_cell_value(ws, i, 21)
-        if not val:
+    while i <= min(header_row + field["rows"], last_row):
+        cell = cells.get(i, col)
+        if not cell.value:
             i += 1
             continue
-        text = str(val).strip()
-        text_lower = text.lower()
 
         # Check if this row is a role title
-        is_role = any(kw in text_lower for kw in role_keywords)
+        is_role = any(kw in cell.lower for kw in role_keywords)
         if is_role:
-            contact = {"role": text}
+            contact = {"role": cell.text}
             # Read next rows for name, phone, email, office
-            for j in range(i + 1, min(i + 6, 71)):
-                sub_val = get_merged_cell_value(ws, j, 21)
-                if not sub_val:
-                    continue
-                sub_text = str(sub_val).strip()
-                if not sub_text:
+            for j in range(i + 1, min(i + block_rows, last_row) + 1):
+                sub = cells.get(j, col)
+                if not sub.value or not sub.text:
                     continue
 
                 # Check if we've hit the next role
-                if any(kw in sub_text.lower() for kw in role_keywords):
+                if any(kw in sub.lower for kw in role_keywords):
                     break
 
-                # Detect email
-                email_match = re.search(r"[\w.+-]+@[\w-]+\.[\w.-]+", sub_text)
-                if email_match:
-                    contact["email"] = email_match.group(0)
+                if sub.email:
+                    contact["email"] = sub.email
                     continue
 
-                # Detect phone (817-xxx-xxxx pattern)
-                phone_match = re.search(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", sub_text)
-                if phone_match:
-                    contact["phone"] = phone_match.group(0)
+                if sub.phone:
+                    contact["phone"] = sub.phone
                     continue
 
                 # First unidentified text = name, second = office
                 if "name" not in contact:
-                    contact["name"] = sub_text
+                    contact["name"] = sub.text
                 elif "office" not in contact:
-                    contact["office"] = sub_text
+                    contact["office"] = sub.text
 
             contacts.append(contact)
-            i += 5
+            i += block_rows
         else:
             i += 1
 
     return contacts
 
 
-def extract_internship(ws):
-    """Extract internship info from Column U, rows 7-25."""
+def extract_internship(cells, field):
+    """Extract internship info from column U below the 'INTERNSHIP' header."""
     internship = {}
-    # Look for internship header
-    header_row = find_section_by_header(ws, "INTERNSHIP", (21, 28), (5, 28))
+    header_row = cells.find_header(field)
     if not header_row:
         return internship
 
     desc_parts = []
-    for row in range(header_row + 1, min(header_row + 10, 30)):
-        val = get_merged_cell_value(ws, row, 21)
-        if not val:
+    last_row = min(header_row + field["rows"], field["lastRow"])
+    for row in range(header_row + 1, last_row + 1):
+        cell = cells.get(row, field["column"])
+        if not cell.value or not cell.text:
             continue
-        text = str(val).strip()
-        if not text:
-            continue
-        # Stop if we hit a new major section
-        if "WHAT CAN I DO" in text.upper() or "CONTACT" in text.upper():
-            break
-        # Skip sub-section headers that are just "Inclusive Excellence" etc.
-        if "inclusive excellence" in text.lower():
+        # Stop at the next section (careers, contacts, "Inclusive Excellence")
+        if any(word in cell.lower for word in field["stopAt"]):
             break
-        desc_parts.append(text)
+        desc_parts.append(cell.text)
 
     if desc_parts:
         internship["description"] = " ".join(desc_parts)
@@ -382,104 +507,793 @@ def extract_internship(ws):
     return internship
 
 
-def extract_single_program(xlsx_path):
-    """Extract all data from a single Excel file and return a dict."""
-    wb = openpyxl.load_workbook(xlsx_path, data_only=True)
-    # Use the first sheet (main program sheet, not the grade lookup)
-    ws = wb.worksheets[0]
+# Output field -> extractor; the layout spec says where each one looks
+FIELD_EXTRACTORS = {
+    "name": extract_program_name,
+    "degree": extract_degree_type,
+    "totalHours": extract_total_hours,
+    "descriptions": extract_descriptions,
+    "requirements": extract_courses,
+    "careerOptions": extract_career_options,
+    "contacts": extract_contacts,
+    "internship": extract_internship,
+}
+
+
+def new_profile_stats():
+    """Empty per-workbook counters for --profile."""
+    return {"phases": {}, "cellReads": 0, "mergedRanges": 0}
 
-    name = extract_program_name(ws)
+
+def timed(stats, phase, fn, *args, **kwargs):
+    """Call fn, adding its wall time in ms to stats["phases"][phase] when profiling."""
+    if stats is None:
+        return fn(*args, **kwargs)
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        phases = stats["phases"]
+        phases[phase] = phases.get(phase, 0.0) + (time.perf_counter() - start) * 1000
+
+
+class CountingGrid:
+    """SheetGrid wrapper that counts cell reads for --profile."""
+
+    __slots__ = ("grid", "stats")
+
+    def __init__(self, grid, stats):
+        self.grid = grid
+        self.stats = stats
+
+    def value(self, row, col):
+        self.stats["cellReads"] += 1
+        return self.grid.value(row, col)
+
+    def values_at(self, coords):
+        self.stats["cellReads"] += len(coords)
+        return self.grid.values_at(coords)
+
+
+def extract_field(cells, name, stats=None):
+    """Run one output field's extractor with its spec from the cells' layout plan."""
+    extractor = FIELD_EXTRACTORS[name]
+    return timed(stats, extractor.__name__, extractor, cells, cells.plan.fields[name])
+
+
+def extract_single_program(xlsx_path, stats=None, layout=DEFAULT_LAYOUT, grid_cache=GRID_CACHE_DIR):
+    """Extract all data from a single Excel file and return a dict.
+
+    `layout` names the spec in scripts/layouts/ describing the poster, and
+    `grid_cache` the parsed-grid cache directory (None to always parse).
+    Pass `stats` from new_profile_stats() to collect per-phase timings and
+    cell-read counts.
+    """
+    plan = load_layout(layout)
+    ws = load_cached_grid(xlsx_path, stats, plan.rows, plan.cols, grid_cache)
+    if stats is not None:
+        ws = CountingGrid(ws, stats)
+    cells = timed(stats, "read_cells", plan.read, ws)
+
+    name = extract_field(cells, "name", stats)
     if not name:
         name = xlsx_path.stem.split("(")[0].strip()
 
-    degree = extract_degree_type(ws)
+    degree = extract_field(cells, "degree", stats)
+    if not degree:
+        # Fall back to the catalog when H4 is blank and only one bachelor's degree exists
+        bachelors = [d for d in load_catalog(PROGRAMS_CSV).degrees(name) if d in ("BA", "BS", "BGS")]
+        if len(bachelors) == 1:
+            degree = bachelors[0]
     abbr = ABBREVIATIONS.get(name, "")
 
     program = {
         "name": name,
         "abbreviation": abbr,
         "degree": degree,
-        "totalHours": extract_total_hours(ws),
-        "url": lookup_program_url(name, degree),
-        "descriptions": extract_descriptions(ws),
-        "requirements": extract_courses(ws),
-        "careerOptions": extract_career_options(ws),
-        "contacts": extract_contacts(ws),
-        "internship": extract_internship(ws),
+        "totalHours": extract_field(cells, "totalHours", stats),
+        "url": timed(stats, "lookup_program_url", lookup_program_url, name, degree),
+        "descriptions": extract_field(cells, "descriptions", stats),
+        "requirements": extract_field(cells, "requirements", stats),
+        "careerOptions": extract_field(cells, "careerOptions", stats),
+        "contacts": extract_field(cells, "contacts", stats),
+        "internship": extract_field(cells, "internship", stats),
     }
 
-    wb.close()
     return program
 
 
-def determine_slug(name, degree, all_files):
-    """Determine output filename slug, adding degree suffix when needed for disambiguation."""
-    # Check if multiple files share the same base program name
-    base_name = name.lower().strip()
-    variants = [f for f in all_files if f.stem.split("(")[0].strip().lower() == base_name
-                or name.lower() in f.stem.lower()]
+class SlugCollisionError(Exception):
+    """Two workbooks would be written to the same program-data file, or one would overwrite a hand-curated file."""
+
+
+def plan_slugs(programs, reserved=()):
+    """Assign an output slug to every extracted program in one pass.
+
+    `programs` maps xlsx filename -> (name, degree). Programs are grouped by
+    normalized name, minors apart from majors; a name with several variants,
+    or any BS/BGS program, gets a degree suffix ('economics-ba',
+    'economics-bs'), otherwise the bare slug is used ('history',
+    'history-minor'). Returns {xlsx filename: slug}.
+
+    `reserved` holds slugs of files the extractor doesn't own (hand-curated
+    program-data files). Raises SlugCollisionError if two workbooks map to
+    the same slug, or a workbook maps to a reserved one, rather than letting
+    the write silently overwrite the other file.
+    """
+    # normalize_name drops a trailing "Minor", so keep minors in their own groups
+    group_sizes = Counter((normalize_name(name), degree == "Minor") for name, degree in programs.values())
+
+    plan = {}
+    owners = defaultdict(list)
+    for xlsx_name, (name, degree) in programs.items():
+        if degree and (group_sizes[(normalize_name(name), degree == "Minor")] > 1 or degree in ("BS", "BGS")):
+            slug = f"{slugify(name)}-{degree.lower()}"
+        else:
+            slug = slugify(name)
+        plan[xlsx_name] = slug
+        owners[slug].append(xlsx_name)
+
+    reserved = set(reserved)
+    collisions = {slug: names for slug, names in owners.items() if len(names) > 1 or slug in reserved}
+    if collisions:
+        lines = [f"{slug}.json <- {', '.join(sorted(names))}" + (" (hand-curated file exists)" if slug in reserved else "")
+                 for slug, names in sorted(collisions.items())]
+        raise SlugCollisionError("Slug collision:\n  " + "\n  ".join(lines))
+    return plan
+
+
+def extract_worker(xlsx_path, profile=False, layout=DEFAULT_LAYOUT, grid_cache=GRID_CACHE_DIR):
+    """Process-pool entry point. Returns (program, error, stats) for one workbook.
+
+    `stats` is None unless profiling.
+    """
+    stats = new_profile_stats() if profile else None
+    try:
+        return extract_single_program(xlsx_path, stats, layout, grid_cache), None, stats
+    except Exception as e:
+        return None, str(e), stats
+
+
+def iter_extracted(xlsx_paths, jobs=1, profile=False, layout=DEFAULT_LAYOUT, grid_cache=GRID_CACHE_DIR):
+    """Yield extract_worker's (program, error, stats) per workbook, in order, as each is ready.
+
+    Uses a process pool when jobs > 1.
+    """
+    if jobs <= 1 or len(xlsx_paths) <= 1:
+        for xlsx_path in xlsx_paths:
+            yield extract_worker(xlsx_path, profile, layout, grid_cache)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    n = len(xlsx_paths)
+    with ProcessPoolExecutor(max_workers=min(jobs, n)) as pool:
+        yield from pool.map(extract_worker, xlsx_paths, [profile] * n, [layout] * n, [grid_cache] * n)
+
+
+def extract_all(xlsx_paths, jobs, profile=False, layout=DEFAULT_LAYOUT, grid_cache=GRID_CACHE_DIR):
+    """Extract workbooks, in a process pool when jobs > 1.
+
+    Returns (program, error, stats) tuples in the same order as xlsx_paths.
+    """
+    return list(iter_extracted(xlsx_paths, jobs, profile, layout, grid_cache))
+
+
+def has_dedicated_file(program):
+    """Programs like DCDA keep a hand-maintained program-data file instead."""
+    return program["name"].lower().strip() in SKIP_NAMES
+
+
+def find_workbooks(paths):
+    """Expand workbook files and directories of workbooks into a list of paths."""
+    found = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.extend(sorted(p for p in path.glob("*.xlsx") if is_workbook(p.name)))
+        elif is_workbook(path.name):
+            found.append(path)
+    return found
+
+
+def iter_programs(paths, jobs=1, layout=DEFAULT_LAYOUT, grid_cache=GRID_CACHE_DIR):
+    """Stream extraction: yield (xlsx_path, program, error) for each workbook in `paths`.
+
+    `paths` may mix workbooks and directories. One of program/error is None.
+    Results come in path order as soon as each is extracted and nothing is
+    written; hand them to sinks (see stream_programs) or consume them directly.
+    """
+    xlsx_paths = find_workbooks(paths)
+    for xlsx_path, (program, error, _) in zip(xlsx_paths, iter_extracted(xlsx_paths, jobs, False, layout, grid_cache)):
+        yield xlsx_path, program, error
+
+
+class JsonlSink:
+    """Writes each result to a stream as one JSON line, {"file", "program"} or {"file", "error"}."""
+
+    __slots__ = ("stream",)
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def write(self, xlsx_path, program, error):
+        record = {"file": xlsx_path.name}
+        if error is not None:
+            record["error"] = error
+        else:
+            record["program"] = program
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.stream.flush()
+
+
+class JsonDirSink:
+    """Writes one program-data JSON file per program, named by plan_slugs().
+
+    A slug depends on the other programs' names ('economics-ba' only when
+    there is also a BS), so each record goes to a temporary file as it
+    arrives and close() renames them all. Errors and programs with
+    dedicated data files are skipped; unchanged files are not rewritten.
+
+    The sink neither reads nor updates the extract manifest, so it can't
+    tell hand-curated files from earlier outputs. It refuses OUTPUT_DIR:
+    functions/program-data/ is only written by run().
+    """
+
+    __slots__ = ("out_dir", "pending", "written")
+
+    def __init__(self, out_dir):
+        self.out_dir = Path(out_dir)
+        if self.out_dir.resolve() == OUTPUT_DIR.resolve():
+            raise ValueError(f"JsonDirSink cannot write to {OUTPUT_DIR}; run extract_programs.py to update it")
+        self.pending = {}
+        self.written = []
+
+    def write(self, xlsx_path, program, error):
+        if error is not None or has_dedicated_file(program):
+            return
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.out_dir / f".{text_hash(xlsx_path.name)[:16]}.json.tmp"
+        tmp.write_text(json.dumps(program, indent=2), encoding="utf-8")
+        self.pending[xlsx_path.name] = (program["name"], program["degree"], tmp)
+
+    def close(self):
+        """Rename every pending file. Raises SlugCollisionError (writing nothing) on a collision."""
+        try:
+            plan = plan_slugs({xlsx_name: (name, degree) for xlsx_name, (name, degree, _) in self.pending.items()})
+        except SlugCollisionError:
+            for _, _, tmp in self.pending.values():
+                tmp.unlink(missing_ok=True)
+            raise
+        for xlsx_name, (_, _, tmp) in sorted(self.pending.items()):
+            output_path = self.out_dir / f"{plan[xlsx_name]}.json"
+            if output_path.exists() and output_path.read_bytes() == tmp.read_bytes():
+                tmp.unlink()
+            else:
+                tmp.replace(output_path)
+                self.written.append(output_path.name)
+        self.pending = {}
+
+
+class BundleSink:
+    """Writes a build_bundle() file for the streamed programs on close().
+
+    Only what was streamed is bundled; functions/program-data.bundle.json
+    also covers hand-curated files and is built by build_bundle.py.
+    """
+
+    __slots__ = ("path", "programs", "written")
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.programs = {}
+        self.written = False
+
+    def write(self, xlsx_path, program, error):
+        if error is None and not has_dedicated_file(program):
+            self.programs[xlsx_path.name] = program
+
+    def close(self):
+        plan = plan_slugs({xlsx_name: (p["name"], p["degree"]) for xlsx_name, p in self.programs.items()})
+        records = sorted(((plan[xlsx_name], p) for xlsx_name, p in self.programs.items()), key=lambda r: r[0])
+        text = json.dumps(build_bundle(records), ensure_ascii=False, separators=(",", ":")) + "\n"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.written = write_if_changed(self.path, text)
 
-    # Count how many Excel files map to this program name
-    if len(variants) > 1 or degree in ("BS", "BGS"):
-        slug = slugify(name) + f"-{degree.lower()}"
-    else:
-        slug = slugify(name)
-    return slug
+
+def stream_programs(paths, sinks, jobs=1, layout=DEFAULT_LAYOUT, grid_cache=GRID_CACHE_DIR):
+    """Feed every iter_programs() result to each sink, then close the sinks.
+
+    Returns (programs extracted, errors).
+    """
+    counts = [0, 0]
+    for xlsx_path, program, error in iter_programs(paths, jobs, layout, grid_cache):
+        counts[error is not None] += 1
+        for sink in sinks:
+            sink.write(xlsx_path, program, error)
+    for sink in sinks:
+        sink.close()
+    return counts[0], counts[1]
+
+
+def write_profile_report(profiles, run_phases, top, profiler, out_dir=PROFILE_DIR):
+    """Write the --profile run report and cProfile dump. Returns the report dict.
+
+    out_dir/workbooks.jsonl   one record per extracted workbook
+    out_dir/report.json       run phases, per-phase totals, top-N slowest files
+    out_dir/extract.prof      cProfile stats (python3 -m pstats extract.prof)
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rows = []
+    phase_totals = Counter()
+    for xlsx_name, stats in sorted(profiles.items()):
+        phase_totals.update(stats["phases"])
+        rows.append({
+            "file": xlsx_name,
+            "totalMs": round(sum(stats["phases"].values()), 3),
+            "cellReads": stats["cellReads"],
+            "mergedRanges": stats["mergedRanges"],
+            "phases": {phase: round(ms, 3) for phase, ms in stats["phases"].items()},
+        })
+
+    with open(out_dir / "workbooks.jsonl", "w") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+    slowest = sorted(rows, key=lambda r: r["totalMs"], reverse=True)[:top]
+    report = {
+        "extractorVersion": EXTRACTOR_VERSION,
+        "workbooks": len(rows),
+        "cellReads": sum(r["cellReads"] for r in rows),
+        "mergedRanges": sum(r["mergedRanges"] for r in rows),
+        "runPhasesMs": {phase: round(ms, 3) for phase, ms in run_phases.items()},
+        "phaseTotalsMs": {phase: round(ms, 3) for phase, ms in phase_totals.most_common()},
+        "slowestFiles": [
+            {
+                "file": r["file"],
+                "totalMs": r["totalMs"],
+                "slowestPhase": max(r["phases"], key=r["phases"].get) if r["phases"] else None,
+            }
+            for r in slowest
+        ],
+    }
+    with open(out_dir / "report.json", "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    profiler.dump_stats(out_dir / "extract.prof")
+    return report
+
+
+def finish_profile(profiler, profiles, run_phases, top):
+    """Stop profiling, write the run report and print its top-N tables."""
+    profiler.disable()
+    report = write_profile_report(profiles, run_phases, top, profiler)
+
+    print(f"\n{'='*60}")
+    print(f"PROFILE ({report['workbooks']} workbooks, {report['cellReads']:,} cell reads, "
+          f"{report['mergedRanges']:,} merged ranges)")
+    print(f"{'='*60}")
+    print("Run phases:")
+    for phase, ms in report["runPhasesMs"].items():
+        print(f"  {phase:<28s} {ms:>10.1f} ms")
+    print(f"\nSlowest phases (all workbooks):")
+    for phase, ms in list(report["phaseTotalsMs"].items())[:top]:
+        print(f"  {phase:<28s} {ms:>10.1f} ms")
+    print(f"\nSlowest workbooks:")
+    for row in report["slowestFiles"]:
+        print(f"  {row['file']:<50s} {row['totalMs']:>8.1f} ms  ({row['slowestPhase']})")
+    print(f"\nProfile written to {PROFILE_DIR.relative_to(ROOT)}/ "
+          f"(python3 -m pstats {PROFILE_DIR.relative_to(ROOT)}/extract.prof)")
+
+
+def file_hash(path):
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def catalog_hash(path=PROGRAMS_CSV):
+    """SHA-256 of programs.csv, which supplies url and the degree fallback ("" if missing)."""
+    return file_hash(path) if path.exists() else ""
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def write_if_changed(path, text):
+    """Write text to path only if the content differs. Returns True if written."""
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def load_manifest():
+    """Load the build manifest, or an empty one if missing or unreadable."""
+    if MANIFEST_PATH.exists():
+        try:
+            with open(MANIFEST_PATH) as f:
+                manifest = json.load(f)
+            if isinstance(manifest.get("sources"), dict):
+                return manifest
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Ignoring unreadable manifest {MANIFEST_PATH.name}: {e}")
+    return {"sources": {}}
+
+
+def save_manifest(manifest):
+    return write_if_changed(MANIFEST_PATH, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+def is_up_to_date(entry, source_hash, layout_hash, catalog):
+    """True if a manifest entry still describes the current source, layout spec, catalog and output."""
+    if not entry:
+        return False
+    if entry.get("sourceHash") != source_hash or entry.get("extractorVersion") != EXTRACTOR_VERSION:
+        return False
+    if entry.get("layoutHash") != layout_hash or entry.get("catalogHash") != catalog:
+        return False
+    if entry.get("skipped"):
+        return True
+    # A hand-edited output counts as up to date: output_edited() warns about it instead
+    return (OUTPUT_DIR / entry["output"]).exists()
+
+
+def output_edited(entry):
+    """True if the output a manifest entry recorded was changed by hand since extraction."""
+    output_name = entry.get("output")
+    if not output_name:
+        return False
+    output_path = OUTPUT_DIR / output_name
+    return output_path.exists() and file_hash(output_path) != entry.get("outputHash")
+
+
+def summary_row(xlsx_name, output_name, program):
+    return {
+        "file": xlsx_name,
+        "output": output_name,
+        "name": program["name"],
+        "degree": program["degree"],
+        "hours": program["totalHours"],
+        "courses": len(program["requirements"].get("requiredCourses", {}).get("courses", [])),
+        "careers": len(program["careerOptions"]),
+        "contacts": len(program["contacts"]),
+    }
+
+
+def remove_output(output_name, expected_hash):
+    """Delete an extractor-written output unless it was edited by hand since."""
+    output_path = OUTPUT_DIR / output_name
+    if not output_path.exists():
+        return False
+    if file_hash(output_path) != expected_hash:
+        print(f"  KEPT {output_name} (edited since extraction)")
+        return False
+    output_path.unlink()
+    return True
+
+
+def hand_curated_slugs(sources):
+    """Slugs of program-data files no manifest entry wrote.
+
+    With an empty manifest (first run) every existing file is assumed to be
+    a previous extraction output and may be overwritten, as before.
+    """
+    owned = {entry["output"] for entry in sources.values() if entry.get("output")}
+    if not owned:
+        return set()
+    return {path.stem for path in OUTPUT_DIR.glob("*.json") if path.name not in owned}
+
+
+def rename_blocked(previous, output_name):
+    """True (after a warning) if moving previous["output"] to output_name would orphan hand edits.
+
+    The old file stays where it is and nothing is written under the new
+    name, so the program never ends up in program-data twice.
+    """
+    old_name = previous.get("output")
+    if not old_name or old_name == output_name or not output_edited(previous):
+        return False
+    print(f"WARNING: not renaming {old_name} -> {output_name}: {old_name} was edited since extraction. "
+          f"Move the edits to {output_name} by hand and delete {old_name}.")
+    return True
+
+
+def remove_stale_outputs(sources, xlsx_files):
+    """Drop manifest entries for deleted workbooks and remove their outputs.
+
+    An output is only deleted if it still matches what the extractor wrote,
+    so hand edits made after extraction are never lost.
+    """
+    current = {f.name for f in xlsx_files}
+    removed = []
+    for xlsx_name in sorted(set(sources) - current):
+        entry = sources.pop(xlsx_name)
+        if entry.get("output") and remove_output(entry["output"], entry.get("outputHash")):
+            removed.append(entry["output"])
+    return removed
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Extract AddRan program data from Excel posters.")
+    parser.add_argument("--force", action="store_true",
+                        help="re-extract every workbook, ignoring the build manifest (hand-edited outputs are still kept)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="worker processes for extraction (default: CPU count)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="extract and print the workbook -> output plan without writing anything")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every phase per workbook, count cell reads and write a run report "
+                             "and cProfile dump to build/extract-profile/ (implies --jobs 1 --no-grid-cache)")
+    parser.add_argument("--profile-top", type=int, default=10, metavar="N",
+                        help="slowest workbooks/phases to list with --profile (default: 10)")
+    parser.add_argument("--layout", default=DEFAULT_LAYOUT,
+                        help=f"poster layout spec in scripts/layouts/ (default: {DEFAULT_LAYOUT})")
+    parser.add_argument("--no-grid-cache", action="store_true",
+                        help="parse every workbook with openpyxl instead of using build/grid-cache/")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and re-extract workbooks as they change in files/other_programs/")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="stream every extracted record to stdout as JSON lines; writes no files")
+    args = parser.parse_args()
+    if args.watch and (args.dry_run or args.profile):
+        parser.error("--watch cannot be combined with --dry-run or --profile")
+    try:
+        layout_hash = load_layout(args.layout).hash
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Cannot load layout spec {args.layout!r}: {e}")
+        sys.exit(1)
+
+    if args.watch:
+        sys.exit(watch_extraction(args, layout_hash))
+    if args.jsonl:
+        # find_workbooks() skips missing paths, so check here like run() does
+        if not INPUT_DIR.exists():
+            print(f"ERROR: Input directory not found: {INPUT_DIR}", file=sys.stderr)
+            sys.exit(1)
+        grid_cache = None if args.no_grid_cache else GRID_CACHE_DIR
+        _, errors = stream_programs([INPUT_DIR], [JsonlSink()], args.jobs, args.layout, grid_cache)
+        sys.exit(1 if errors else 0)
+    if run(args, layout_hash) is None:
+        sys.exit(1)
+
+
+def run(args, layout_hash, changed=None):
+    """One incremental extraction pass over INPUT_DIR with main()'s options.
+
+    `changed` (workbook names, from --watch) limits the pass to those
+    workbooks: the others keep their manifest entry without being re-hashed.
+    Workbooks the manifest doesn't know yet are always checked.
+
+    Returns {"rebuilt", "written", "removed", "errors"} (workbook names,
+    output names, output names, error dicts), or None when nothing could be
+    extracted (missing inputs, slug collision).
+
+    With --profile the pass runs in-process without the grid cache, and the
+    profile report is written however the pass ends.
+    """
+    if not args.profile:
+        return extract_pass(args, layout_hash, changed, {}, {})
+    import cProfile
+
+    # Extract in-process so cProfile sees the extractors, not pool plumbing,
+    # and parse every workbook: grid-cache hits would hide load_sheet_grid
+    args.jobs = 1
+    args.no_grid_cache = True
+    profiles = {}
+    run_phases = {}
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return extract_pass(args, layout_hash, changed, profiles, run_phases)
+    finally:
+        finish_profile(profiler, profiles, run_phases, args.profile_top)
+
+
+def extract_pass(args, layout_hash, changed, profiles, run_phases):
+    """The body of run(). Fills `profiles` (per workbook) and `run_phases` as it goes."""
+    grid_cache = None if args.no_grid_cache else GRID_CACHE_DIR
+    clock = [time.perf_counter()]
+
+    def lap(phase):
+        now = time.perf_counter()
+        run_phases[phase] = (now - clock[0]) * 1000
+        clock[0] = now
+
     if not INPUT_DIR.exists():
         print(f"ERROR: Input directory not found: {INPUT_DIR}")
-        sys.exit(1)
+        return None
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    xlsx_files = sorted([f for f in INPUT_DIR.glob("*.xlsx") if not f.name.startswith("~$")])
+    xlsx_files = sorted([f for f in INPUT_DIR.glob("*.xlsx") if is_workbook(f.name)])
     if not xlsx_files:
         print(f"ERROR: No .xlsx files found in {INPUT_DIR}")
-        sys.exit(1)
+        return None
 
     print(f"Found {len(xlsx_files)} Excel files to process.\n")
 
+    manifest = load_manifest()
+    sources = manifest["sources"]
     results = []
     errors = []
+    unchanged = []
+    rebuilt = []
+    written = []
+    kept = []
+
+    # Decide what needs rebuilding, extract those workbooks (in parallel), plan
+    # every output slug at once, then handle every workbook in sorted order so
+    # output stays deterministic.
+    source_hashes = {}
+    pending = []
+    catalog = catalog_hash()
+    for xlsx_path in xlsx_files:
+        if changed is not None and xlsx_path.name not in changed and xlsx_path.name in sources:
+            continue
+        source_hashes[xlsx_path] = file_hash(xlsx_path)
+        entry = sources.get(xlsx_path.name)
+        if args.force or not is_up_to_date(entry, source_hashes[xlsx_path], layout_hash, catalog):
+            pending.append(xlsx_path)
+    lap("hash_sources")
+
+    if len(pending) > 1 and args.jobs > 1:
+        print(f"Extracting {len(pending)} workbooks with {min(args.jobs, len(pending))} workers.\n")
+    outcomes = {}
+    for xlsx_path, (program, error, stats) in zip(pending, extract_all(pending, args.jobs, args.profile, args.layout, grid_cache)):
+        outcomes[xlsx_path] = (program, error)
+        if stats is not None:
+            profiles[xlsx_path.name] = stats
+    lap("extract")
+
+    # Unchanged (and failed) workbooks keep the name/degree recorded last run
+    named = {}
+    for xlsx_path in xlsx_files:
+        program, error = outcomes.get(xlsx_path, (None, None))
+        if program is not None:
+            if not has_dedicated_file(program):
+                named[xlsx_path.name] = (program["name"], program["degree"])
+        elif xlsx_path.name in sources and sources[xlsx_path.name].get("output"):
+            entry = sources[xlsx_path.name]
+            named[xlsx_path.name] = (entry["name"], entry["degree"])
+    try:
+        plan = plan_slugs(named, hand_curated_slugs(sources))
+    except SlugCollisionError as e:
+        print(f"ERROR: {e}")
+        return None
+    # Hand-edited outputs whose slug changed stay put; nothing else may take their name
+    blocked = {x.name: sources[x.name]["output"] for x in xlsx_files
+               if x.name in plan and rename_blocked(sources.get(x.name, {}), f"{plan[x.name]}.json")}
+    taken = [f"{slug}.json <- {x} (kept hand-edited file)" for x, slug in plan.items()
+             if f"{slug}.json" in blocked.values() and blocked.get(x) != f"{slug}.json"]
+    if taken:
+        print("ERROR: Slug collision:\n  " + "\n  ".join(sorted(taken)))
+        return None
+    lap("plan_slugs")
+
+    if args.dry_run:
+        print(f"{'Workbook':<50s} Output")
+        print("-" * 80)
+        for xlsx_path in xlsx_files:
+            target = f"{plan[xlsx_path.name]}.json" if xlsx_path.name in plan else "(skipped)"
+            _, error = outcomes.get(xlsx_path, (None, None))
+            if error is not None:
+                target = f"(error: {error})"
+            print(f"{xlsx_path.name:<50s} {target}")
+        return {"rebuilt": [], "written": [], "removed": [], "errors": errors}
 
     for xlsx_path in xlsx_files:
+        previous = sources.get(xlsx_path.name, {})
+        if xlsx_path not in outcomes:
+            unchanged.append(xlsx_path.name)
+            if xlsx_path.name not in blocked and output_edited(previous):
+                print(f"WARNING: {previous['output']} was edited since extraction; keeping it "
+                      f"(delete it to re-extract {xlsx_path.name})")
+                kept.append(previous["output"])
+            if previous.get("output"):
+                with open(OUTPUT_DIR / previous["output"]) as f:
+                    program = json.load(f)
+                output_name = f"{plan[xlsx_path.name]}.json"
+                if xlsx_path.name in blocked:
+                    output_name = previous["output"]
+                elif output_name != previous["output"]:
+                    # A sibling appeared or disappeared: move the output, no re-extraction
+                    text = json.dumps(program, indent=2)
+                    (OUTPUT_DIR / output_name).write_text(text, encoding="utf-8")
+                    remove_output(previous["output"], previous["outputHash"])
+                    print(f"Renamed: {previous['output']} -> {output_name}")
+                    written.append(output_name)
+                    previous.update(output=output_name, outputHash=text_hash(text))
+                results.append(summary_row(xlsx_path.name, output_name, program))
+            continue
+
         print(f"Processing: {xlsx_path.name}")
-        try:
-            program = extract_single_program(xlsx_path)
+        source_hash = source_hashes[xlsx_path]
+        program, error = outcomes[xlsx_path]
+        if error is not None:
+            print(f"  ERROR: {error}")
+            errors.append({"file": xlsx_path.name, "error": error})
+            continue
+        rebuilt.append(xlsx_path.name)
+
+        # Skip programs with dedicated data files
+        if xlsx_path.name not in plan:
+            print(f"  SKIPPED (already has dedicated data file)")
+            sources[xlsx_path.name] = {
+                "sourceHash": source_hash,
+                "extractorVersion": EXTRACTOR_VERSION,
+                "layoutHash": layout_hash,
+                "catalogHash": catalog,
+                "skipped": True,
+            }
+            continue
 
-            # Skip programs with dedicated data files
-            if program["name"].lower().strip() in SKIP_NAMES:
-                print(f"  SKIPPED (already has dedicated data file)")
-                continue
+        output_path = OUTPUT_DIR / f"{plan[xlsx_path.name]}.json"
+        if xlsx_path.name in blocked:
+            # Keep the old manifest entry, so the next run warns again until it's resolved
+            print(f"  BLOCKED (kept {blocked[xlsx_path.name]})")
+            continue
+        if previous.get("output") == output_path.name and output_edited(previous):
+            # Same policy: keep the old manifest entry so the next run warns again
+            print(f"  KEPT {output_path.name} (edited since extraction; delete it to re-extract)")
+            kept.append(output_path.name)
+            continue
+        try:
+            stats = profiles.get(xlsx_path.name)
+            text = timed(stats, "json_dumps", json.dumps, program, indent=2)
 
-            slug = determine_slug(program["name"], program["degree"], xlsx_files)
-            output_path = OUTPUT_DIR / f"{slug}.json"
-
-            with open(output_path, "w") as f:
-                json.dump(program, f, indent=2)
-
-            print(f"  -> {output_path.name}")
-            results.append({
-                "file": xlsx_path.name,
-                "output": output_path.name,
-                "name": program["name"],
-                "degree": program["degree"],
-                "hours": program["totalHours"],
-                "courses": len(program["requirements"].get("requiredCourses", {}).get("courses", [])),
-                "careers": len(program["careerOptions"]),
-                "contacts": len(program["contacts"]),
-            })
+            if timed(stats, "write_json", write_if_changed, output_path, text):
+                written.append(output_path.name)
+                print(f"  -> {output_path.name}")
+            else:
+                print(f"  -> {output_path.name} (unchanged)")
+            if previous.get("output") and previous["output"] != output_path.name:
+                if remove_output(previous["output"], previous.get("outputHash")):
+                    print(f"  removed {previous['output']}")
         except Exception as e:
             print(f"  ERROR: {e}")
             errors.append({"file": xlsx_path.name, "error": str(e)})
+            continue
+
+        sources[xlsx_path.name] = {
+            "sourceHash": source_hash,
+            "extractorVersion": EXTRACTOR_VERSION,
+            "layoutHash": layout_hash,
+            "catalogHash": catalog,
+            "name": program["name"],
+            "degree": program["degree"],
+            "output": output_path.name,
+            "outputHash": text_hash(text),
+        }
+        results.append(summary_row(xlsx_path.name, output_path.name, program))
+
+    lap("write_outputs")
+    removed = remove_stale_outputs(sources, xlsx_files)
+    save_manifest(manifest)
+    _, bundle_written = write_bundle(OUTPUT_DIR, BUNDLE_PATH)
+    from build_mention_matcher import write_alias_table
+
+    _, aliases_written = write_alias_table(load_program_records(OUTPUT_DIR), ALIASES_PATH)
+    lap("manifest_and_bundle")
 
     # Summary
     print(f"\n{'='*60}")
     print(f"EXTRACTION SUMMARY")
     print(f"{'='*60}")
     print(f"Processed: {len(results)}/{len(xlsx_files)}")
+    print(f"Unchanged: {len(unchanged)}")
+    print(f"Rebuilt:   {len(rebuilt)} ({len(written)} JSON files written)")
+    print(f"Removed:   {len(removed)}")
+    if blocked:
+        print(f"Blocked:   {len(blocked)} (hand-edited outputs not renamed: {', '.join(blocked)})")
+    if kept:
+        print(f"Kept:      {len(kept)} (hand-edited outputs not overwritten: {', '.join(kept)})")
+    print(f"Bundle:    {BUNDLE_PATH.name} {'rebuilt' if bundle_written else 'unchanged'}")
+    print(f"Aliases:   {ALIASES_PATH.name} {'rebuilt' if aliases_written else 'unchanged'}")
     print(f"Errors:    {len(errors)}")
 
     if errors:
@@ -492,6 +1306,185 @@ def main():
     for r in results:
         print(f"  {r['name']:<38s} {r['degree']:>3s} {r['hours']:>3d} {r['courses']:>3d} {r['careers']:>3d} {r['contacts']:>3d}")
 
+    return {"rebuilt": rebuilt, "written": written, "removed": removed, "errors": errors}
+
+
+def is_workbook(path):
+    """True for .xlsx sources; False for Excel's ~$ lock files and anything else."""
+    name = os.path.basename(path)
+    return name.endswith(".xlsx") and not name.startswith("~$")
+
+
+class ChangeQueue:
+    """Workbook (and config file) names changed since the last take(), filled by a watcher thread.
+
+    `config_paths` are the non-workbook files worth waking up for
+    (programs.csv, the layout spec); everything else is ignored.
+    """
+
+    __slots__ = ("lock", "event", "names", "config_paths")
+
+    def __init__(self, config_paths=()):
+        self.lock = threading.Lock()
+        self.event = threading.Event()
+        self.names = set()
+        self.config_paths = {os.path.abspath(p) for p in config_paths}
+
+    def add(self, path):
+        if is_workbook(path) or os.path.abspath(path) in self.config_paths:
+            with self.lock:
+                self.names.add(os.path.basename(path))
+            self.event.set()
+
+    def take(self, debounce=WATCH_DEBOUNCE):
+        """Block until something changed and then stayed quiet for `debounce` seconds."""
+        while not self.event.wait(1.0):
+            pass  # short waits keep Ctrl-C responsive
+        while True:
+            self.event.clear()
+            if not self.event.wait(debounce):
+                break
+        with self.lock:
+            names, self.names = self.names, set()
+        return names
+
+
+def workbook_snapshot(input_dir, config_paths=()):
+    """{workbook or config path: (mtime_ns, size)} for the polling watcher."""
+    snapshot = {}
+    try:
+        entries = [entry.path for entry in os.scandir(input_dir) if is_workbook(entry.name)]
+    except OSError:
+        entries = []
+    for path in entries + [str(p) for p in config_paths]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        snapshot[path] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+def start_polling(input_dir, changes, config_paths=(), interval=WATCH_POLL_INTERVAL):
+    """Poll input_dir and config_paths from a thread. Returns (description, stop function)."""
+    stop_event = threading.Event()
+
+    def poll():
+        previous = workbook_snapshot(input_dir, config_paths)
+        while not stop_event.wait(interval):
+            current = workbook_snapshot(input_dir, config_paths)
+            for name in previous.keys() | current.keys():
+                if previous.get(name) != current.get(name):
+                    changes.add(name)
+            previous = current
+
+    thread = threading.Thread(target=poll, daemon=True)
+    thread.start()
+
+    def stop():
+        stop_event.set()
+        thread.join()
+
+    return f"polling every {interval:g}s; pip install watchdog for inotify", stop
+
+
+def start_watcher(input_dir, changes, config_paths=()):
+    """Feed workbook changes in input_dir, and edits to config_paths, to `changes`.
+
+    Uses watchdog (inotify on Linux) when it is installed, polling otherwise.
+    Returns (description, stop function).
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return start_polling(input_dir, changes, config_paths)
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.event_type not in WATCH_EVENT_TYPES:
+                return
+            changes.add(event.src_path)
+            if getattr(event, "dest_path", None):
+                changes.add(event.dest_path)
+
+    observer = Observer()
+    handler = Handler()
+    # ChangeQueue ignores everything in the config files' directories but the files themselves
+    for directory in sorted({str(input_dir)} | {str(Path(p).parent) for p in config_paths}):
+        observer.schedule(handler, directory, recursive=False)
+    observer.start()
+
+    def stop():
+        observer.stop()
+        observer.join()
+
+    return f"watchdog {type(observer).__name__}", stop
+
+
+def verify_outputs(output_names):
+    """Run verify_extraction's per-file checks on just these outputs."""
+    # verify_extraction imports this module (through build_mention_matcher)
+    from verify_extraction import check_program
+
+    catalog = load_catalog(PROGRAMS_CSV)
+    for output_name in output_names:
+        with open(OUTPUT_DIR / output_name) as f:
+            issues = check_program(json.load(f), catalog)
+        print(f"  [{'OK' if not issues else '!!'}] verify {output_name}")
+        for issue in issues:
+            print(f"        - {issue}")
+
+
+def watch_extraction(args, layout_hash):
+    """--watch: extract once, then re-extract and re-verify workbooks as they change.
+
+    After the first full pass, each pass only hashes the workbooks the
+    watcher reported, and re-extracts those whose hash changed. When
+    programs.csv or the layout spec changed, the cached catalog and layout
+    are reloaded and every workbook is re-checked. Returns an exit code.
+    """
+    if not INPUT_DIR.exists():
+        print(f"ERROR: Input directory not found: {INPUT_DIR}")
+        return 1
+    layout_path = LAYOUTS_DIR / f"{args.layout}.json"
+    config_paths = (PROGRAMS_CSV, layout_path)
+    changes = ChangeQueue(config_paths)
+    backend, stop = start_watcher(INPUT_DIR, changes, config_paths)
+    try:
+        config = (catalog_hash(), file_hash(layout_path))
+        run(args, layout_hash)
+        args.force = False
+        print(f"\nWatching {INPUT_DIR}, {PROGRAMS_CSV.name} and {layout_path.name} ({backend}). "
+              f"Press Ctrl-C to stop.")
+        while True:
+            names = changes.take()
+            started = time.perf_counter()
+            print(f"\nChanged: {', '.join(sorted(names))}\n")
+            changed = names
+            current = (catalog_hash(), file_hash(layout_path) if layout_path.exists() else "")
+            if current != config:
+                # load_catalog/load_layout are cached for the process: drop both and re-check everything
+                load_catalog.cache_clear()
+                load_layout.cache_clear()
+                try:
+                    layout_hash = load_layout(args.layout).hash
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"ERROR: Cannot load layout spec {args.layout!r}: {e}. Watching...")
+                    continue
+                config = current
+                changed = None
+                print(f"{PROGRAMS_CSV.name} or {layout_path.name} changed: re-checking every workbook\n")
+            summary = run(args, layout_hash, changed)
+            if summary is not None:
+                verify_outputs(summary["written"])
+            print(f"Updated in {(time.perf_counter() - started) * 1000:.0f} ms. Watching...")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        stop()
+    return 0
+
 
 if __name__ == "__main__":
     main()
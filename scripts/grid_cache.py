@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of resolved workbook grids.
+
+Parsing a poster through openpyxl is ~95% of extraction time, but only the
+extraction rules change while someone is tuning extract_courses or
+extract_contacts. load_sheet_grid() results (values in reading order, merged
+ranges filled in) are stored in build/grid-cache/ under the workbook's
+SHA-256, grid size and GRID_FORMAT, so an unchanged workbook is parsed once and every
+later run decodes a few KB of bytes instead.
+
+File format (little-endian):
+
+    header    b"GRD2", rows u16, cols u16, string count u32, cell count u32
+    strings   per string: byte length u32, UTF-8 bytes
+    cells     per non-empty cell: flat index u32, tag u8, payload i64
+
+Strings, floats (repr), dates and out-of-range ints go through the string
+table, so a merged value repeated over many cells is stored once. Empty
+cells are not stored at all. A grid wider or taller than 65,535 is not
+cached.
+
+Usage:
+    python3 scripts/grid_cache.py             # summarize build/grid-cache/
+    python3 scripts/grid_cache.py --clear
+"""
+
+import argparse
+import datetime
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+GRID_CACHE_DIR = ROOT / "build" / "grid-cache"
+
+# Part of every cache key: bump when the file format or load_sheet_grid()'s output changes
+GRID_FORMAT = 2
+MAGIC = b"GRD2"
+HEADER = struct.Struct("<4sHHII")
+LENGTH = struct.Struct("<I")
+CELL = struct.Struct("<IBq")
+
+TAG_STR, TAG_INT, TAG_FLOAT, TAG_TRUE, TAG_FALSE, TAG_DATETIME, TAG_DATE, TAG_TIME, TAG_BIGINT = range(1, 10)
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+# Tagged string payload -> value
+DECODERS = {
+    TAG_STR: str,
+    TAG_FLOAT: float,
+    TAG_DATETIME: datetime.datetime.fromisoformat,
+    TAG_DATE: datetime.date.fromisoformat,
+    TAG_TIME: datetime.time.fromisoformat,
+    TAG_BIGINT: int,
+}
+
+
+def encode_grid(rows, cols, cells):
+    """Serialize a row-major cell list.
+
+    Raises TypeError for unsupported values and struct.error when rows or
+    cols don't fit in a u16.
+    """
+    strings = {}
+    records = []
+
+    def intern(text):
+        slot = strings.get(text)
+        if slot is None:
+            slot = strings[text] = len(strings)
+        return slot
+
+    for index, value in enumerate(cells):
+        if value is None:
+            continue
+        if value is True or value is False:
+            records.append(CELL.pack(index, TAG_TRUE if value else TAG_FALSE, 0))
+        elif isinstance(value, int):
+            if INT64_MIN <= value <= INT64_MAX:
+                records.append(CELL.pack(index, TAG_INT, value))
+            else:
+                records.append(CELL.pack(index, TAG_BIGINT, intern(str(value))))
+        elif isinstance(value, str):
+            records.append(CELL.pack(index, TAG_STR, intern(value)))
+        elif isinstance(value, float):
+            records.append(CELL.pack(index, TAG_FLOAT, intern(repr(value))))
+        # datetime before date: datetime is a date subclass
+        elif isinstance(value, datetime.datetime):
+            records.append(CELL.pack(index, TAG_DATETIME, intern(value.isoformat())))
+        elif isinstance(value, datetime.date):
+            records.append(CELL.pack(index, TAG_DATE, intern(value.isoformat())))
+        elif isinstance(value, datetime.time):
+            records.append(CELL.pack(index, TAG_TIME, intern(value.isoformat())))
+        else:
+            raise TypeError(f"cannot cache cell value of type {type(value).__name__}")
+
+    parts = [HEADER.pack(MAGIC, rows, cols, len(strings), len(records))]
+    for text in strings:
+        data = text.encode("utf-8")
+        parts.append(LENGTH.pack(len(data)))
+        parts.append(data)
+    parts.extend(records)
+    return b"".join(parts)
+
+
+def decode_grid(data):
+    """Inverse of encode_grid: returns (rows, cols, cells)."""
+    magic, rows, cols, n_strings, n_cells = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a grid cache file")
+    offset = HEADER.size
+    strings = []
+    for _ in range(n_strings):
+        (length,) = LENGTH.unpack_from(data, offset)
+        offset += LENGTH.size
+        strings.append(data[offset:offset + length].decode("utf-8"))
+        offset += length
+    if len(data) - offset != n_cells * CELL.size:
+        raise ValueError("truncated grid cache file")
+
+    cells = [None] * (rows * cols)
+    for index, tag, payload in CELL.iter_unpack(memoryview(data)[offset:]):
+        if tag == TAG_INT:
+            cells[index] = payload
+        elif tag == TAG_TRUE or tag == TAG_FALSE:
+            cells[index] = tag == TAG_TRUE
+        else:
+            cells[index] = DECODERS[tag](strings[payload])
+    return rows, cols, cells
+
+
+def cache_path(source_hash, rows, cols, cache_dir=GRID_CACHE_DIR):
+    return cache_dir / f"{source_hash}-{rows}x{cols}-g{GRID_FORMAT}.grid"
+
+
+def read_grid(source_hash, rows, cols, cache_dir=GRID_CACHE_DIR):
+    """Cached (rows, cols, cells) for a source hash, or None on a miss or bad file."""
+    try:
+        return decode_grid(cache_path(source_hash, rows, cols, cache_dir).read_bytes())
+    except (OSError, ValueError, KeyError, IndexError, struct.error, UnicodeDecodeError):
+        return None
+
+
+def write_grid(source_hash, rows, cols, cells, cache_dir=GRID_CACHE_DIR):
+    """Store a grid. Returns False (and stores nothing) if a value can't be encoded."""
+    try:
+        data = encode_grid(rows, cols, cells)
+    except (TypeError, struct.error):
+        return False
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_path(source_hash, rows, cols, cache_dir)
+    # Write-then-rename so a parallel reader never sees a partial file
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as tmp:
+        try:
+            tmp.write(data)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    os.replace(tmp.name, path)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the parsed-grid cache.")
+    parser.add_argument("--clear", action="store_true", help="delete every cached grid")
+    args = parser.parse_args()
+
+    files = sorted(GRID_CACHE_DIR.glob("*.grid")) if GRID_CACHE_DIR.exists() else []
+    if args.clear:
+        for path in files:
+            path.unlink()
+        print(f"Removed {len(files)} cached grid(s) from {GRID_CACHE_DIR.relative_to(ROOT)}")
+        return 0
+    total = sum(path.stat().st_size for path in files)
+    print(f"{GRID_CACHE_DIR.relative_to(ROOT)}: {len(files)} grid(s), {total:,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
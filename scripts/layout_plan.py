@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Compile declarative poster layout specs into single-pass extraction plans.
+
+Each poster template version is described by a JSON spec in scripts/layouts/
+(cell coordinates, scan ranges, section headers and stop words for every
+output field). compile_layout() turns a spec into a LayoutPlan once:
+
+    cells       every cell any field can read, deduplicated
+    fields      coordinates resolved to (row, col) integers
+    header_re   one combined pattern for all section headers in the spec
+
+LayoutPlan.read() then visits each of those cells exactly once per workbook
+and classifies its value with precompiled, combined patterns (course code,
+email, phone, hours, lettered category, section header). The field extractors
+in extract_programs.py read the classified cells instead of the sheet, so
+they never rescan a region or re-run a regex on the same value.
+
+Supporting a new spreadsheet template means adding a spec file, not code.
+
+Usage:
+    python3 scripts/layout_plan.py              # summarize every spec
+    python3 scripts/layout_plan.py poster-v1    # one spec, with its cell list
+"""
+
+import hashlib
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+LAYOUTS_DIR = Path(__file__).parent / "layouts"
+DEFAULT_LAYOUT = "poster-v1"
+
+# Email, course code and phone in one pass; the first alternative wins at each position
+TOKEN_RE = re.compile(
+    r"(?P<email>[\w.+-]+@[\w-]+\.[\w.-]+)"
+    r"|(?P<course>[A-Z]{3,4}\s+\d{4,5})"
+    r"|(?P<phone>\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})"
+)
+# Phone with separators ("817-257-7240"), as opposed to any 10-digit run
+STRICT_PHONE_RE = re.compile(r"\d{3}[-.\s]\d{3}[-.\s]\d{4}")
+HOURS_RE = re.compile(r"(\d+)\s*(?:hours|hrs)")
+LETTERED_RE = re.compile(r"^[A-G][.:]")
+A1_RE = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+
+
+class Cell:
+    """One sheet value, classified once."""
+
+    __slots__ = ("value", "text", "lower", "email", "phone", "strict_phone",
+                 "course", "hours", "lettered", "headers")
+
+    def __init__(self, value, header_re=None):
+        self.value = value
+        self.text = str(value).strip() if value is not None else ""
+        self.lower = self.text.lower()
+        self.email = None
+        self.phone = None
+        self.strict_phone = False
+        self.course = False
+        self.hours = None
+        self.lettered = False
+        self.headers = frozenset()
+        if not self.text:
+            return
+
+        for match in TOKEN_RE.finditer(self.text):
+            kind = match.lastgroup
+            if kind == "course":
+                self.course = True
+            elif kind == "email":
+                if self.email is None:
+                    self.email = match.group()
+            else:
+                if self.phone is None:
+                    self.phone = match.group()
+                if STRICT_PHONE_RE.search(match.group()):
+                    self.strict_phone = True
+        hours = HOURS_RE.search(self.lower)
+        if hours:
+            self.hours = int(hours.group(1))
+        self.lettered = LETTERED_RE.match(self.text) is not None
+        if header_re is not None:
+            self.headers = frozenset(m.group() for m in header_re.finditer(self.lower))
+
+    @property
+    def starts_upper(self):
+        return "A" <= self.text[:1] <= "Z"
+
+
+EMPTY = Cell(None)
+
+
+class CellView:
+    """Classified cells of one workbook, addressed by (row, col)."""
+
+    __slots__ = ("plan", "cells")
+
+    def __init__(self, plan, cells):
+        self.plan = plan
+        self.cells = cells
+
+    def get(self, row, col):
+        slot = self.plan.index.get((row, col))
+        return EMPTY if slot is None else self.cells[slot]
+
+    def find_header(self, field):
+        """First row in the field's headerRange holding its header, or None."""
+        min_col, min_row, max_col, max_row = field["headerRange"]
+        needle = field["header"]
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                if needle in self.get(row, col).headers:
+                    return row
+        return None
+
+
+class LayoutPlan:
+    """A compiled layout spec: which cells to read and where each field looks."""
+
+    __slots__ = ("name", "hash", "fields", "cells", "index", "rows", "cols", "header_re")
+
+    def __init__(self, name, spec_hash, fields, cells, header_re):
+        self.name = name
+        self.hash = spec_hash
+        self.fields = fields
+        self.cells = cells
+        self.index = {cell: slot for slot, cell in enumerate(cells)}
+        self.rows = max(row for row, _ in cells)
+        self.cols = max(col for _, col in cells)
+        self.header_re = header_re
+
+    def read(self, grid):
+        """Visit every planned cell once and return a CellView.
+
+        Merged ranges repeat one value across many cells, so values are
+        classified once each.
+        """
+        classified = {}
+        cells = []
+        for value in grid.values_at(self.cells):
+            if value is None:
+                cells.append(EMPTY)
+                continue
+            key = (type(value), value)
+            cell = classified.get(key)
+            if cell is None:
+                cell = classified[key] = Cell(value, self.header_re)
+            cells.append(cell)
+        return CellView(self, cells)
+
+
+# A1 helpers, kept here so compiling a layout (and reading merged ranges)
+# doesn't import openpyxl
+
+def parse_column(ref):
+    """'AB' -> 28."""
+    index = 0
+    for ch in ref.upper():
+        if not "A" <= ch <= "Z":
+            raise ValueError(f"invalid column {ref!r}")
+        index = index * 26 + ord(ch) - 64
+    return index
+
+
+def parse_cell(ref):
+    """'H2' -> (2, 8)."""
+    match = A1_RE.match(ref)
+    if not match:
+        raise ValueError(f"invalid cell reference {ref!r}")
+    return int(match.group(2)), parse_column(match.group(1))
+
+
+def range_boundaries(ref):
+    """'U5:AB28' -> (min_col, min_row, max_col, max_row), as openpyxl returns it."""
+    start, _, end = ref.partition(":")
+    min_row, min_col = parse_cell(start)
+    max_row, max_col = parse_cell(end) if end else (min_row, min_col)
+    return min_col, min_row, max_col, max_row
+
+
+def compile_field(spec):
+    """Resolve a field spec's coordinates. Returns (field, cells it can read)."""
+    field = dict(spec)
+    cells = set()
+    if "cell" in spec:
+        field["cell"] = parse_cell(spec["cell"])
+        cells.add(field["cell"])
+    for key in ("cells", "descriptionCells"):
+        if key in spec:
+            field[key] = [parse_cell(ref) for ref in spec[key]]
+            cells.update(field[key])
+
+    if "header" in spec:
+        field["header"] = spec["header"].lower()
+        field["headerRange"] = range_boundaries(spec["headerRange"])
+        min_col, min_row, max_col, max_row = field["headerRange"]
+        cells.update((row, col) for row in range(min_row, max_row + 1) for col in range(min_col, max_col + 1))
+        # Rows below the lowest possible header that the section body can reach
+        first = min_row + 1
+        last = max_row + spec["rows"] + spec.get("blockRows", 0)
+        if "lastRow" in spec:
+            last = min(last, spec["lastRow"])
+        body_rows = range(first, last + 1)
+    else:
+        body_rows = range(spec["rows"][0], spec["rows"][1] + 1) if "rows" in spec else range(0)
+
+    if "column" in spec:
+        field["column"] = parse_column(spec["column"])
+        cells.update((row, field["column"]) for row in body_rows)
+    if "columns" in spec:
+        field["columns"] = [parse_column(ref) for ref in spec["columns"]]
+        cells.update((row, col) for row in body_rows for col in field["columns"])
+    for key in ("skip", "stopAt", "stopAtPrefixes", "roleKeywords"):
+        if key in spec:
+            field[key] = [[w.lower() for w in item] if isinstance(item, list) else item.lower()
+                          for item in spec[key]]
+    return field, cells
+
+
+def compile_layout(spec, spec_hash=""):
+    """Compile a parsed layout spec into a LayoutPlan."""
+    fields = {}
+    cells = set()
+    for name, field_spec in spec["fields"].items():
+        fields[name], field_cells = compile_field(field_spec)
+        cells |= field_cells
+    headers = sorted({f["header"] for f in fields.values() if "header" in f}, key=len, reverse=True)
+    header_re = re.compile("|".join(re.escape(h) for h in headers)) if headers else None
+    return LayoutPlan(spec["template"], spec_hash, fields, sorted(cells), header_re)
+
+
+@lru_cache(maxsize=None)
+def load_layout(name=DEFAULT_LAYOUT):
+    """Load and compile scripts/layouts/<name>.json (once per process)."""
+    path = LAYOUTS_DIR / f"{name}.json"
+    text = path.read_text(encoding="utf-8")
+    spec = json.loads(text)
+    return compile_layout(spec, hashlib.sha256(text.encode("utf-8")).hexdigest())
+
+
+def main():
+    names = sys.argv[1:] or sorted(p.stem for p in LAYOUTS_DIR.glob("*.json"))
+    for name in names:
+        plan = load_layout(name)
+        print(f"{plan.name}: {len(plan.cells)} cells in A1:{plan.rows}x{plan.cols}, "
+              f"{len(plan.fields)} fields, spec {plan.hash[:12]}")
+        for field_name, field in plan.fields.items():
+            where = field.get("cell") or field.get("headerRange") or field.get("rows")
+            print(f"  {field_name:<14s} {where}")
+        if len(names) == 1:
+            print(f"  cells: {plan.cells}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Parsed index of the TCU program catalog CSVs.
+
+functions/programs.csv (what the chatbot loads) and files/programs.csv (the
+scraped source copy) share the tcu.edu program-card columns. Each is parsed
+once with the csv module, so quoted degree lists like "BA, Minor" stay intact,
+and indexed by normalized program name for O(1) URL and degree lookups.
+
+Usage:
+    python3 scripts/program_catalog.py   # cross-check the two catalogs
+"""
+
+import csv
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+FUNCTIONS_CATALOG = ROOT / "functions" / "programs.csv"
+FILES_CATALOG = ROOT / "files" / "programs.csv"
+
+# Spreadsheet and data-file names that differ from the catalog card name.
+# Keys and values are both normalized names.
+NAME_ALIASES = {
+    "criminal justice": "criminology and criminal justice",
+    "criminology": "criminology and criminal justice",
+}
+
+# Trailing degree words in names like "Digital Culture and Data Analytics Minor"
+DEGREE_SUFFIX_RE = re.compile(r"\s+(?:major|minor|ba|bs|bgs)$")
+
+
+def normalize_name(name):
+    """'Criminology & Criminal Justice' -> 'criminology and criminal justice'."""
+    name = name.lower().replace("&", " and ")
+    name = re.sub(r"[^a-z0-9\s-]", " ", name)
+    name = re.sub(r"\s+", " ", name).strip()
+    return DEGREE_SUFFIX_RE.sub("", name)
+
+
+class ProgramCatalog:
+    """programs.csv rows indexed by normalized program name."""
+
+    def __init__(self, entries, source=None):
+        self.entries = entries
+        self.source = source
+        self.by_name = {}
+        for entry in entries:
+            self.by_name.setdefault(normalize_name(entry["name"]), entry)
+
+    @classmethod
+    def load(cls, path):
+        """Parse a programs.csv file. A missing file gives an empty catalog."""
+        entries = []
+        if path.exists():
+            with open(path, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)  # header
+                for row in reader:
+                    if len(row) < 3 or not row[2].strip():
+                        continue
+                    entries.append({
+                        "url": row[0].strip(),
+                        "image": row[1].strip(),
+                        "name": row[2].strip(),
+                        "degrees": [d.strip() for d in row[3].split(",") if d.strip()] if len(row) > 3 else [],
+                    })
+        return cls(entries, source=path)
+
+    def lookup(self, name):
+        """Return the catalog entry for a program name, or None."""
+        key = normalize_name(name)
+        entry = self.by_name.get(key)
+        if entry is None and key in NAME_ALIASES:
+            entry = self.by_name.get(NAME_ALIASES[key])
+        return entry
+
+    def url(self, name):
+        entry = self.lookup(name)
+        return entry["url"] if entry else ""
+
+    def degrees(self, name):
+        entry = self.lookup(name)
+        return entry["degrees"] if entry else []
+
+
+@lru_cache(maxsize=None)
+def load_catalog(path=FUNCTIONS_CATALOG):
+    """Load and cache a catalog, so each process parses a CSV at most once."""
+    return ProgramCatalog.load(path)
+
+
+def compare_catalogs(a, b):
+    """Return human-readable differences between two catalogs."""
+    diffs = []
+    for key in sorted(set(a.by_name) | set(b.by_name)):
+        left, right = a.by_name.get(key), b.by_name.get(key)
+        if left is None:
+            diffs.append(f"{right['name']}: only in {b.source.relative_to(ROOT)}")
+        elif right is None:
+            diffs.append(f"{left['name']}: only in {a.source.relative_to(ROOT)}")
+        else:
+            for field in ("url", "image", "degrees"):
+                if left[field] != right[field]:
+                    diffs.append(f"{left['name']}: {field} differs ({left[field]!r} vs {right[field]!r})")
+    return diffs
+
+
+def main():
+    functions_catalog = load_catalog(FUNCTIONS_CATALOG)
+    files_catalog = load_catalog(FILES_CATALOG)
+    print(f"{FUNCTIONS_CATALOG.relative_to(ROOT)}: {len(functions_catalog.entries)} programs")
+    print(f"{FILES_CATALOG.relative_to(ROOT)}: {len(files_catalog.entries)} programs")
+
+    diffs = compare_catalogs(functions_catalog, files_catalog)
+    if diffs:
+        print(f"\n{len(diffs)} difference(s):")
+        for d in diffs:
+            print(f"  - {d}")
+        return 1
+    print("\nCatalogs match.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
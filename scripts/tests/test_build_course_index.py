@@ -0,0 +1,55 @@
+"""Course-code parsing for build_course_index.
+
+Run from the repo root:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from build_course_index import course_codes, course_entries  # noqa: E402
+
+
+class CourseCodesTest(unittest.TestCase):
+    def test_subject_carries_forward_over_a_list(self):
+        self.assertEqual(
+            course_codes("RELI 20543, 20523, 20533, 20903, or 20643"),
+            ["RELI 20543", "RELI 20523", "RELI 20533", "RELI 20903", "RELI 20643"],
+        )
+
+    def test_parenthesized_sequence(self):
+        self.assertEqual(
+            course_codes("Language sequence (CHIN 10153, 10163, 20053, 20063)"),
+            ["CHIN 10153", "CHIN 10163", "CHIN 20053", "CHIN 20063"],
+        )
+
+    def test_or_and_ampersand_separators(self):
+        self.assertEqual(course_codes("ECON 30223 or 31223"), ["ECON 30223", "ECON 31223"])
+        self.assertEqual(course_codes("excluding MOLA 20003 & 40193"), ["MOLA 20003", "MOLA 40193"])
+
+    def test_cross_listed_subjects(self):
+        self.assertEqual(
+            course_codes("HARE/ANTH/SOCI 30403 - Animals and Society"),
+            ["HARE 30403", "ANTH 30403", "SOCI 30403"],
+        )
+
+    def test_level_numbers_are_not_courses(self):
+        self.assertEqual(course_codes("Any ENGL course at the 30000 level"), [])
+        self.assertEqual(course_codes("SPAN 20103 level or above"), ["SPAN 20103"])
+        self.assertEqual(course_codes("ENGL10803 then 30000+ level electives"), ["ENGL 10803"])
+
+    def test_list_entries_are_marked_as_choices(self):
+        program = {"requirements": {
+            "requiredCourses": {"hours": 3, "courses": ["RELI 20543, 20523, or 20643"]},
+            "electiveCourses": {"hours": 0, "description": "", "courses": ["Any 30000-level course"]},
+        }}
+        entries = list(course_entries(program))
+        self.assertEqual([e[0] for e in entries], ["RELI 20543", "RELI 20523", "RELI 20643"])
+        self.assertTrue(all(e[1] == "requiredCourses" and e[5] for e in entries))
+
+
+if __name__ == "__main__":
+    unittest.main()
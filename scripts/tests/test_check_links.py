@@ -0,0 +1,170 @@
+"""LinkChecker against a local HTTP server (no network access needed).
+
+Run from the repo root:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import asyncio
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from check_links import LinkChecker  # noqa: E402
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """/ok, /missing, /forbidden-head, /no-head, /drop-head, /redirect, /loop, /slow/*."""
+
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    hits = 0
+
+    def log_message(self, *args):
+        pass
+
+    def respond(self, status, body=b"", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def handle_any(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.hits += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            if self.path == "/ok" or self.path.startswith("/ok?"):
+                self.respond(200, b"ok")
+            elif self.path == "/missing":
+                self.respond(404, b"missing")
+            elif self.path == "/forbidden-head":
+                self.respond(403 if self.command == "HEAD" else 200, b"ok")
+            elif self.path == "/no-head":
+                self.respond(405 if self.command == "HEAD" else 200, b"ok")
+            elif self.path == "/drop-head":
+                if self.command == "HEAD":
+                    self.close_connection = True  # hang up without a status line
+                else:
+                    self.respond(200, b"ok")
+            elif self.path == "/redirect":
+                self.respond(301, headers=[("Location", "/ok")])
+            elif self.path == "/loop":
+                self.respond(302, headers=[("Location", "/loop")])
+            elif self.path.startswith("/slow/"):
+                time.sleep(0.05)
+                self.respond(200, b"ok")
+            else:
+                self.respond(404)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    do_HEAD = handle_any
+    do_GET = handle_any
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class LinkCheckerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StandInHandler.peak = 0
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_path = Path(tmp.name) / "links.json"
+
+    def check(self, *paths, **options):
+        options.setdefault("timeout", 5)
+        options.setdefault("cache_path", None)
+        checker = LinkChecker(**options)
+        results, _ = asyncio.run(checker.check_all([self.base + p for p in paths]))
+        return [results[self.base + p] for p in paths]
+
+    def test_status_codes_and_redirects(self):
+        ok, missing, redirect = self.check("/ok", "/missing", "/redirect")
+        self.assertTrue(ok["ok"])
+        self.assertEqual(ok["method"], "HEAD")
+        self.assertEqual(missing["status"], 404)
+        self.assertFalse(missing["ok"])
+        self.assertEqual(redirect["finalUrl"], f"{self.base}/ok")
+
+    def test_head_falls_back_to_get_on_405_or_protocol_error(self):
+        no_head, drop_head = self.check("/no-head", "/drop-head")
+        self.assertTrue(no_head["ok"])
+        self.assertEqual(no_head["method"], "GET")
+        self.assertTrue(drop_head["ok"])
+        self.assertEqual(drop_head["method"], "GET")
+
+    def test_head_403_falls_back_to_get(self):
+        (forbidden,) = self.check("/forbidden-head")
+        self.assertTrue(forbidden["ok"])
+        self.assertEqual((forbidden["status"], forbidden["method"]), (200, "GET"))
+
+    def test_redirect_limit_is_broken(self):
+        (loop,) = self.check("/loop", max_redirects=3)
+        self.assertFalse(loop["ok"])
+        self.assertEqual(loop["status"], 302)
+        self.assertIn("too many redirects", loop["error"])
+
+    def test_refused_connection_is_broken_without_get(self):
+        checker = LinkChecker(timeout=2, cache_path=None)
+        results, _ = asyncio.run(checker.check_all([f"http://127.0.0.1:{free_port()}/"]))
+        result = next(iter(results.values()))
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["method"], "HEAD")
+        self.assertEqual(checker.pool.requests, 0)
+
+    def test_per_host_limit_and_connection_reuse(self):
+        paths = [f"/slow/{i}" for i in range(12)]
+        checker = LinkChecker(concurrency=8, per_host=3, rate=0, timeout=5, cache_path=None)
+        results, _ = asyncio.run(checker.check_all([self.base + p for p in paths]))
+        self.assertTrue(all(r["ok"] for r in results.values()))
+        self.assertLessEqual(StandInHandler.peak, 3)
+        self.assertLess(checker.pool.opened, checker.pool.requests)
+
+    def test_rate_limit_spaces_requests(self):
+        start = time.perf_counter()
+        self.check(*[f"/ok?{i}" for i in range(6)], per_host=8, rate=20)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.25)
+
+    def test_live_links_are_cached_and_broken_ones_rechecked(self):
+        urls = [f"{self.base}/ok", f"{self.base}/missing", f"{self.base}/redirect"]
+        checker = LinkChecker(rate=0, timeout=5, cache_path=self.cache_path)
+        asyncio.run(checker.check_all(urls))
+        before = StandInHandler.hits
+        results, hits = asyncio.run(checker.check_all(urls))
+        self.assertEqual(hits, 2)
+        self.assertEqual(StandInHandler.hits - before, 1)
+        self.assertFalse(results[f"{self.base}/missing"]["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
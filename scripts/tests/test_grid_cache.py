@@ -0,0 +1,49 @@
+"""Round trips through the grid cache.
+
+Run from the repo root:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import datetime
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grid_cache import GRID_FORMAT, cache_path, read_grid, write_grid  # noqa: E402
+
+
+class GridCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = Path(tmp.name)
+
+    def test_round_trip(self):
+        cells = [None] * 12
+        cells[:6] = ["ENGL 10803", 3, 2.5, True, datetime.date(2024, 8, 1), 1 << 70]
+        self.assertTrue(write_grid("abc", 3, 4, cells, self.cache_dir))
+        self.assertEqual(read_grid("abc", 3, 4, self.cache_dir), (3, 4, cells))
+
+    def test_more_than_65535_cells(self):
+        cells = [None] * (300 * 300)
+        cells[70000] = "past the u16 range"
+        self.assertTrue(write_grid("wide", 300, 300, cells, self.cache_dir))
+        self.assertEqual(read_grid("wide", 300, 300, self.cache_dir)[2], cells)
+
+    def test_oversized_grid_is_not_cached(self):
+        self.assertFalse(write_grid("tall", 70000, 1, [1] * 70000, self.cache_dir))
+        self.assertFalse(write_grid("odd", 1, 1, [object()], self.cache_dir))
+        self.assertEqual(list(self.cache_dir.iterdir()), [])
+
+    def test_format_is_part_of_the_key(self):
+        write_grid("abc", 1, 1, ["x"], self.cache_dir)
+        path = cache_path("abc", 1, 1, self.cache_dir)
+        self.assertTrue(path.name.endswith(f"-g{GRID_FORMAT}.grid"))
+        self.assertEqual([p.name for p in self.cache_dir.iterdir()], [path.name])
+
+
+if __name__ == "__main__":
+    unittest.main()
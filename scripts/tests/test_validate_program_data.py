@@ -0,0 +1,56 @@
+"""validate_program_data.check_files: pooled results match serial ones.
+
+Run from the repo root:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import validate_program_data  # noqa: E402
+from validate_program_data import PROGRAM_DATA_DIR, check_files  # noqa: E402
+
+
+class CheckFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        for path in sorted(PROGRAM_DATA_DIR.glob("*.json"))[:8]:
+            shutil.copy(path, self.tmp / path.name)
+        self.paths = sorted(self.tmp.glob("*.json"))
+        # Force the pool for a handful of files
+        patch = mock.patch.object(validate_program_data, "PARALLEL_MIN_FILES", 0)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def break_file(self, index):
+        path = self.paths[index]
+        data = json.loads(path.read_text(encoding="utf-8"))
+        del data["name"]
+        path.write_text(json.dumps(data), encoding="utf-8")
+
+    def test_pool_matches_serial(self):
+        self.break_file(5)
+        serial = check_files(self.paths, jobs=1)
+        pooled = check_files(self.paths, jobs=2)
+        self.assertEqual(pooled, serial)
+        self.assertTrue(pooled[5]["errors"])
+
+    def test_fail_fast_stops_at_first_failure(self):
+        self.break_file(2)
+        self.break_file(6)
+        for jobs in (1, 2):
+            checked = check_files(self.paths, jobs=jobs, fail_fast=True)
+            self.assertEqual([r["file"] for r in checked], [p.name for p in self.paths[:3]])
+            self.assertTrue(checked[-1]["errors"])
+
+
+if __name__ == "__main__":
+    unittest.main()
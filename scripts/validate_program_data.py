@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Validate functions/program-data/ against functions/schemas/program-data.schema.json.
+
+The schema is compiled once into a tree of check functions (the draft-07
+subset it uses: type, enum, required, properties, additionalProperties,
+items, minLength, minimum, pattern, local $ref), the same way
+manifest-loader.js compiles manifest.schema.json with Ajv. A file takes
+~0.1 ms to read and check, so files are validated in a process pool (one
+compiled validator per worker) only once there are enough of them to pay for
+starting it. One indexed pass over the results then checks what a per-file
+schema can't:
+
+    duplicates      two files for the same program name and degree, or slugs
+                    that differ only in case
+    abbreviations   one program name carrying different abbreviations, and
+                    abbreviations shared by different programs (warnings:
+                    posters do this, e.g. International Economics is INEQ as
+                    a BS and ECON as a minor)
+    catalog         programs not listed in functions/programs.csv (error) and
+                    URLs that differ from the catalog entry (warning)
+
+Errors make the script exit 1; warnings only do with --strict. --fail-fast
+stops at the first file that fails the schema. Results can be written as
+JSON or JUnit XML for CI.
+
+Usage:
+    python3 scripts/validate_program_data.py
+    python3 scripts/validate_program_data.py --fail-fast --strict
+    python3 scripts/validate_program_data.py --format junit --out build/program-data.junit.xml
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from program_catalog import FUNCTIONS_CATALOG, load_catalog, normalize_name
+
+ROOT = Path(__file__).parent.parent
+PROGRAM_DATA_DIR = ROOT / "functions" / "program-data"
+SCHEMA_PATH = ROOT / "functions" / "schemas" / "program-data.schema.json"
+
+REPORT_VERSION = 1
+# Serial checking runs at ~0.1 ms/file and starting a pool costs ~35 ms, so
+# the pool only pays off around 800-1000 files even on 4 cores. The catalog
+# (tens to a few hundred files) stays serial; the pool is for bulk runs.
+PARALLEL_MIN_FILES = 1000
+ANNOTATIONS = {"$ref", "$schema", "$id", "title", "description", "definitions", "default", "examples"}
+JSON_TYPES = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool))
+                         or (isinstance(v, float) and v.is_integer()),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "array": lambda v: isinstance(v, list),
+    "object": lambda v: isinstance(v, dict),
+}
+
+
+class SchemaError(ValueError):
+    """The schema uses a keyword or $ref this compiler doesn't support."""
+
+
+def compile_schema(schema):
+    """Compile a schema into validate(instance) -> [(JSON pointer, message)].
+
+    Messages and instance paths follow Ajv's wording, so the Python and
+    Node validators report the same problem the same way.
+    """
+    compiled_refs = {}
+
+    def resolve(ref):
+        if not ref.startswith("#/"):
+            raise SchemaError(f"only local $ref is supported: {ref}")
+        if ref not in compiled_refs:
+            target = schema
+            for part in ref[2:].split("/"):
+                target = target[part]
+            # Placeholder first, so a recursive definition resolves to itself
+            compiled_refs[ref] = None
+            compiled_refs[ref] = compile_node(target)
+        return lambda value, path, errors: compiled_refs[ref](value, path, errors)
+
+    def compile_node(node):
+        unknown = set(node).difference(ANNOTATIONS, KEYWORDS)
+        if unknown:
+            raise SchemaError(f"unsupported keyword(s): {', '.join(sorted(unknown))}")
+        if "$ref" in node:
+            return resolve(node["$ref"])
+        checks = [KEYWORDS[key](node[key], node, compile_node) for key in KEYWORDS if key in node]
+
+        def validate(value, path, errors):
+            for check in checks:
+                # A failed type check makes the remaining keywords meaningless
+                if check(value, path, errors) is False:
+                    return
+        return validate
+
+    root = compile_node(schema)
+
+    def validate(instance):
+        errors = []
+        root(instance, "", errors)
+        return errors
+    return validate
+
+
+def keyword_type(expected, node, compile_node):
+    names = expected if isinstance(expected, list) else [expected]
+    tests = [JSON_TYPES[name] for name in names]
+    label = ",".join(names)
+
+    def check(value, path, errors):
+        if not any(test(value) for test in tests):
+            errors.append((path, f"must be {label}"))
+            return False
+    return check
+
+
+def keyword_enum(allowed, node, compile_node):
+    def check(value, path, errors):
+        if value not in allowed:
+            errors.append((path, "must be equal to one of the allowed values"))
+    return check
+
+
+def keyword_min_length(limit, node, compile_node):
+    def check(value, path, errors):
+        if isinstance(value, str) and len(value) < limit:
+            errors.append((path, f"must NOT have fewer than {limit} characters"))
+    return check
+
+
+def keyword_pattern(pattern, node, compile_node):
+    regex = re.compile(pattern)
+
+    def check(value, path, errors):
+        if isinstance(value, str) and not regex.search(value):
+            errors.append((path, f'must match pattern "{pattern}"'))
+    return check
+
+
+def keyword_minimum(limit, node, compile_node):
+    def check(value, path, errors):
+        if JSON_TYPES["number"](value) and value < limit:
+            errors.append((path, f"must be >= {limit}"))
+    return check
+
+
+def keyword_required(names, node, compile_node):
+    def check(value, path, errors):
+        if isinstance(value, dict):
+            for name in names:
+                if name not in value:
+                    errors.append((path, f"must have required property '{name}'"))
+    return check
+
+
+def keyword_properties(properties, node, compile_node):
+    compiled = {name: compile_node(sub) for name, sub in properties.items()}
+
+    def check(value, path, errors):
+        if isinstance(value, dict):
+            for name, validate in compiled.items():
+                if name in value:
+                    validate(value[name], f"{path}/{name}", errors)
+    return check
+
+
+def keyword_additional_properties(allowed, node, compile_node):
+    if allowed is not False:
+        raise SchemaError("additionalProperties must be false when present")
+    known = set(node.get("properties", {}))
+
+    def check(value, path, errors):
+        if isinstance(value, dict):
+            for name in value:
+                if name not in known:
+                    errors.append((path, f"must NOT have additional properties ({name})"))
+    return check
+
+
+def keyword_items(items, node, compile_node):
+    validate = compile_node(items)
+
+    def check(value, path, errors):
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                validate(item, f"{path}/{i}", errors)
+    return check
+
+
+# Applied in this order; "type" first so it can short-circuit the rest
+KEYWORDS = {
+    "type": keyword_type,
+    "enum": keyword_enum,
+    "minLength": keyword_min_length,
+    "pattern": keyword_pattern,
+    "minimum": keyword_minimum,
+    "required": keyword_required,
+    "properties": keyword_properties,
+    "additionalProperties": keyword_additional_properties,
+    "items": keyword_items,
+}
+
+
+def load_validator(path=SCHEMA_PATH):
+    with open(path, encoding="utf-8") as f:
+        return compile_schema(json.load(f))
+
+
+# Per-process validator, compiled once by the pool initializer (or on first use)
+_validator = None
+
+
+def init_worker(schema_path):
+    global _validator
+    _validator = load_validator(schema_path)
+
+
+def check_file(path):
+    """Read, parse and schema-check one file.
+
+    Returns a plain dict (it crosses process boundaries) with the fields the
+    cross-file pass indexes. Size comes from the bytes read, not a re-dump.
+    """
+    if _validator is None:
+        init_worker(SCHEMA_PATH)
+    path = Path(path)
+    result = {"file": path.name, "bytes": 0, "errors": [], "record": None}
+    try:
+        raw = path.read_bytes()
+        result["bytes"] = len(raw)
+        data = json.loads(raw)
+    except (OSError, ValueError) as e:
+        result["errors"].append({"path": "", "message": f"unreadable: {e}"})
+        return result
+    result["errors"] = [{"path": p, "message": m} for p, m in _validator(data)]
+    if isinstance(data, dict):
+        result["record"] = {key: data.get(key) for key in ("name", "abbreviation", "degree", "url")}
+    return result
+
+
+def check_files(paths, jobs=1, fail_fast=False, schema_path=SCHEMA_PATH):
+    """Schema-check files, in a process pool when there are enough of them.
+
+    Results come back in input order. With fail_fast, stops after the first
+    file with errors (later files are not reported).
+    """
+    init_worker(schema_path)
+    if jobs <= 1 or len(paths) < PARALLEL_MIN_FILES:
+        results = map(check_file, paths)
+        return take_until_failure(results) if fail_fast else list(results)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(schema_path,)) as pool:
+        results = pool.map(check_file, paths, chunksize=chunksize)
+        if not fail_fast:
+            return list(results)
+        checked = take_until_failure(results)
+        pool.shutdown(cancel_futures=True)
+        return checked
+
+
+def take_until_failure(results):
+    checked = []
+    for result in results:
+        checked.append(result)
+        if result["errors"]:
+            break
+    return checked
+
+
+def cross_check(results, catalog):
+    """One pass over the schema results building the cross-file indexes.
+
+    Returns [{check, severity, files, message}], errors before warnings.
+    """
+    by_identity = {}
+    by_slug = {}
+    abbreviations_by_name = {}
+    names_by_abbreviation = {}
+    findings = []
+
+    for result in results:
+        by_slug.setdefault(Path(result["file"]).stem.lower(), []).append(result["file"])
+        record = result["record"]
+        if not record or not isinstance(record["name"], str):
+            continue
+        key = normalize_name(record["name"])
+        by_identity.setdefault((key, record["degree"]), []).append(result["file"])
+        abbreviation = record["abbreviation"]
+        if abbreviation:
+            abbreviations_by_name.setdefault(key, {}).setdefault(abbreviation, []).append(result["file"])
+            names_by_abbreviation.setdefault(abbreviation, {}).setdefault(key, []).append(result["file"])
+
+        entry = catalog.lookup(record["name"])
+        if entry is None:
+            findings.append({"check": "catalog", "severity": "error", "files": [result["file"]],
+                             "message": f"{record['name']} is not listed in programs.csv"})
+        elif record["url"] and record["url"].rstrip("/") != entry["url"].rstrip("/"):
+            findings.append({"check": "catalog", "severity": "warning", "files": [result["file"]],
+                             "message": f"url {record['url']} differs from programs.csv ({entry['url']})"})
+
+    for (key, degree), files in by_identity.items():
+        if len(files) > 1:
+            findings.append({"check": "duplicates", "severity": "error", "files": files,
+                             "message": f"{len(files)} files for {key} ({degree})"})
+    for slug, files in by_slug.items():
+        if len(files) > 1:
+            findings.append({"check": "duplicates", "severity": "error", "files": files,
+                             "message": f"slugs differ only in case: {', '.join(files)}"})
+    for key, found in abbreviations_by_name.items():
+        if len(found) > 1:
+            findings.append({"check": "abbreviations", "severity": "warning",
+                             "files": sorted(f for files in found.values() for f in files),
+                             "message": f"{key} has conflicting abbreviations {', '.join(sorted(found))}"})
+    for abbreviation, found in names_by_abbreviation.items():
+        if len(found) > 1:
+            findings.append({"check": "abbreviations", "severity": "warning",
+                             "files": sorted(f for files in found.values() for f in files),
+                             "message": f"{abbreviation} is shared by {', '.join(sorted(found))}"})
+
+    findings.sort(key=lambda f: (f["severity"] != "error", f["check"], f["files"]))
+    return findings
+
+
+def validate(paths, jobs=1, fail_fast=False, catalog_path=FUNCTIONS_CATALOG, schema_path=SCHEMA_PATH):
+    """Build the validation report dict."""
+    results = check_files(paths, jobs, fail_fast, schema_path)
+    failed = sum(1 for r in results if r["errors"])
+    # After a fail-fast stop the cross-file checks would only see part of the catalog
+    findings = [] if fail_fast and failed else cross_check(results, load_catalog(catalog_path))
+    return {
+        "version": REPORT_VERSION,
+        "schema": schema_path.name,
+        "files": len(paths),
+        "checked": len(results),
+        "failed": failed,
+        "bytes": sum(r["bytes"] for r in results),
+        "errors": failed + sum(1 for f in findings if f["severity"] == "error"),
+        "warnings": sum(1 for f in findings if f["severity"] == "warning"),
+        "results": [{key: r[key] for key in ("file", "bytes", "errors")} for r in results],
+        "crossFile": findings,
+    }
+
+
+def junit_xml(report, elapsed):
+    """JUnit XML: one testcase per file, one per cross-file check."""
+    from xml.etree import ElementTree as ET
+
+    suites = ET.Element("testsuites")
+    schema_suite = ET.SubElement(suites, "testsuite", name="program-data.schema",
+                                 tests=str(report["checked"]), failures=str(report["failed"]),
+                                 time=f"{elapsed:.3f}")
+    for result in report["results"]:
+        case = ET.SubElement(schema_suite, "testcase", classname="program-data", name=result["file"])
+        if result["errors"]:
+            failure = ET.SubElement(case, "failure", message=f"{len(result['errors'])} schema error(s)")
+            failure.text = "\n".join(f"{e['path'] or '/'}: {e['message']}" for e in result["errors"])
+
+    checks = ("duplicates", "abbreviations", "catalog")
+    cross_suite = ET.SubElement(suites, "testsuite", name="program-data.cross-file", tests=str(len(checks)),
+                                failures=str(len({f["check"] for f in report["crossFile"] if f["severity"] == "error"})))
+    for check in checks:
+        case = ET.SubElement(cross_suite, "testcase", classname="program-data.cross-file", name=check)
+        errors = [f for f in report["crossFile"] if f["check"] == check and f["severity"] == "error"]
+        warnings = [f for f in report["crossFile"] if f["check"] == check and f["severity"] == "warning"]
+        if errors:
+            failure = ET.SubElement(case, "failure", message=f"{len(errors)} error(s)")
+            failure.text = "\n".join(e["message"] for e in errors)
+        if warnings:
+            ET.SubElement(case, "system-out").text = "\n".join(f"warning: {w['message']}" for w in warnings)
+    ET.indent(suites)
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(suites, encoding="unicode") + "\n"
+
+
+def print_report(report, elapsed, file=None):
+    """Human-readable report on `file` (default: stdout)."""
+    for result in report["results"]:
+        if result["errors"]:
+            print(f"  [!!] {result['file']}", file=file)
+            for error in result["errors"]:
+                print(f"        {error['path'] or '/'}: {error['message']}", file=file)
+    for finding in report["crossFile"]:
+        tag = "!!" if finding["severity"] == "error" else "warn"
+        print(f"  [{tag}] {finding['check']}: {finding['message']}", file=file)
+    skipped = report["files"] - report["checked"]
+    print(f"\nChecked {report['checked']} file(s) ({report['bytes']:,} bytes) in {elapsed * 1000:.0f} ms"
+          + (f", stopped early ({skipped} not checked)" if skipped else ""), file=file)
+    print(f"Schema failures: {report['failed']}  Errors: {report['errors']}  Warnings: {report['warnings']}", file=file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate program-data against its JSON Schema.")
+    parser.add_argument("files", nargs="*", type=Path, help="files to check (default: functions/program-data/*.json)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help=f"worker processes when checking {PARALLEL_MIN_FILES}+ files (default: CPU count)")
+    parser.add_argument("--fail-fast", action="store_true", help="stop at the first file that fails the schema")
+    parser.add_argument("--strict", action="store_true", help="exit non-zero on warnings too")
+    parser.add_argument("--format", choices=("text", "json", "junit"), default="text", help="report format")
+    parser.add_argument("--out", type=Path, help="write the report here instead of stdout")
+    args = parser.parse_args()
+
+    paths = args.files or sorted(PROGRAM_DATA_DIR.glob("*.json"))
+    if not paths:
+        print(f"ERROR: No JSON files found in {PROGRAM_DATA_DIR}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    try:
+        report = validate(paths, args.jobs, args.fail_fast)
+    except SchemaError as e:
+        print(f"ERROR: {SCHEMA_PATH.name}: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+
+    if args.format == "text":
+        buffer = io.StringIO()
+        print_report(report, elapsed, buffer)
+        text = buffer.getvalue()
+    elif args.format == "junit":
+        text = junit_xml(report, elapsed)
+    else:
+        text = json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(text, encoding="utf-8")
+        print(f"{report['errors']} error(s), {report['warnings']} warning(s) -> {args.out}")
+    else:
+        sys.stdout.write(text)
+    return 1 if report["errors"] or (args.strict and report["warnings"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,9 @@
 """
 Verify extracted program JSON files for completeness and correctness.
 
+Structural checks (types, required keys, cross-file consistency) live in
+validate_program_data.py; this reports empty fields and stale artifacts.
+
 Usage:
     python3 scripts/verify_extraction.py
 """
@@ -10,6 +13,11 @@ import json
 import sys
 from pathlib import Path
 
+from build_bundle import BUNDLE_PATH, build_bundle, canonical_record, load_program_records, read_bundle
+from build_mention_matcher import ALIASES_PATH
+from build_prompt_context import CHARS_PER_TOKEN, REGISTRY_PATH, approx_tokens, build_artifacts
+from program_catalog import FILES_CATALOG, FUNCTIONS_CATALOG, compare_catalogs, load_catalog
+
 OUTPUT_DIR = Path(__file__).parent.parent / "functions" / "program-data"
 
 REQUIRED_FIELDS = [
@@ -18,6 +26,45 @@ REQUIRED_FIELDS = [
 ]
 
 
+def check_program(data, catalog):
+    """Return the completeness issues for one program record."""
+    file_issues = []
+
+    # Check required fields
+    for field in REQUIRED_FIELDS:
+        if field not in data:
+            file_issues.append(f"Missing: {field}")
+        elif not data[field]:
+            file_issues.append(f"Empty: {field}")
+
+    # Specific checks
+    if data.get("totalHours", 0) == 0:
+        file_issues.append("totalHours is 0")
+
+    entry = catalog.lookup(data.get("name", ""))
+    if entry is None:
+        file_issues.append("Not listed in programs.csv")
+    if not data.get("url"):
+        if entry:
+            file_issues.append(f"No URL (programs.csv has {entry['url']})")
+        else:
+            file_issues.append("No URL (check programs.csv match)")
+
+    if not data.get("abbreviation"):
+        file_issues.append("No abbreviation")
+
+    req = data.get("requirements", {})
+    if not req.get("requiredCourses", {}).get("courses"):
+        file_issues.append("No required courses extracted")
+
+    if not data.get("careerOptions"):
+        file_issues.append("No career options")
+
+    if not data.get("contacts"):
+        file_issues.append("No contacts")
+    return file_issues
+
+
 def verify():
     json_files = sorted(OUTPUT_DIR.glob("*.json"))
 
@@ -27,43 +74,18 @@ def verify():
 
     print(f"Verifying {len(json_files)} program files...\n")
 
+    catalog = load_catalog(FUNCTIONS_CATALOG)
     issues = []
-    total_chars = 0
+    total_bytes = 0
+    # Tokens follow the minified canonical form, not the files' indentation
+    minified_chars = 0
 
     for jf in json_files:
-        with open(jf) as f:
-            data = json.load(f)
-
-        file_size = len(json.dumps(data))
-        total_chars += file_size
-        file_issues = []
-
-        # Check required fields
-        for field in REQUIRED_FIELDS:
-            if field not in data:
-                file_issues.append(f"Missing: {field}")
-            elif not data[field]:
-                file_issues.append(f"Empty: {field}")
-
-        # Specific checks
-        if data.get("totalHours", 0) == 0:
-            file_issues.append("totalHours is 0")
-
-        if not data.get("url"):
-            file_issues.append("No URL (check programs.csv match)")
-
-        if not data.get("abbreviation"):
-            file_issues.append("No abbreviation")
-
-        req = data.get("requirements", {})
-        if not req.get("requiredCourses", {}).get("courses"):
-            file_issues.append("No required courses extracted")
-
-        if not data.get("careerOptions"):
-            file_issues.append("No career options")
-
-        if not data.get("contacts"):
-            file_issues.append("No contacts")
+        text = jf.read_text(encoding="utf-8")
+        data = json.loads(text)
+        total_bytes += len(text.encode("utf-8"))
+        minified_chars += len(json.dumps(canonical_record(data), ensure_ascii=False, separators=(",", ":")))
+        file_issues = check_program(data, catalog)
 
         status = "OK" if not file_issues else "!!"
         print(f"  [{status}] {jf.name}: {data.get('name', '???')} ({data.get('degree', '?')})")
@@ -73,15 +95,39 @@ def verify():
                 print(f"        - {issue}")
             issues.append((jf.name, file_issues))
 
+    data_hash = build_bundle(load_program_records(OUTPUT_DIR))["hash"]
+    bundle = read_bundle()
+    if bundle is None:
+        print(f"\n{BUNDLE_PATH.name} missing — run scripts/build_bundle.py")
+        issues.append((BUNDLE_PATH.name, ["Missing bundle"]))
+    elif bundle.get("hash") != data_hash:
+        print(f"\n{BUNDLE_PATH.name} is stale — run scripts/build_bundle.py")
+        issues.append((BUNDLE_PATH.name, ["Bundle hash does not match program-data/"]))
+
+    aliases = read_bundle(ALIASES_PATH)
+    if aliases is None or aliases.get("dataHash") != data_hash:
+        print(f"\n{ALIASES_PATH.name} missing or stale — run scripts/build_mention_matcher.py")
+        issues.append((ALIASES_PATH.name, ["Alias table does not match program-data/"]))
+
+    # Both catalogs are indexed the same way, so one pass cross-checks them
+    catalog_diffs = compare_catalogs(catalog, load_catalog(FILES_CATALOG))
+    if catalog_diffs:
+        print(f"\nprograms.csv catalogs disagree ({len(catalog_diffs)}):")
+        for d in catalog_diffs:
+            print(f"  - {d}")
+        issues.append(("programs.csv", catalog_diffs))
+
     print(f"\n{'='*50}")
     print(f"VERIFICATION SUMMARY")
     print(f"{'='*50}")
     print(f"Files checked:      {len(json_files)}")
     print(f"Files with issues:  {len(issues)}")
-    print(f"Total data size:    {total_chars:,} chars (~{total_chars // 4:,} tokens)")
+    print(f"Total data size:    {total_bytes:,} bytes on disk (~{minified_chars // CHARS_PER_TOKEN:,} tokens minified)")
 
-    est_formatted = len(json_files) * 600
-    print(f"Est. prompt context: ~{est_formatted:,} chars (~{est_formatted // 4:,} tokens)")
+    with open(REGISTRY_PATH) as f:
+        artifacts = build_artifacts(load_program_records(OUTPUT_DIR), json.load(f))
+    for persona, (text, stats) in artifacts.items():
+        print(f"Prompt context ({persona + '):':<10s} {len(text):,} chars (~{approx_tokens(text):,} tokens, {len(stats)} programs)")
 
     if issues:
         print(f"\nFiles needing review:")